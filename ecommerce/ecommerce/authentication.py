@@ -0,0 +1,72 @@
+from dj_rest_auth.jwt_auth import JWTCookieAuthentication
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from users.tokens import user_tokens_revoked
+
+
+class ClaimsUser(TokenUser):
+    """
+    A user built from the access token's user id claim instead of the database.
+    Only the id comes from the token: reading any other attribute, is_staff and
+    is_superuser included, loads the real user once and delegates to it, so
+    nothing read here goes stale while the token is still valid.
+    """
+
+    @cached_property
+    def full_user(self):
+        return get_user_model().objects.get(pk=self.pk)
+
+    @cached_property
+    def is_staff(self):
+        return self.full_user.is_staff
+
+    @cached_property
+    def is_superuser(self):
+        return self.full_user.is_superuser
+
+    def __getattr__(self, attr):
+        if attr == "token" or attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.full_user, attr)
+
+
+class ClaimsJWTAuthentication(JWTCookieAuthentication):
+    """
+    Validates the JWT from the Authorization header or cookie like
+    JWTCookieAuthentication, but returns a ClaimsUser, so authenticating costs
+    no query. Instead of loading the user to check is_active, tokens of users
+    deactivated or deleted since they were issued are rejected from a cache
+    marker (see users.tokens.revoke_user_tokens).
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        if user_tokens_revoked(user_id, validated_token.get("iat")):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return ClaimsUser(validated_token)
+
+
+class StatelessReadAuthenticationMixin:
+    """
+    Authenticates safe requests with `read_authentication_classes` and everything
+    else with the view's regular authenticators. Session comes first, as in the
+    default chain, so unauthenticated responses keep the same status codes.
+    Reads that need more than the caller's identity fall back to the full user
+    transparently through ClaimsUser.
+    """
+    read_authentication_classes = [SessionAuthentication, ClaimsJWTAuthentication]
+
+    def get_authenticators(self):
+        if self.request.method in SAFE_METHODS:
+            return [auth() for auth in self.read_authentication_classes]
+        return super().get_authenticators()
@@ -0,0 +1,43 @@
+"""
+Cache backends that count hits and misses against the current request
+(see ecommerce.metrics). Settings swap them in for the stock backends they
+extend; they behave exactly like those otherwise.
+"""
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from .metrics import cache_lookup
+
+_MISSING = object()
+
+
+class CacheMetricsMixin:
+    def get(self, key, default=None, version=None):
+        with cache_lookup() as stats:
+            value = super().get(key, _MISSING, version=version)
+        if value is _MISSING:
+            if stats is not None:
+                stats.cache_misses += 1
+            return default
+        if stats is not None:
+            stats.cache_hits += 1
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        # The base get_many calls get() per key; the lookup counts only once.
+        with cache_lookup() as stats:
+            values = super().get_many(keys, version=version)
+        if stats is not None:
+            stats.cache_hits += len(values)
+            stats.cache_misses += len(keys) - len(values)
+        return values
+
+
+class InstrumentedLocMemCache(CacheMetricsMixin, LocMemCache):
+    pass
+
+
+class InstrumentedRedisCache(CacheMetricsMixin, RedisCache):
+    pass
+
@@ -0,0 +1,273 @@
+"""
+Per-request hot-path instrumentation.
+
+MetricsMiddleware measures every request against the view that served it:
+how many queries it ran and how long they took, time spent building serializer
+data, cache hits and misses, response size and total duration. The numbers are
+exported as Prometheus metrics at /metrics and, with METRICS_LOG_REQUESTS, also
+logged as structured fields on the "ecommerce.metrics" logger, so an N+1 shows
+up as a jump in a view's query count rather than as a slow page.
+
+Prometheus export needs prometheus-client; without it requests are still
+measured and logged, and /metrics answers 503.
+"""
+import logging
+import os
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework.serializers import BaseSerializer
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+logger = logging.getLogger(__name__)
+
+UNRESOLVED_VIEW = "<unresolved>"
+
+_current_stats = ContextVar("request_stats", default=None)
+
+if prometheus_client is not None:
+    REQUESTS = prometheus_client.Counter(
+        "ecommerce_requests",
+        "Requests served, by view, method and status code.",
+        ["view", "method", "status"],
+    )
+    REQUEST_DURATION = prometheus_client.Histogram(
+        "ecommerce_request_duration_seconds",
+        "Time from the first middleware to the response, by view.",
+        ["view", "method"],
+    )
+    DB_QUERIES = prometheus_client.Histogram(
+        "ecommerce_request_db_queries",
+        "Database queries per request, by view.",
+        ["view"],
+        buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, float("inf")),
+    )
+    DB_TIME = prometheus_client.Histogram(
+        "ecommerce_request_db_seconds",
+        "Time spent executing database queries per request, by view.",
+        ["view"],
+    )
+    SERIALIZER_TIME = prometheus_client.Histogram(
+        "ecommerce_request_serializer_seconds",
+        "Time spent building serializer data per request, by view.",
+        ["view"],
+    )
+    CACHE_REQUESTS = prometheus_client.Counter(
+        "ecommerce_cache_requests",
+        "Cache lookups, by view and result (hit or miss).",
+        ["view", "result"],
+    )
+    RESPONSE_SIZE = prometheus_client.Histogram(
+        "ecommerce_response_size_bytes",
+        "Response body size, by view. Streaming responses are not counted.",
+        ["view"],
+        buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, float("inf")),
+    )
+
+
+class RequestStats:
+    """What one request spent on the database, serializers and the cache."""
+
+    __slots__ = ("queries", "db_time", "serializer_time", "cache_hits", "cache_misses", "_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Nesting of timed serializer and cache calls, so inner calls are not counted twice.
+        self._depth = {"serializer": 0, "cache": 0}
+
+    def record_query(self, execute, sql, params, many, context):
+        """Database execute wrapper counting queries and their time."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+    @contextmanager
+    def outermost(self, kind):
+        """Yields True only for the outermost of nested calls of `kind`."""
+        self._depth[kind] += 1
+        try:
+            yield self._depth[kind] == 1
+        finally:
+            self._depth[kind] -= 1
+
+
+def current_stats():
+    """The RequestStats of the request being served, or None outside one."""
+    return _current_stats.get()
+
+
+@contextmanager
+def collect_stats():
+    """Measures everything run inside the block into a new RequestStats."""
+    stats = RequestStats()
+    token = _current_stats.set(stats)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats.record_query))
+            yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def cache_lookup():
+    """
+    Wraps a cache read; yields the RequestStats to record hits and misses on,
+    or None outside a request or inside an enclosing lookup.
+    """
+    stats = _current_stats.get()
+    if stats is None:
+        yield None
+        return
+    with stats.outermost("cache") as outermost:
+        yield stats if outermost else None
+
+
+def instrument_serializers():
+    """
+    Times BaseSerializer.data, which every serializer's `.data` goes through,
+    including any queries its fields trigger. Serializers built inside another
+    one's `.data` are part of the outer timing. Safe to call more than once.
+    """
+    if getattr(BaseSerializer.data.fget, "timed", False):
+        return
+    build_data = BaseSerializer.data.fget
+
+    def timed_data(serializer):
+        stats = _current_stats.get()
+        if stats is None:
+            return build_data(serializer)
+        with stats.outermost("serializer") as outermost:
+            if not outermost:
+                return build_data(serializer)
+            start = time.perf_counter()
+            try:
+                return build_data(serializer)
+            finally:
+                stats.serializer_time += time.perf_counter() - start
+
+    timed_data.timed = True
+    BaseSerializer.data = property(timed_data)
+
+
+def view_name(request):
+    """Low-cardinality label for the view that served `request`."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNRESOLVED_VIEW
+    return match.view_name or match.route or UNRESOLVED_VIEW
+
+
+def response_size(response):
+    """Body size in bytes, or None for streaming responses."""
+    if getattr(response, "streaming", False):
+        return None
+    return len(response.content)
+
+
+class MetricsMiddleware:
+    """
+    Measures each request (see the module docstring). Install it first in
+    MIDDLEWARE so session and authentication queries are counted too.
+    Disabled with METRICS_ENABLED = False.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.log_requests = getattr(settings, "METRICS_LOG_REQUESTS", False)
+        instrument_serializers()
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with collect_stats() as stats:
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+        self.record(request, response, stats, duration)
+        return response
+
+    def record(self, request, response, stats, duration):
+        view = view_name(request)
+        size = response_size(response)
+
+        if prometheus_client is not None:
+            REQUESTS.labels(view, request.method, str(response.status_code)).inc()
+            REQUEST_DURATION.labels(view, request.method).observe(duration)
+            DB_QUERIES.labels(view).observe(stats.queries)
+            DB_TIME.labels(view).observe(stats.db_time)
+            SERIALIZER_TIME.labels(view).observe(stats.serializer_time)
+            if stats.cache_hits:
+                CACHE_REQUESTS.labels(view, "hit").inc(stats.cache_hits)
+            if stats.cache_misses:
+                CACHE_REQUESTS.labels(view, "miss").inc(stats.cache_misses)
+            if size is not None:
+                RESPONSE_SIZE.labels(view).observe(size)
+
+        if self.log_requests:
+            logger.info(
+                "%s %s %s",
+                request.method,
+                request.path,
+                response.status_code,
+                extra={
+                    "view": view,
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "duration_ms": round(duration * 1000, 2),
+                    "db_queries": stats.queries,
+                    "db_time_ms": round(stats.db_time * 1000, 2),
+                    "serializer_time_ms": round(stats.serializer_time * 1000, 2),
+                    "cache_hits": stats.cache_hits,
+                    "cache_misses": stats.cache_misses,
+                    "response_bytes": size,
+                },
+            )
+
+
+def _authorized(request):
+    token = getattr(settings, "METRICS_AUTH_TOKEN", "")
+    if not token:
+        # Without a token the endpoint is only served in development.
+        return settings.DEBUG
+    header = request.headers.get("Authorization", "")
+    return constant_time_compare(header, f"Bearer {token}")
+
+
+def metrics_view(request):
+    """
+    Prometheus exposition of the request metrics. Scrapers authenticate with
+    `Authorization: Bearer <METRICS_AUTH_TOKEN>`. With PROMETHEUS_MULTIPROC_DIR
+    set, metrics from every worker process are aggregated.
+    """
+    if not _authorized(request):
+        raise Http404
+    if prometheus_client is None:
+        return HttpResponse("prometheus-client is not installed.", status=503, content_type="text/plain")
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return HttpResponse(prometheus_client.generate_latest(registry), content_type=prometheus_client.CONTENT_TYPE_LATEST)
@@ -1,6 +1,118 @@
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+def estimated_row_count(model, using="default"):
+    """
+    The planner's row estimate for a model's table, read from pg_class without
+    scanning it. None on other databases or before the table was analyzed.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table]
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def _count_cache_key(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(f"{queryset.db}:{sql}:{params!r}".encode()).hexdigest()
+    return f"pagination:count:{digest}"
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for large listings that avoids exact COUNT(*) over big results.
+
+    - Unfiltered querysets over tables estimated at more than `exact_count_limit`
+      rows report pg_class.reltuples, costing no scan at all.
+    - Other querysets are counted with a LIMIT of `exact_count_limit + 1`; when
+      that cap is hit the full count is computed once and cached for
+      `count_cache_timeout` seconds.
+
+    `count_is_estimate` tells whether `count` is approximate.
+    """
+    exact_count_limit = 10_000
+    count_cache_timeout = 300
+
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, using=queryset.db)
+            if estimate is not None and estimate > self.exact_count_limit:
+                self.count_is_estimate = True
+                return estimate
+
+        capped = queryset.order_by()[: self.exact_count_limit + 1].count()
+        if capped <= self.exact_count_limit:
+            return capped
+
+        self.count_is_estimate = True
+        key = _count_cache_key(queryset.order_by())
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, timeout=self.count_cache_timeout)
+        return count
+
 
 class StandardResultsSetPagination(PageNumberPagination):
+    """
+    Page-number pagination whose total comes from EstimatedCountPaginator, so
+    large listings are never counted exactly on every request. Responses say
+    whether `count` is approximate.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data["count_is_estimate"] = self.page.paginator.count_is_estimate
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema["properties"]["count_is_estimate"] = {"type": "boolean", "example": False}
+        return schema
+
+
+class OrderHistoryCursorPagination(CursorPagination):
+    """
+    Keyset pagination for order history: each page is an index seek on
+    (customer, -date_ordered), so deep pages cost the same as the first.
+    """
     page_size = 10
     page_size_query_param = 'page_size'
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
+    ordering = '-date_ordered'
+
+
+class FulfilmentQueueCursorPagination(CursorPagination):
+    """
+    Keyset pagination for seller fulfilment queues, oldest order first: each
+    page is an index seek on (seller, fulfilment_status, date_ordered).
+    """
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('date_ordered', 'id')
@@ -68,13 +68,14 @@ INSTALLED_APPS = [
     "dj_rest_auth.registration",
     "drf_spectacular",
     "anymail",
+    "django_celery_beat",
 
     # Project apps
     "store.apps.StoreConfig",
     "payment",
     "django_daraja",
     "users", # Your custom users app
-    "emails",
+    "emails.apps.EmailsConfig",
     "storages",
     "sellers.apps.SellersConfig",
 ]
@@ -83,6 +84,8 @@ INSTALLED_APPS = [
 # This list contains all the middleware that is used in the project.
 # Middleware is a framework of hooks into Django’s request/response processing.
 MIDDLEWARE = [
+    # First, so that every query and cache lookup of the request is measured.
+    "ecommerce.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -93,6 +96,8 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    # Turns a full password-hashing pool into a 503 (see users.hashers).
+    "users.middleware.PasswordHashingBusyMiddleware",
 ]
 
 # --- URL Configuration ---
@@ -104,7 +109,7 @@ ROOT_URLCONF = "ecommerce.urls"
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [os.path.join(BASE_DIR, "templates")],
+        "DIRS": [BASE_DIR.parent / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -127,6 +132,31 @@ WSGI_APPLICATION = "ecommerce.wsgi.application"
 # By default, it uses a SQLite database.
 DATABASES = {"default": env.db("DATABASE_URL", default="sqlite:///db.sqlite3")}
 
+# --- Cache ---
+# This setting configures the cache used for hot read paths (e.g. the category tree).
+# Point `CACHE_URL` at Redis in deployed environments (e.g. redis://localhost:6379/1)
+# so that all workers share one cache; the local-memory default is per process.
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+# The stock backends are swapped for subclasses that count hits and misses per
+# request (see ecommerce.cache_backends); other backends are used unchanged.
+INSTRUMENTED_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache": "ecommerce.cache_backends.InstrumentedLocMemCache",
+    "django.core.cache.backends.redis.RedisCache": "ecommerce.cache_backends.InstrumentedRedisCache",
+}
+CACHES["default"]["BACKEND"] = INSTRUMENTED_CACHE_BACKENDS.get(
+    CACHES["default"]["BACKEND"], CACHES["default"]["BACKEND"]
+)
+
+# --- Request metrics ---
+# Per-view query counts, DB/serializer time, cache hits and response sizes
+# (see ecommerce.metrics). Prometheus scrapes /metrics with
+# `Authorization: Bearer <METRICS_AUTH_TOKEN>`; without a token the endpoint is
+# only served when DEBUG is on. METRICS_LOG_REQUESTS also logs every request's
+# numbers as JSON fields on the "ecommerce.metrics" logger.
+METRICS_ENABLED = env.bool("METRICS_ENABLED", default=True)
+METRICS_AUTH_TOKEN = env("METRICS_AUTH_TOKEN", default="")
+METRICS_LOG_REQUESTS = env.bool("METRICS_LOG_REQUESTS", default=False)
+
 # --- Auth & Password validation ---
 # `AUTH_USER_MODEL` specifies the custom user model for the project.
 # `AUTH_PASSWORD_VALIDATORS` is a list of validators that are used to check the strength of user passwords.
@@ -137,11 +167,32 @@ AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.CommonPasswordValidator"},
     {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
 ]
+# New hashes use Argon2 (see users.hashers); PBKDF2 hashes from before the switch
+# still verify and are upgraded on the next login.
+PASSWORD_HASHERS = [
+    "users.hashers.TunedArgon2PasswordHasher",
+    "users.hashers.BoundedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+# Argon2id cost: 2 passes over 19 MiB on one lane, the OWASP baseline, which keeps
+# a hash in the tens of milliseconds without large per-worker memory spikes.
+ARGON2_TIME_COST = env.int("ARGON2_TIME_COST", default=2)
+ARGON2_MEMORY_COST = env.int("ARGON2_MEMORY_COST", default=19456)  # KiB
+ARGON2_PARALLELISM = env.int("ARGON2_PARALLELISM", default=1)
+# Per-process cap on concurrent password hashes (0 hashes inline). Useful with
+# threaded gunicorn workers: callers beyond the pool and queue get a 503 after
+# PASSWORD_HASHING_QUEUE_TIMEOUT seconds instead of starving other requests.
+PASSWORD_HASHING_POOL_SIZE = env.int("PASSWORD_HASHING_POOL_SIZE", default=0)
+PASSWORD_HASHING_QUEUE_SIZE = env.int("PASSWORD_HASHING_QUEUE_SIZE", default=8)
+PASSWORD_HASHING_QUEUE_TIMEOUT = env.float("PASSWORD_HASHING_QUEUE_TIMEOUT", default=2.0)
 
 # --- Authentication Backends ---
 # This setting configures the authentication backends for the project.
 AUTHENTICATION_BACKENDS = (
     "django.contrib.auth.backends.ModelBackend",
+    "users.backends.PhoneNumberBackend",
     "allauth.account.auth_backends.AuthenticationBackend",
 )
 
@@ -207,6 +258,16 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "ecommerce.pagination.StandardResultsSetPagination",
     "PAGE_SIZE": 10,
+    # Proxies in front of Django (1 behind the bundled nginx). The client IP used
+    # for throttling is the X-Forwarded-For entry this many hops from the end;
+    # entries before it are client-supplied and ignored.
+    "NUM_PROXIES": env.int("NUM_PROXIES", default=1),
+    # Per client IP, for the password-hashing endpoints (see users.throttles).
+    "DEFAULT_THROTTLE_RATES": {
+        "login": env("THROTTLE_RATE_LOGIN", default="10/min"),
+        "register": env("THROTTLE_RATE_REGISTER", default="5/min"),
+        "password_change": env("THROTTLE_RATE_PASSWORD_CHANGE", default="5/min"),
+    },
 }
 
 # --- CORS/CSRF ---
@@ -237,6 +298,24 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_ALWAYS_EAGER = False
 CELERY_TASK_EAGER_PROPAGATES = True
+# Periodic jobs. The Procfile runs beat with django_celery_beat's DatabaseScheduler,
+# which syncs these entries into the database on startup.
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-product-ratings": {
+        "task": "store.tasks.reconcile_product_ratings_task",
+        "schedule": timedelta(hours=6),
+    },
+    # Picks up email retries whose backoff has elapsed (see emails.outbox).
+    "drain-email-queue": {
+        "task": "emails.tasks.drain_email_queue",
+        "schedule": timedelta(minutes=1),
+    },
+    # Settles seller balances from the ledger (see payment.settlement).
+    "create-seller-payouts": {
+        "task": "payment.tasks.create_seller_payouts_task",
+        "schedule": timedelta(days=1),
+    },
+}
 
 # --- Email via Anymail/SendGrid ---
 # This section contains settings for sending emails using Anymail and SendGrid.
@@ -249,6 +328,11 @@ EMAIL_PORT = env.int("EMAIL_PORT", default=1025)
 EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", default=False)
 EMAIL_HOST_USER = env("EMAIL_HOST_USER", default="")
 EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD", default="")
+# Outbound queue: messages sent per connection, and per-minute cap for each
+# recipient domain (0 disables). EMAIL_DOMAIN_RATE_LIMITS overrides single domains.
+EMAIL_QUEUE_BATCH_SIZE = env.int("EMAIL_QUEUE_BATCH_SIZE", default=100)
+EMAIL_DOMAIN_RATE_LIMIT = env.int("EMAIL_DOMAIN_RATE_LIMIT", default=600)
+EMAIL_DOMAIN_RATE_LIMITS = {}
 
 # AllAuth: disable username field if using custom User with only email
 # ACCOUNT_AUTHENTICATION_METHOD = "email" # Deprecated, replaced by ACCOUNT_LOGIN_METHODS
@@ -267,6 +351,8 @@ REST_AUTH = {
     "JWT_AUTH_HTTPONLY": False,
     "USER_DETAILS_SERIALIZER": "users.serializers.UserDetailsSerializer",
     "REGISTER_SERIALIZER": "users.serializers.CustomRegisterSerializer",
+    # Issues refresh tokens tracked by the cache-backed blacklist (see users.tokens).
+    "JWT_TOKEN_CLAIMS_SERIALIZER": "users.serializers.CachedBlacklistTokenObtainPairSerializer",
     "PASSWORD_RESET_USE_SITECONTROL": True,
     "PASSWORD_RESET_CONFIRM_URL": env(
         "DJANGO_PASSWORD_RESET_CONFIRM_URL",
@@ -289,6 +375,11 @@ SIMPLE_JWT = {
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
     "USER_ID_FIELD": "id",
     "USER_ID_CLAIM": "user_id",
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializers.CachedBlacklistTokenObtainPairSerializer",
+    # Rotated and logged-out refresh tokens are blacklisted in the cache rather
+    # than the token_blacklist tables (see users.tokens); CACHE_URL must point
+    # at a shared cache such as Redis when running more than one process.
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.CachedBlacklistTokenRefreshSerializer",
 }
 
 # --- Social Auth (Google via AllAuth) ---
@@ -333,6 +424,12 @@ MPESA_PASSKEY = env("MPESA_PASSKEY")
 MPESA_CALLBACK_URL = env("MPESA_CALLBACK_URL")
 MPESA_ENV = env("MPESA_ENV", default="sandbox")
 
+# --- Seller settlement ---
+# Share of each sale kept by the marketplace, and the smallest seller balance
+# the payout job settles (see payment.settlement).
+MARKETPLACE_COMMISSION_RATE = env("MARKETPLACE_COMMISSION_RATE", default="0.10")
+SELLER_PAYOUT_MINIMUM = env("SELLER_PAYOUT_MINIMUM", default="100.00")
+
 # --- Sentry ---
 # This section contains settings for Sentry, which is used for error tracking.
 SENTRY_DSN = env("SENTRY_DSN", default="")
@@ -397,4 +494,21 @@ LOGGING = {
             "propagate": False,
         },
     },
-}
\ No newline at end of file
+}
+if METRICS_LOG_REQUESTS:
+    # Request metrics are logged with python-json-logger, which turns each
+    # record's extra fields into top-level JSON keys.
+    LOGGING["formatters"]["json_fields"] = {
+        "()": "pythonjsonlogger.json.JsonFormatter",
+        "fmt": "%(asctime)s %(levelname)s %(name)s %(message)s",
+    }
+    LOGGING["handlers"]["metrics_console"] = {
+        "level": "INFO",
+        "class": "logging.StreamHandler",
+        "formatter": "json_fields",
+    }
+    LOGGING["loggers"]["ecommerce.metrics"] = {
+        "handlers": ["metrics_console"],
+        "level": "INFO",
+        "propagate": False,
+    }
@@ -5,6 +5,8 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from ecommerce.metrics import metrics_view
+
 # Import the specific callback function from payment.views
 from payment.views import mpesa_stk_push_callback
 
@@ -16,6 +18,7 @@ from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
+from users.throttles import LoginRateThrottle
 
 # --- API URL Patterns ---
 # This list contains all the URL patterns for the API.
@@ -29,7 +32,7 @@ api_urlpatterns = [
     path("auth/", include("users.urls")),
     
     # SimpleJWT Token URLs
-    path('auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('auth/token/', TokenObtainPairView.as_view(throttle_classes=[LoginRateThrottle]), name='token_obtain_pair'),
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
     # Schema and Swagger UI
@@ -39,7 +42,7 @@ api_urlpatterns = [
 
 # --- Main URL Patterns ---
 # This is the main URL configuration for the project.
-# It includes the admin URLs, the API URLs, and the M-Pesa callback URL.
+# It includes the admin URLs, the API URLs, the M-Pesa callback URL and the metrics endpoint.
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include(api_urlpatterns)),
@@ -50,6 +53,9 @@ urlpatterns = [
         mpesa_stk_push_callback,
         name="mpesa_stk_push_callback",
     ),
+
+    # Prometheus scrape endpoint for per-view request metrics
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 # --- Static and Media Files ---
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import QueuedEmail
+
+
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "to_email", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("^to_email", "^domain")
+    readonly_fields = ("claimed_at", "sent_at", "created_at", "last_error")
+    show_full_result_count = False
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.template import Context, engines
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+from emails.rendering import render_email
+
+SAMPLE_ORDER = {
+    "id": 1042,
+    "customer_name": "Jane Doe",
+    "items": [
+        {"product_name": f"Product {i}", "quantity": i, "total": f"{i * 150}.00"}
+        for i in range(1, 6)
+    ],
+    "total": "2250.00",
+}
+
+TEMPLATES = {
+    "emails/order_confirmation.html": {"order": SAMPLE_ORDER},
+    "emails/payment_receipt.html": {"order": SAMPLE_ORDER},
+    "emails/verification_email.html": {"verification_code": "482913", "expiry_minutes": 10},
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmark email rendering: per-call compilation vs the cached renderer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=2000)
+
+    def _time(self, func, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations * 1_000_000
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        engine = engines["django"].engine
+
+        for template_name, context in TEMPLATES.items():
+            source = engine.get_template(template_name).source
+
+            def uncached():
+                # What a worker pays when the template is compiled on every send.
+                html = engine.from_string(source).render(Context(context))
+                return html, strip_tags(html)
+
+            def loader():
+                html = render_to_string(template_name, context)
+                return html, strip_tags(html)
+
+            render_email(template_name, context)  # warm the caches
+            results = {
+                "compile per send": self._time(uncached, iterations),
+                "render_to_string": self._time(loader, iterations),
+                "render_email": self._time(lambda: render_email(template_name, context), iterations),
+            }
+            self.stdout.write(self.style.MIGRATE_HEADING(template_name))
+            for label, micros in results.items():
+                self.stdout.write(f"  {label:<18} {micros:8.1f} µs/render")
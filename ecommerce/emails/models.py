@@ -0,0 +1,46 @@
+# ecommerce/emails/models.py
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class QueuedEmail(models.Model):
+    """
+    An outbound email waiting in the outbox.
+    Messages are rendered when queued and sent in batches by
+    emails.tasks.drain_email_queue, which reuses one backend connection per batch.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", _("Pending")
+        SENDING = "SENDING", _("Sending")
+        SENT = "SENT", _("Sent")
+        FAILED = "FAILED", _("Failed")
+
+    subject = models.CharField(_("subject"), max_length=255)
+    from_email = models.CharField(_("from email"), max_length=255)
+    to_email = models.EmailField(_("to email"))
+    # Lower-cased recipient domain, used for per-domain rate limiting.
+    domain = models.CharField(_("recipient domain"), max_length=255)
+    html_body = models.TextField(_("HTML body"))
+    text_body = models.TextField(_("text body"), blank=True)
+    status = models.CharField(
+        _("status"), max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(_("attempts"), default=0)
+    next_attempt_at = models.DateTimeField(_("next attempt at"), default=timezone.now)
+    claimed_at = models.DateTimeField(_("claimed at"), null=True, blank=True)
+    last_error = models.TextField(_("last error"), blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(_("sent at"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Queued Email")
+        verbose_name_plural = _("Queued Emails")
+        ordering = ["next_attempt_at", "id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
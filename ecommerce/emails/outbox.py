@@ -0,0 +1,207 @@
+# ecommerce/emails/outbox.py
+"""
+Outbound email queue.
+
+Callers render and queue messages with `queue_email`. A worker drains the queue
+in batches: each batch opens a single backend connection (one HTTP session for
+Anymail/SendGrid, one SMTP session otherwise) and sends every message through
+it. Recipient domains are rate limited per minute, and failed messages are
+retried with exponential backoff until MAX_ATTEMPTS.
+"""
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+# A batch claimed by a worker that died is released after this long.
+CLAIM_TIMEOUT = timedelta(minutes=10)
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 60 * 60
+RATE_LIMIT_WINDOW_SECONDS = 60
+
+
+def queue_email(subject, html_body, to_email, from_email=None, text_body=""):
+    """Adds a rendered message to the outbox and returns the QueuedEmail."""
+    return QueuedEmail.objects.create(
+        subject=subject,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to_email=to_email,
+        domain=to_email.rsplit("@", 1)[-1].lower(),
+        html_body=html_body,
+        text_body=text_body,
+    )
+
+
+def backoff_delay(attempts):
+    """Exponential backoff with jitter, capped at BACKOFF_MAX_SECONDS."""
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def domain_rate_limit(domain):
+    """Messages per minute allowed for a recipient domain (0 means unlimited)."""
+    overrides = getattr(settings, "EMAIL_DOMAIN_RATE_LIMITS", {})
+    return overrides.get(domain, getattr(settings, "EMAIL_DOMAIN_RATE_LIMIT", 0))
+
+
+def _take_rate_allowance(domain, wanted, now):
+    """
+    Reserves up to `wanted` sends for `domain` in the current window and returns
+    how many were granted. The shared cache counter keeps all workers in step.
+    """
+    limit = domain_rate_limit(domain)
+    if not limit:
+        return wanted
+    window = int(now.timestamp()) // RATE_LIMIT_WINDOW_SECONDS
+    key = f"emails:rate:{domain}:{window}"
+    cache.add(key, 0, timeout=RATE_LIMIT_WINDOW_SECONDS * 2)
+    try:
+        used = cache.incr(key, wanted)
+    except ValueError:
+        cache.set(key, wanted, timeout=RATE_LIMIT_WINDOW_SECONDS * 2)
+        used = wanted
+    over = max(0, used - limit)
+    return max(0, wanted - over)
+
+
+def _next_window(now):
+    seconds = RATE_LIMIT_WINDOW_SECONDS - int(now.timestamp()) % RATE_LIMIT_WINDOW_SECONDS
+    return now + timedelta(seconds=seconds)
+
+
+def claim_batch(batch_size, now):
+    """Marks up to `batch_size` due messages as SENDING and returns them."""
+    due = Q(status=QueuedEmail.Status.PENDING, next_attempt_at__lte=now) | Q(
+        status=QueuedEmail.Status.SENDING, claimed_at__lt=now - CLAIM_TIMEOUT
+    )
+    with transaction.atomic():
+        batch = list(
+            QueuedEmail.objects.select_for_update(skip_locked=True)
+            .filter(due)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if batch:
+            QueuedEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                status=QueuedEmail.Status.SENDING, claimed_at=now
+            )
+    return batch
+
+
+def _build_message(email, connection):
+    msg = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.text_body or email.html_body,
+        from_email=email.from_email,
+        to=[email.to_email],
+        connection=connection,
+    )
+    msg.attach_alternative(email.html_body, "text/html")
+    return msg
+
+
+def send_batch(batch, now):
+    """
+    Sends one claimed batch over a single connection and records the outcome.
+    Returns (sent, failed, deferred) counts.
+    """
+    by_domain = {}
+    for email in batch:
+        by_domain.setdefault(email.domain, []).append(email)
+
+    to_send, deferred = [], []
+    for domain, emails in by_domain.items():
+        allowed = _take_rate_allowance(domain, len(emails), now)
+        to_send.extend(emails[:allowed])
+        deferred.extend(emails[allowed:])
+
+    sent_ids, failed = [], []
+    if to_send:
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            # The provider is unreachable: the whole batch counts as one failed
+            # attempt, so it backs off (and eventually gives up) like any other.
+            logger.warning(f"Opening the mail connection for {len(to_send)} emails failed: {e}")
+            for email in to_send:
+                email.last_error = str(e)[:1000]
+                failed.append(email)
+        else:
+            try:
+                for email in to_send:
+                    # Each message goes through the already-open connection; sending
+                    # them one call at a time isolates failures without re-sending
+                    # messages that were already delivered.
+                    try:
+                        connection.send_messages([_build_message(email, connection)])
+                    except Exception as e:
+                        logger.warning(f"Sending email {email.pk} to {email.to_email} failed: {e}")
+                        email.last_error = str(e)[:1000]
+                        failed.append(email)
+                    else:
+                        sent_ids.append(email.pk)
+            finally:
+                connection.close()
+
+    if sent_ids:
+        QueuedEmail.objects.filter(pk__in=sent_ids).update(
+            status=QueuedEmail.Status.SENT, sent_at=timezone.now(), claimed_at=None
+        )
+    for email in failed:
+        email.attempts += 1
+        email.claimed_at = None
+        if email.attempts >= MAX_ATTEMPTS:
+            email.status = QueuedEmail.Status.FAILED
+        else:
+            email.status = QueuedEmail.Status.PENDING
+            email.next_attempt_at = now + backoff_delay(email.attempts)
+    if deferred:
+        next_window = _next_window(now)
+        for email in deferred:
+            email.status = QueuedEmail.Status.PENDING
+            email.claimed_at = None
+            email.next_attempt_at = next_window
+    if failed or deferred:
+        QueuedEmail.objects.bulk_update(
+            failed + deferred,
+            ["status", "attempts", "next_attempt_at", "claimed_at", "last_error"],
+        )
+    return len(sent_ids), len(failed), len(deferred)
+
+
+def drain(batch_size=None, max_batches=None):
+    """
+    Sends due messages batch by batch until none are left (or `max_batches`).
+    Returns totals as a dict.
+    """
+    batch_size = batch_size or getattr(settings, "EMAIL_QUEUE_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    totals = {"sent": 0, "failed": 0, "deferred": 0, "batches": 0}
+    while max_batches is None or totals["batches"] < max_batches:
+        now = timezone.now()
+        batch = claim_batch(batch_size, now)
+        if not batch:
+            break
+        sent, failed, deferred = send_batch(batch, now)
+        totals["sent"] += sent
+        totals["failed"] += failed
+        totals["deferred"] += deferred
+        totals["batches"] += 1
+    return totals
+
+
+def has_due_messages():
+    return QueuedEmail.objects.filter(
+        status=QueuedEmail.Status.PENDING, next_attempt_at__lte=timezone.now()
+    ).exists()
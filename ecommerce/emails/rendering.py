@@ -0,0 +1,69 @@
+# ecommerce/emails/rendering.py
+"""
+Email template rendering.
+
+Each email template is compiled once per process: the HTML template comes from
+the (cached) template loader, and a plain-text companion template is derived from
+its source the first time it is used. Rendering a message afterwards only walks
+the two compiled node trees.
+"""
+import html
+import re
+from functools import lru_cache
+
+from django.template import engines
+from django.template.loader import get_template
+from django.utils.html import strip_tags
+
+_DROP_BLOCKS = re.compile(r"<(head|style|script)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_LINE_BREAKS = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_BLOCK_ENDS = re.compile(r"</(p|div|h[1-6]|tr|table|ul|ol)\s*>", re.IGNORECASE)
+_LIST_ITEM_ENDS = re.compile(r"</li\s*>", re.IGNORECASE)
+_LIST_ITEMS = re.compile(r"<li\b[^>]*>\s*", re.IGNORECASE)
+_SPACES = re.compile(r"[ \t]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def html_to_text_source(source):
+    """
+    Converts an HTML template's source into a plain-text template source.
+    Template tags and variables are left untouched, so the result still renders.
+    """
+    source = _DROP_BLOCKS.sub("", source)
+    source = _LINE_BREAKS.sub("\n", source)
+    source = _LIST_ITEMS.sub("- ", source)
+    source = _LIST_ITEM_ENDS.sub("\n", source)
+    source = _BLOCK_ENDS.sub("\n\n", source)
+    source = html.unescape(strip_tags(source))
+    lines = (_SPACES.sub(" ", line).strip() for line in source.splitlines())
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _tidy(text):
+    """Drops the blank lines left behind by block tags such as {% for %}."""
+    lines = (line.rstrip() for line in text.splitlines())
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip() + "\n"
+
+
+@lru_cache(maxsize=None)
+def get_html_template(template_name):
+    """Returns the compiled HTML template."""
+    return get_template(template_name)
+
+
+@lru_cache(maxsize=None)
+def get_text_template(template_name):
+    """Returns the plain-text template derived from the HTML one, compiled once."""
+    source = get_html_template(template_name).template.source
+    text_source = html_to_text_source(source)
+    # Plain text must not be HTML-escaped.
+    return engines["django"].from_string(
+        "{% autoescape off %}" + text_source + "{% endautoescape %}"
+    )
+
+
+def render_email(template_name, context):
+    """Renders an email template, returning (html_body, text_body)."""
+    html_body = get_html_template(template_name).render(context)
+    text_body = _tidy(get_text_template(template_name).render(context))
+    return html_body, text_body
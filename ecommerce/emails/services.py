@@ -1,10 +1,12 @@
 import logging
 from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.db import transaction
 from django.conf import settings
 from anymail.exceptions import AnymailError
 
-from .tasks import send_email_task
+from .outbox import queue_email
+from .rendering import render_email
+from .tasks import schedule_drain
 
 logger = logging.getLogger(__name__)
 
@@ -15,10 +17,10 @@ def _send_email_with_template(subject, template_name, context, to_email, from_em
     if not from_email:
         from_email = settings.DEFAULT_FROM_EMAIL
 
-    html_content = render_to_string(template_name, context)
+    html_content, text_content = render_email(template_name, context)
     msg = EmailMultiAlternatives(
         subject=subject,
-        body=html_content, # Fallback for plain text clients
+        body=text_content, # Plain-text version for clients without HTML
         from_email=from_email,
         to=[to_email],
     )
@@ -35,6 +37,16 @@ def _send_email_with_template(subject, template_name, context, to_email, from_em
         logger.error(f"General error sending email '{subject}' to {to_email}: {e}")
         return False
 
+def _queue_email_with_template(subject, template_name, context, to_email, from_email=None):
+    """
+    Renders a Django template and adds the message to the outbox. A drain is
+    scheduled once the surrounding transaction commits, so the worker always
+    sees the new row.
+    """
+    html_content, text_content = render_email(template_name, context)
+    queue_email(subject, html_content, to_email, from_email, text_body=text_content)
+    transaction.on_commit(schedule_drain)
+
 def send_verification_email(to_email, code, expiry):
     subject = "Ltronix Shop: Email Verification Code"
     template_name = "emails/verification_email.html"
@@ -42,19 +54,19 @@ def send_verification_email(to_email, code, expiry):
         "verification_code": code,
         "expiry_minutes": expiry,
     }
-    send_email_task.delay(subject, template_name, context, to_email)
-    logger.info(f"Verification email task queued for {to_email}")
+    _queue_email_with_template(subject, template_name, context, to_email)
+    logger.info(f"Verification email queued for {to_email}")
 
 def send_order_confirmation(to_email, order_details):
     subject = f"Ltronix Shop: Order #{order_details['id']} Confirmation"
     template_name = "emails/order_confirmation.html"
     context = {"order": order_details}
-    send_email_task.delay(subject, template_name, context, to_email)
-    logger.info(f"Order confirmation email task queued for {to_email}")
+    _queue_email_with_template(subject, template_name, context, to_email)
+    logger.info(f"Order confirmation email queued for {to_email}")
 
 def send_payment_receipt(to_email, order_details):
     subject = f"Ltronix Shop: Payment Receipt for Order #{order_details['id']}"
     template_name = "emails/payment_receipt.html"
     context = {"order": order_details}
-    send_email_task.delay(subject, template_name, context, to_email)
-    logger.info(f"Payment receipt email task queued for {to_email}")
+    _queue_email_with_template(subject, template_name, context, to_email)
+    logger.info(f"Payment receipt email queued for {to_email}")
@@ -1,35 +1,53 @@
 from celery import shared_task
 import logging
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.conf import settings
-from anymail.exceptions import AnymailError
+from django.core.cache import cache
+
+from .outbox import drain, has_due_messages, queue_email
+from .rendering import render_email
 
 logger = logging.getLogger(__name__)
 
-@shared_task(bind=True, retry_backoff=True)
-def send_email_task(self, subject, template_name, context, to_email, from_email=None):
+DRAIN_SCHEDULED_KEY = "emails:drain-scheduled"
+DRAIN_COUNTDOWN = 5  # seconds; lets a burst of queued messages share batches
+DRAIN_MAX_BATCHES = 50  # per task run, so one run never monopolises a worker
+
+
+def schedule_drain(countdown=DRAIN_COUNTDOWN):
     """
-    Celery task to send an email asynchronously.
+    Queues a drain of the outbox shortly. Calls made while one is already
+    scheduled are no-ops, so queueing thousands of messages costs one task.
+    """
+    if cache.add(DRAIN_SCHEDULED_KEY, 1, timeout=countdown + 60):
+        drain_email_queue.apply_async(countdown=countdown)
+
+
+@shared_task(ignore_result=True)
+def drain_email_queue():
     """
-    if not from_email:
-        from_email = settings.DEFAULT_FROM_EMAIL
-
-    try:
-        html_content = render_to_string(template_name, context)
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=html_content, # Fallback for plain text clients
-            from_email=from_email,
-            to=[to_email],
+    Sends queued emails in batches (see emails.outbox). Runs when messages are
+    queued and periodically via CELERY_BEAT_SCHEDULE to pick up retries.
+    """
+    cache.delete(DRAIN_SCHEDULED_KEY)
+    totals = drain(max_batches=DRAIN_MAX_BATCHES)
+    if totals["batches"] >= DRAIN_MAX_BATCHES and has_due_messages():
+        schedule_drain(countdown=0)
+    if totals["batches"]:
+        logger.info(
+            f"Email queue drained: {totals['sent']} sent, {totals['failed']} failed, "
+            f"{totals['deferred']} deferred by rate limits."
         )
-        msg.attach_alternative(html_content, "text/html")
-        msg.send()
-        logger.info(f"Celery task: Email '{subject}' sent successfully to {to_email}")
-        return True
-    except AnymailError as e:
-        logger.error(f"Celery task: Anymail error sending email '{subject}' to {to_email}: {e}")
-        raise self.retry(exc=e, countdown=60) # Retry after 60 seconds
-    except Exception as e:
-        logger.error(f"Celery task: General error sending email '{subject}' to {to_email}: {e}")
-        raise self.retry(exc=e, countdown=60) # Retry after 60 seconds
+    return totals
+
+
+@shared_task(bind=True)
+def send_email_task(self, subject, template_name, context, to_email, from_email=None):
+    """
+    Renders a template and adds the message to the outbox.
+    Kept for messages queued before the outbox existed; new code should use
+    emails.services, which queues directly.
+    """
+    html_content, text_content = render_email(template_name, context)
+    queue_email(subject, html_content, to_email, from_email, text_body=text_content)
+    schedule_drain()
+    logger.info(f"Celery task: Email '{subject}' queued for {to_email}")
+    return True
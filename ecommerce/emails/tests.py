@@ -0,0 +1,129 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from emails import outbox
+from emails.models import QueuedEmail
+from emails.outbox import drain, queue_email
+from emails.rendering import get_text_template, render_email
+
+
+@pytest.fixture(autouse=True)
+def locmem_email(settings):
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    settings.EMAIL_DOMAIN_RATE_LIMIT = 0
+    settings.EMAIL_DOMAIN_RATE_LIMITS = {}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_drain_sends_batch_over_one_connection():
+    for i in range(5):
+        queue_email("Receipt", "<p>Thanks</p>", f"buyer{i}@example.com")
+
+    with mock.patch.object(outbox, "get_connection", wraps=outbox.get_connection) as get_connection:
+        totals = drain(batch_size=10)
+
+    assert get_connection.call_count == 1
+    assert totals == {"sent": 5, "failed": 0, "deferred": 0, "batches": 1}
+    assert len(mail.outbox) == 5
+    assert mail.outbox[0].alternatives[0][1] == "text/html"
+    assert QueuedEmail.objects.filter(status=QueuedEmail.Status.SENT).count() == 5
+
+
+@pytest.mark.django_db
+def test_domain_rate_limit_defers_excess(settings):
+    settings.EMAIL_DOMAIN_RATE_LIMITS = {"slow.example": 2}
+    for i in range(3):
+        queue_email("Receipt", "<p>Thanks</p>", f"buyer{i}@slow.example")
+    queue_email("Receipt", "<p>Thanks</p>", "buyer@fast.example")
+
+    totals = drain()
+
+    assert totals["sent"] == 3
+    assert totals["deferred"] == 1
+    deferred = QueuedEmail.objects.get(status=QueuedEmail.Status.PENDING)
+    assert deferred.domain == "slow.example"
+    assert deferred.attempts == 0
+    assert deferred.next_attempt_at > timezone.now()
+
+
+@pytest.mark.django_db
+def test_failures_back_off_exponentially_then_give_up():
+    email = queue_email("Receipt", "<p>Thanks</p>", "buyer@example.com")
+
+    with mock.patch(
+        "django.core.mail.backends.locmem.EmailBackend.send_messages",
+        side_effect=RuntimeError("provider down"),
+    ):
+        delays = []
+        for _ in range(outbox.MAX_ATTEMPTS):
+            before = timezone.now()
+            QueuedEmail.objects.filter(pk=email.pk).update(next_attempt_at=before)
+            drain()
+            email.refresh_from_db()
+            delays.append(email.next_attempt_at - before)
+
+    assert email.status == QueuedEmail.Status.FAILED
+    assert email.attempts == outbox.MAX_ATTEMPTS
+    assert email.last_error == "provider down"
+    assert delays[1] > delays[0] > timedelta(seconds=20)
+
+
+@pytest.mark.django_db
+def test_connection_failure_backs_off_the_whole_batch():
+    for i in range(3):
+        queue_email("Receipt", "<p>Thanks</p>", f"buyer{i}@example.com")
+
+    with mock.patch(
+        "django.core.mail.backends.locmem.EmailBackend.open",
+        side_effect=ConnectionRefusedError("SMTP unreachable"),
+    ):
+        before = timezone.now()
+        totals = drain()
+
+    assert totals == {"sent": 0, "failed": 3, "deferred": 0, "batches": 1}
+    for email in QueuedEmail.objects.all():
+        assert email.status == QueuedEmail.Status.PENDING
+        assert email.attempts == 1
+        assert email.claimed_at is None
+        assert email.last_error == "SMTP unreachable"
+        assert email.next_attempt_at > before + timedelta(seconds=20)
+
+
+def test_render_email_derives_plain_text_once():
+    get_text_template.cache_clear()
+    context = {
+        "order": {
+            "id": 7,
+            "customer_name": "Ann & Bo",
+            "items": [{"product_name": "TV", "quantity": 2, "total": "10.00"}],
+            "total": "10.00",
+        }
+    }
+
+    html_body, text_body = render_email("emails/order_confirmation.html", context)
+    render_email("emails/order_confirmation.html", context)
+
+    assert "<strong>KES 10.00</strong>" in html_body
+    assert "Ann &amp; Bo" in html_body
+    assert "<" not in text_body
+    assert "Hello Ann & Bo," in text_body
+    assert "- TV x2 - KES 10.00" in text_body
+    assert get_text_template.cache_info().misses == 1
+
+
+def test_verification_template_renders():
+    _, text_body = render_email(
+        "emails/verification_email.html", {"verification_code": "123456", "expiry_minutes": 10}
+    )
+    assert "123456" in text_body
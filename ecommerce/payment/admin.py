@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from .models import Transaction  # Import the Transaction model
+from ecommerce.pagination import EstimatedCountPaginator
+
+from .models import Payout, SettlementEntry, Transaction
 
 # Register your models here.
 
@@ -8,4 +10,40 @@ from .models import Transaction  # Import the Transaction model
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
     list_display = ["id", "cart", "phone", "amount", "status", "created_at"]
-    search_fields = ["phone", "checkout_request_id", "merchant_request_id"]
+    list_filter = ["status"]
+    list_select_related = ["cart"]
+    raw_id_fields = ["cart", "orders"]
+    # Exact matches on indexed columns; icontains scanned the whole table.
+    search_fields = [
+        "phone__exact",
+        "checkout_request_id__exact",
+        "merchant_request_id__exact",
+        "mpesa_receipt_number__exact",
+    ]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Payout)
+class PayoutAdmin(admin.ModelAdmin):
+    list_display = ["id", "seller", "amount", "status", "payout_details_id", "created_at"]
+    list_filter = ["status"]
+    list_select_related = ["seller"]
+    search_fields = ["reference", "payout_details_id"]
+
+
+@admin.register(SettlementEntry)
+class SettlementEntryAdmin(admin.ModelAdmin):
+    """The ledger is append-only; entries are read here, never edited."""
+    list_display = ["id", "seller", "kind", "amount", "order", "payout", "created_at"]
+    list_filter = ["kind"]
+    list_select_related = ["seller", "order", "payout"]
+    raw_id_fields = ["seller", "order", "transaction", "payout"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -4,6 +4,7 @@ import logging
 
 from django.conf import settings
 from django.db import transaction as db_transaction
+from django.db.models import F, Sum
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -12,7 +13,7 @@ from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from store.models import Order, Customer # Import Customer model
-from emails.services import send_payment_receipt
+from store.email_utils import send_payment_receipt_email
 
 from .models import Transaction
 from .serializers import TransactionSerializer
@@ -72,7 +73,20 @@ class MpesaStkPushAPIView(APIView):
                 {"detail": "Active order not found for this user/session."}, status=status.HTTP_404_NOT_FOUND
             )
 
-        amount_to_pay = int(order.get_cart_total)
+        # One payment covers every open order in the order's cart (one per
+        # seller). The amount charged and the orders the callback completes come
+        # from the same list, which is recorded on the transaction.
+        open_orders = Order.objects.filter(complete=False)
+        if order.cart_id:
+            open_orders = open_orders.filter(cart_id=order.cart_id)
+        else:
+            open_orders = open_orders.filter(pk=order.pk)
+        open_orders = list(
+            open_orders.annotate(
+                open_total=Sum(F("orderitem__quantity") * F("orderitem__product__price"))
+            )
+        )
+        amount_to_pay = int(sum(o.open_total or 0 for o in open_orders))
 
         if amount_to_pay <= 0:
             return Response(
@@ -80,11 +94,14 @@ class MpesaStkPushAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Check for existing PENDING transaction for this order
+        # Reuse a PENDING transaction only if it was requested for exactly these
+        # orders at this amount; a cart that changed since needs a new request.
         existing_transaction = Transaction.objects.filter(
-            order=order, status="PENDING"
+            orders=order, status="PENDING", amount=amount_to_pay
         ).first()
-        if existing_transaction:
+        if existing_transaction and set(
+            existing_transaction.orders.values_list("pk", flat=True)
+        ) == {o.pk for o in open_orders}:
             logger.info(
                 f"Existing PENDING transaction found for order {order_id}. Returning its details."
             )
@@ -94,11 +111,12 @@ class MpesaStkPushAPIView(APIView):
         try:
             with db_transaction.atomic():
                 tx = Transaction.objects.create(
-                    order=order,
+                    cart_id=order.cart_id,
                     phone=phone_number,
                     amount=amount_to_pay,
                     status="PENDING",
                 )
+                tx.orders.set(open_orders)
                 client = MpesaClient()
                 account_reference = f"Ltronix_{order.id}"
                 transaction_desc = f"Payment for Order {order.id}"
@@ -216,9 +234,8 @@ class MpesaConfirmationAPIView(APIView):
                 )
 
             try:
-                # Use select_related to get the order and customer in one query for email sending
                 transaction = get_object_or_404(
-                    Transaction.objects.select_related('order__customer__user'),
+                    Transaction.objects.all(),
                     merchant_request_id=merchant_request_id
                 )
 
@@ -232,7 +249,7 @@ class MpesaConfirmationAPIView(APIView):
                     )
 
                 if result_code == 0:
-                    transaction.mark_completed(
+                    completed_orders = transaction.mark_completed(
                         mpesa_receipt=mpesa_receipt_number,
                         result_code=result_code,
                         result_desc=result_desc,
@@ -240,31 +257,22 @@ class MpesaConfirmationAPIView(APIView):
                     logger.info(
                         f"Transaction {transaction.id} COMPLETED. Receipt: {mpesa_receipt_number}"
                     )
-                    
-                    # Send payment receipt email
-                    recipient_email = None
-                    if transaction.order and transaction.order.customer:
-                        if transaction.order.customer.user:
-                            recipient_email = transaction.order.customer.user.email
-                        else: # Guest customer associated directly with email
-                            recipient_email = transaction.order.customer.email
-
-                    if recipient_email:
-                        send_payment_receipt(recipient_email, {
-                            'order_id': transaction.order.id, # Changed from 'id' to 'order_id' for clarity in template
-                            'customer_name': transaction.order.customer.name if transaction.order.customer else 'Guest',
-                            'amount_paid': str(transaction.amount), # Use transaction amount
-                            'mpesa_receipt_number': mpesa_receipt_number,
-                            'transaction_date': transaction.created_at.strftime("%Y-%m-%d %H:%M:%S"), # Format date
-                            'items': [{
-                                'product_name': item.product.name,
-                                'quantity': item.quantity,
-                                'get_total': str(item.get_total)
-                            } for item in transaction.order.orderitem_set.all()]
-                        })
-                        logger.info(
-                            f"Payment receipt email sent to {recipient_email} for order {transaction.order.id}"
-                        )
+
+                    # Send payment receipt emails from the frozen order snapshots;
+                    # no line items are queried on the callback path.
+                    for order in completed_orders:
+                        recipient_email = None
+                        if order.customer:
+                            if order.customer.user:
+                                recipient_email = order.customer.user.email
+                            else: # Guest customer associated directly with email
+                                recipient_email = order.customer.email
+
+                        if recipient_email:
+                            send_payment_receipt_email(order, recipient_email)
+                            logger.info(
+                                f"Payment receipt email sent to {recipient_email} for order {order.id}"
+                            )
                 else:
                     if result_code == 1032:
                         transaction.mark_cancelled(
@@ -337,7 +345,7 @@ class MpesaPaymentStatusAPIView(APIView):
             )
 
         try:
-            transaction_query = Transaction.objects.all()
+            transaction_query = Transaction.objects.select_related("cart__customer").prefetch_related("orders")
 
             if transaction_id:
                 transaction_query = transaction_query.filter(id=transaction_id)
@@ -348,9 +356,10 @@ class MpesaPaymentStatusAPIView(APIView):
 
             # Permission check: ensure the user/session owns the transaction's order
             is_owner = False
-            if request.user.is_authenticated and transaction.order and transaction.order.customer and transaction.order.customer.user == request.user:
+            cart = transaction.cart
+            if request.user.is_authenticated and cart and cart.customer and cart.customer.user_id == request.user.pk:
                 is_owner = True
-            elif guest_session_key and transaction.order and transaction.order.session_key == guest_session_key:
+            elif guest_session_key and cart and cart.session_key == guest_session_key:
                 is_owner = True
             
             if not is_owner:
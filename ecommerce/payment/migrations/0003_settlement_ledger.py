@@ -0,0 +1,63 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0002_remove_transaction_order_transaction_cart'),
+        ('sellers', '0002_sales_rollups'),
+        ('store', '0014_order_fulfilment_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Payout',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='amount')),
+                ('payout_details_id', models.CharField(max_length=255, verbose_name='payout account')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('PAID', 'Paid'), ('FAILED', 'Failed')], default='PENDING', max_length=10, verbose_name='status')),
+                ('reference', models.CharField(blank=True, max_length=255, verbose_name='provider reference')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('seller', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='payouts', to='sellers.seller', verbose_name='seller')),
+            ],
+            options={
+                'verbose_name': 'Payout',
+                'verbose_name_plural': 'Payouts',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SettlementEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('SALE', 'Sale'), ('COMMISSION', 'Commission'), ('PAYOUT', 'Payout')], max_length=10, verbose_name='kind')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='amount')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='settlement_entries', to='store.order')),
+                ('payout', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='entries', to='payment.payout')),
+                ('seller', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='settlement_entries', to='sellers.seller', verbose_name='seller')),
+                ('transaction', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='settlement_entries', to='payment.transaction')),
+            ],
+            options={
+                'verbose_name': 'Settlement Entry',
+                'verbose_name_plural': 'Settlement Entries',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='payout',
+            index=models.Index(fields=['status', 'created_at'], name='payment_pay_status_91b1c4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='settlemententry',
+            index=models.Index(fields=['seller', 'created_at'], name='payment_set_seller__c5e09b_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='settlemententry',
+            constraint=models.UniqueConstraint(condition=models.Q(('order__isnull', False)), fields=('order', 'kind'), name='unique_settlement_entry_per_order'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0003_settlement_ledger'),
+        ('store', '0015_product_is_visible'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['mpesa_receipt_number'], name='payment_tra_mpesa_r_68677d_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:45
+
+from django.db import migrations, models
+
+
+def link_existing_orders(apps, schema_editor):
+    """
+    Completed transactions get the orders they completed; pending ones keep
+    covering their cart's open orders, as they did before the field existed.
+    """
+    Transaction = apps.get_model('payment', 'Transaction')
+    Order = apps.get_model('store', 'Order')
+    for transaction in Transaction.objects.filter(cart__isnull=False).iterator():
+        orders = Order.objects.filter(cart_id=transaction.cart_id)
+        if transaction.status == 'COMPLETED':
+            orders = orders.filter(transaction_id=transaction.mpesa_receipt_number)
+        elif transaction.status == 'PENDING':
+            orders = orders.filter(complete=False)
+        else:
+            continue
+        transaction.orders.set(orders)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0004_admin_search_indexes'),
+        ('store', '0016_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='orders',
+            field=models.ManyToManyField(blank=True, related_name='transactions', to='store.order', verbose_name='Paid Orders'),
+        ),
+        migrations.RunPython(link_existing_orders, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,14 @@
 # payment/models.py
+import logging
 import uuid  # Import uuid for generating unique transaction IDs if needed
 
 from django.db import models
+from django.db import transaction as db_transaction
+from django.db.models import Prefetch
 from django.utils.translation import gettext_lazy as _
-from store.models import Cart, Order  # Ensure Order is correctly imported
+from store.models import Cart, Order, OrderItem  # Ensure Order is correctly imported
+
+logger = logging.getLogger(__name__)
 
 
 class Transaction(models.Model):
@@ -18,6 +23,14 @@ class Transaction(models.Model):
         verbose_name=_("Associated Cart"),
         help_text=_("The shopping cart associated with this transaction.")
     )
+    # The open orders this payment was requested for; `amount` is their total.
+    # Completing the payment completes exactly these orders.
+    orders = models.ManyToManyField(
+        Order,
+        blank=True,
+        related_name="transactions",
+        verbose_name=_("Paid Orders"),
+    )
 
     # Phone number used for the STK Push
     phone = models.CharField(max_length=20, verbose_name=_("Phone Number"))
@@ -100,6 +113,7 @@ class Transaction(models.Model):
         ordering = ["-created_at"]  # Order by most recent transaction
         indexes = [
             models.Index(fields=["phone"]),
+            models.Index(fields=["mpesa_receipt_number"]),
             models.Index(fields=["status"]),
             models.Index(fields=["-created_at"]),
         ]
@@ -108,20 +122,42 @@ class Transaction(models.Model):
         return f"TXN {self.id} | Cart {self.cart.id if self.cart else 'N/A'} | {self.phone} | {self.amount} | {self.status}"
 
     def mark_completed(self, mpesa_receipt=None, result_code=None, result_desc=None):
-        """Marks the transaction as completed and updates associated order."""
-        self.status = "COMPLETED"
-        self.mpesa_receipt_number = mpesa_receipt
-        self.result_code = str(result_code) if result_code is not None else None
-        self.result_desc = result_desc
-        self.is_callback_received = True
-        self.save()
-        if self.cart:
-            for order in self.cart.orders.all():
-                if not order.complete:
-                    order.complete = True
-                    order.transaction_id = self.mpesa_receipt_number
-                    order.save()
-                    print(f"Order {order.id} marked as complete and transaction_id set to {self.mpesa_receipt_number}")
+        """
+        Marks the transaction as completed and completes the orders it was
+        requested for, freezing each order's snapshot and crediting each order's
+        seller in the settlement ledger. Returns the orders that were completed,
+        with their customers loaded for sending receipts.
+
+        The orders are locked while they are completed, so a repeated or
+        concurrent callback finds them complete and completes nothing twice.
+        """
+        from .settlement import record_order_settlements
+
+        with db_transaction.atomic():
+            self.status = "COMPLETED"
+            self.mpesa_receipt_number = mpesa_receipt
+            self.result_code = str(result_code) if result_code is not None else None
+            self.result_desc = result_desc
+            self.is_callback_received = True
+            self.save()
+            orders = list(
+                self.orders.filter(complete=False)
+                .select_for_update(of=("self",))
+                .select_related("customer__user")
+                .prefetch_related(
+                    Prefetch("orderitem_set", queryset=OrderItem.objects.select_related("product"))
+                )
+            )
+            for order in orders:
+                order.mark_complete(transaction_id=self.mpesa_receipt_number)
+                logger.info(
+                    "Order %s marked as complete and transaction_id set to %s",
+                    order.id,
+                    self.mpesa_receipt_number,
+                )
+            # Each seller's share of the payment goes to the settlement ledger.
+            record_order_settlements(orders, payment=self)
+        return orders
 
     def mark_failed(self, result_code=None, result_desc=None):
         """Marks the transaction as failed."""
@@ -147,4 +183,84 @@ class Transaction(models.Model):
         self.result_desc = result_desc
         self.is_callback_received = True
         self.save()
-        print(f"Transaction {self.id} marked as CANCELLED by user.")
\ No newline at end of file
+        print(f"Transaction {self.id} marked as CANCELLED by user.")
+
+class Payout(models.Model):
+    """A transfer of a seller's settled balance, created by the payout job."""
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", _("Pending")
+        PAID = "PAID", _("Paid")
+        FAILED = "FAILED", _("Failed")
+
+    seller = models.ForeignKey(
+        "sellers.Seller", on_delete=models.PROTECT, related_name="payouts", verbose_name=_("seller")
+    )
+    amount = models.DecimalField(_("amount"), max_digits=14, decimal_places=2)
+    # Copied from SellerProfile.payout_details_id when the payout is created.
+    payout_details_id = models.CharField(_("payout account"), max_length=255)
+    status = models.CharField(
+        _("status"), max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    reference = models.CharField(_("provider reference"), max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Payout")
+        verbose_name_plural = _("Payouts")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Payout {self.id} | {self.seller_id} | {self.amount} | {self.status}"
+
+
+class SettlementEntry(models.Model):
+    """
+    One append-only line of the seller settlement ledger. Amounts are signed:
+    sales credit the seller, commission and payouts debit them, and a seller's
+    balance is the sum of their entries. Rows are never updated, so recording
+    sales never contends for a per-seller balance row.
+    """
+
+    class Kind(models.TextChoices):
+        SALE = "SALE", _("Sale")
+        COMMISSION = "COMMISSION", _("Commission")
+        PAYOUT = "PAYOUT", _("Payout")
+
+    seller = models.ForeignKey(
+        "sellers.Seller", on_delete=models.PROTECT, related_name="settlement_entries", verbose_name=_("seller")
+    )
+    kind = models.CharField(_("kind"), max_length=10, choices=Kind.choices)
+    amount = models.DecimalField(_("amount"), max_digits=14, decimal_places=2)
+    order = models.ForeignKey(
+        Order, on_delete=models.PROTECT, null=True, blank=True, related_name="settlement_entries"
+    )
+    transaction = models.ForeignKey(
+        Transaction, on_delete=models.SET_NULL, null=True, blank=True, related_name="settlement_entries"
+    )
+    payout = models.ForeignKey(
+        Payout, on_delete=models.PROTECT, null=True, blank=True, related_name="entries"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Settlement Entry")
+        verbose_name_plural = _("Settlement Entries")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["seller", "created_at"]),
+        ]
+        constraints = [
+            # A repeated payment callback can never credit an order twice.
+            models.UniqueConstraint(
+                fields=["order", "kind"],
+                condition=models.Q(order__isnull=False),
+                name="unique_settlement_entry_per_order",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.amount} for seller {self.seller_id}"
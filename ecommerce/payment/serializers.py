@@ -14,7 +14,8 @@ class TransactionSerializer(serializers.ModelSerializer):
         model = Transaction
         fields = [
             "id",
-            "order",
+            "cart",
+            "orders",
             "phone",
             "amount",
             "merchant_request_id",
@@ -28,6 +29,7 @@ class TransactionSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = [
+            "orders",
             "merchant_request_id",
             "checkout_request_id",
             "mpesa_receipt_number",
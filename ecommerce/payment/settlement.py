@@ -0,0 +1,103 @@
+# payment/settlement.py
+"""
+Seller settlement ledger.
+
+When a payment completes, each per-seller order it was requested for credits
+its seller with the order total and debits the marketplace commission. The rows are
+computed from the frozen order snapshots and written with one insert (see
+SettlementEntry). Balances are never stored: the payout job sums each seller's
+entries with one aggregate query and settles every balance of at least
+SELLER_PAYOUT_MINIMUM by appending a matching PAYOUT debit.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+
+from sellers.models import Seller
+
+from .models import Payout, SettlementEntry
+
+CENT = Decimal("0.01")
+
+
+def commission_rate():
+    return Decimal(str(getattr(settings, "MARKETPLACE_COMMISSION_RATE", "0")))
+
+
+def payout_minimum():
+    return Decimal(str(getattr(settings, "SELLER_PAYOUT_MINIMUM", "0.01")))
+
+
+def record_order_settlements(orders, payment=None):
+    """
+    Appends the SALE and COMMISSION entries for completed orders in one insert.
+    Orders already in the ledger are skipped, so repeated calls are harmless.
+    """
+    rate = commission_rate()
+    entries = []
+    for order in orders:
+        if order.seller_id is None:
+            continue
+        total = Decimal(order.get_snapshot()["total"])
+        if not total:
+            continue
+        common = {"seller_id": order.seller_id, "order": order, "transaction": payment}
+        entries.append(SettlementEntry(kind=SettlementEntry.Kind.SALE, amount=total, **common))
+        commission = (total * rate).quantize(CENT, rounding=ROUND_HALF_UP)
+        if commission:
+            entries.append(
+                SettlementEntry(kind=SettlementEntry.Kind.COMMISSION, amount=-commission, **common)
+            )
+    if entries:
+        SettlementEntry.objects.bulk_create(entries, ignore_conflicts=True)
+    return entries
+
+
+def seller_balances(seller_ids=None):
+    """Returns [{"seller_id", "payout_details_id", "balance"}] for sellers with payout details."""
+    entries = SettlementEntry.objects.filter(seller__profile__payout_details_id__gt="")
+    if seller_ids is not None:
+        entries = entries.filter(seller_id__in=seller_ids)
+    return list(
+        entries.values("seller_id", payout_details_id=F("seller__profile__payout_details_id"))
+        .annotate(balance=Sum("amount"))
+        .order_by("seller_id")
+    )
+
+
+def create_payouts(minimum=None):
+    """
+    Creates a PENDING Payout, and its balancing PAYOUT entry, for every seller
+    whose balance is at least `minimum`. Returns the payouts created.
+    """
+    minimum = payout_minimum() if minimum is None else minimum
+    candidates = [row["seller_id"] for row in seller_balances() if row["balance"] >= minimum]
+    if not candidates:
+        return []
+
+    with transaction.atomic():
+        # Locking the sellers serialises concurrent payout runs; sales only
+        # append entries and never wait on these locks. Balances are re-read
+        # under the lock so a run that waited sees the other run's payouts.
+        list(Seller.objects.select_for_update().filter(pk__in=candidates).values_list("pk", flat=True))
+        due = [row for row in seller_balances(candidates) if row["balance"] >= minimum]
+        payouts = Payout.objects.bulk_create(
+            [
+                Payout(seller_id=row["seller_id"], amount=row["balance"], payout_details_id=row["payout_details_id"])
+                for row in due
+            ]
+        )
+        SettlementEntry.objects.bulk_create(
+            [
+                SettlementEntry(
+                    seller_id=payout.seller_id,
+                    kind=SettlementEntry.Kind.PAYOUT,
+                    amount=-payout.amount,
+                    payout=payout,
+                )
+                for payout in payouts
+            ]
+        )
+    return payouts
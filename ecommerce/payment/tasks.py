@@ -0,0 +1,22 @@
+# payment/tasks.py
+import logging
+
+from celery import shared_task
+
+from .settlement import create_payouts
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def create_seller_payouts_task():
+    """
+    Settles seller balances from the ledger (see payment.settlement). Runs
+    periodically via CELERY_BEAT_SCHEDULE.
+    """
+    payouts = create_payouts()
+    if payouts:
+        logger.info(
+            f"Created {len(payouts)} seller payout(s) totalling {sum(p.amount for p in payouts)}."
+        )
+    return len(payouts)
@@ -2,7 +2,8 @@ from decimal import Decimal
 
 import pytest
 from django.contrib.auth import get_user_model
-from payment.models import Transaction
+from payment.models import Payout, SettlementEntry, Transaction
+from payment.settlement import create_payouts, seller_balances
 from store.models import Customer, Order
 
 User = get_user_model()
@@ -95,3 +96,146 @@ def test_transaction_mark_cancelled(order):
     assert transaction.result_code == "1032"
     assert transaction.result_desc == "User cancelled"
     assert transaction.is_callback_received is True
+
+
+@pytest.mark.django_db
+def test_transaction_mark_completed_freezes_cart_order_snapshots(customer_user, django_assert_max_num_queries):
+    from sellers.models import Seller
+    from store.models import Cart, Product
+
+    seller_user = User.objects.create_user(email="snap-seller@example.com", password="password123")
+    seller = Seller.objects.create(user=seller_user, business_name="Snapshot Seller")
+    cart = Cart.objects.create(customer=customer_user)
+    orders = [Order.objects.create(cart=cart, seller=seller, customer=customer_user) for _ in range(2)]
+    for i, order in enumerate(orders):
+        for j in range(3):
+            product = Product.objects.create(seller=seller, name=f"P{i}{j}", price=Decimal("5.00"))
+            order.orderitem_set.create(product=product, quantity=2)
+    transaction = Transaction.objects.create(
+        cart=cart, phone="254712345678", amount=Decimal("60.00"), status="PENDING"
+    )
+    transaction.orders.set(orders)
+
+    # The query count must not grow with the number of line items; the ledger
+    # adds one insert (plus its savepoint) per payment.
+    with django_assert_max_num_queries(10):
+        completed = transaction.mark_completed(mpesa_receipt="MPESA123", result_code=0)
+
+    assert len(completed) == 2
+    order = Order.objects.get(pk=orders[0].pk)
+    assert order.complete is True
+    assert order.transaction_id == "MPESA123"
+    assert order.snapshot["total"] == "30.00"
+    assert order.snapshot["items_count"] == 6
+    assert order.snapshot["customer_name"] == "Test Customer"
+
+
+@pytest.fixture
+def two_seller_cart(customer_user, settings):
+    from sellers.models import Seller, SellerProfile
+    from store.models import Cart, Product
+
+    settings.MARKETPLACE_COMMISSION_RATE = "0.10"
+    cart = Cart.objects.create(customer=customer_user)
+    sellers = []
+    for i, price in enumerate([Decimal("150.00"), Decimal("40.00")]):
+        user = User.objects.create_user(email=f"ledger{i}@example.com", password="password123")
+        seller = Seller.objects.create(user=user, business_name=f"Ledger Seller {i}")
+        SellerProfile.objects.create(seller=seller, payout_details_id=f"acct_{i}")
+        order = Order.objects.create(cart=cart, seller=seller, customer=customer_user)
+        order.orderitem_set.create(
+            product=Product.objects.create(seller=seller, name=f"L{i}", price=price), quantity=1
+        )
+        sellers.append(seller)
+    transaction = Transaction.objects.create(
+        cart=cart, phone="254712345678", amount=Decimal("190.00"), status="PENDING"
+    )
+    transaction.orders.set(cart.orders.all())
+    return transaction, sellers
+
+
+@pytest.mark.django_db
+def test_mark_completed_appends_seller_settlement_entries(two_seller_cart):
+    transaction, (first, second) = two_seller_cart
+
+    transaction.mark_completed(mpesa_receipt="MPESA-LEDGER", result_code=0)
+    transaction.mark_completed(mpesa_receipt="MPESA-LEDGER", result_code=0)  # a repeated callback
+
+    entries = SettlementEntry.objects.filter(transaction=transaction)
+    assert sorted(entries.values_list("seller_id", "kind", "amount")) == sorted([
+        (first.pk, "SALE", Decimal("150.00")),
+        (first.pk, "COMMISSION", Decimal("-15.00")),
+        (second.pk, "SALE", Decimal("40.00")),
+        (second.pk, "COMMISSION", Decimal("-4.00")),
+    ])
+    balances = {row["seller_id"]: row["balance"] for row in seller_balances()}
+    assert balances == {first.pk: Decimal("135.00"), second.pk: Decimal("36.00")}
+
+
+@pytest.mark.django_db
+def test_create_payouts_settles_balances_above_minimum(two_seller_cart):
+    transaction, (first, second) = two_seller_cart
+    transaction.mark_completed(mpesa_receipt="MPESA-PAYOUT", result_code=0)
+
+    payouts = create_payouts(minimum=Decimal("100.00"))
+
+    assert [(p.seller_id, p.amount, p.payout_details_id) for p in payouts] == [
+        (first.pk, Decimal("135.00"), "acct_0")
+    ]
+    assert Payout.objects.get().status == Payout.Status.PENDING
+    balances = {row["seller_id"]: row["balance"] for row in seller_balances()}
+    assert balances == {first.pk: Decimal("0.00"), second.pk: Decimal("36.00")}
+    # Nothing is owed twice.
+    assert create_payouts(minimum=Decimal("100.00")) == []
+
+
+@pytest.mark.django_db
+def test_mark_completed_only_completes_the_orders_it_was_requested_for(two_seller_cart):
+    transaction, (first, second) = two_seller_cart
+    transaction.orders.set(Order.objects.filter(seller=first))
+
+    completed = transaction.mark_completed(mpesa_receipt="MPESA-SCOPE", result_code=0)
+
+    assert [o.seller_id for o in completed] == [first.pk]
+    assert Order.objects.get(seller=second).complete is False
+    assert not SettlementEntry.objects.filter(seller=second).exists()
+
+
+@pytest.mark.django_db
+def test_stk_push_charges_and_records_every_open_order_in_the_cart(two_seller_cart, monkeypatch):
+    from django.urls import reverse
+    from django_daraja.mpesa.core import MpesaClient
+    from rest_framework.test import APIClient
+
+    pending, _ = two_seller_cart
+    pending.delete()
+    requests = iter(range(1, 100))
+    monkeypatch.setattr(MpesaClient, "stk_push", lambda self, **kwargs: {
+        "ResponseCode": "0", "MerchantRequestID": f"mr_{next(requests)}", "CheckoutRequestID": f"co_{next(requests)}",
+    })
+    first_order, second_order = Order.objects.order_by("pk")
+    client = APIClient()
+    client.force_authenticate(user=first_order.customer.user)
+
+    response = client.post(
+        reverse("api_stk_push"), {"phone_number": "254712345678", "order_id": first_order.pk}, format="json"
+    )
+
+    assert response.status_code == 200
+    transaction = Transaction.objects.get(pk=response.data["id"])
+    assert transaction.amount == Decimal("190.00")
+    assert sorted(transaction.orders.values_list("pk", flat=True)) == [first_order.pk, second_order.pk]
+
+    # The other seller's order is covered by the same pending payment.
+    response = client.post(
+        reverse("api_stk_push"), {"phone_number": "254712345678", "order_id": second_order.pk}, format="json"
+    )
+    assert response.data["id"] == transaction.pk
+
+    # Once the cart changes, the old request no longer matches it.
+    second_order.orderitem_set.update(quantity=2)
+    response = client.post(
+        reverse("api_stk_push"), {"phone_number": "254712345678", "order_id": second_order.pk}, format="json"
+    )
+    assert response.data["id"] != transaction.pk
+    assert Transaction.objects.get(pk=response.data["id"]).amount == Decimal("230.00")
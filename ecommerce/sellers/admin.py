@@ -1,6 +1,6 @@
 # ecommerce/sellers/admin.py
 from django.contrib import admin
-from .models import Seller, SellerProfile
+from .models import ProductDailySales, Seller, SellerDailySales, SellerProfile
 
 class SellerProfileInline(admin.StackedInline):
     model = SellerProfile
@@ -12,4 +12,20 @@ class SellerAdmin(admin.ModelAdmin):
     list_display = ('business_name', 'user', 'is_active', 'created_at')
     list_filter = ('is_active',)
     search_fields = ('business_name', 'user__email')
-    inlines = (SellerProfileInline,)
\ No newline at end of file
+    inlines = (SellerProfileInline,)
+
+
+@admin.register(SellerDailySales)
+class SellerDailySalesAdmin(admin.ModelAdmin):
+    list_display = ('seller', 'date', 'orders', 'units', 'revenue')
+    list_filter = ('date',)
+    list_select_related = ('seller',)
+    date_hierarchy = 'date'
+
+
+@admin.register(ProductDailySales)
+class ProductDailySalesAdmin(admin.ModelAdmin):
+    list_display = ('product', 'seller', 'date', 'orders', 'units', 'revenue')
+    list_select_related = ('product', 'seller')
+    raw_id_fields = ('product', 'seller')
+    date_hierarchy = 'date'
@@ -0,0 +1,193 @@
+# ecommerce/sellers/analytics.py
+"""
+Seller sales analytics.
+
+When an order completes, store.signals.order_completed queues
+sellers.tasks.record_order_sales_task, which adds the order's frozen snapshot
+to three rollup tables: per seller per day, per seller per hour and per
+product per day. Dashboard queries read only
+those rollups, so a year of data is at most a few hundred rows per seller and
+never touches orders or order items.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from store.models import Order, Product
+
+from .models import CountedOrder, ProductDailySales, SellerDailySales, SellerHourlySales
+
+GRANULARITIES = ("hour", "day", "week", "month")
+_TRUNCATE = {"week": TruncWeek, "month": TruncMonth}
+
+
+def _increment(model, lookup, orders, units, revenue):
+    """
+    Adds to the rollup row for `lookup`, creating it on first use. The UPDATE
+    with F() expressions is atomic, so concurrent completions never lose counts.
+    """
+    deltas = {
+        "orders": F("orders") + orders,
+        "units": F("units") + units,
+        "revenue": F("revenue") + revenue,
+    }
+    if model.objects.filter(**lookup).update(**deltas):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, orders=orders, units=units, revenue=revenue)
+    except IntegrityError:
+        # Another transaction created the row in the meantime.
+        model.objects.filter(**lookup).update(**deltas)
+
+
+def _sales_buckets(snapshot):
+    """
+    Splits a snapshot into (seller_id, day, hour, totals, per_product), where
+    totals and each per-product entry are [orders, units, revenue].
+    """
+    completed_at = snapshot.get("completed_at")
+    local = timezone.localtime(parse_datetime(completed_at) if completed_at else timezone.now())
+    per_product = defaultdict(lambda: [1, 0, Decimal("0")])
+    for line in snapshot["items"]:
+        per_product[line["product_id"]][1] += line["quantity"]
+        per_product[line["product_id"]][2] += Decimal(line["total"])
+    totals = [1, snapshot["items_count"], Decimal(snapshot["total"])]
+    hour = local.replace(minute=0, second=0, microsecond=0)
+    return snapshot["seller_id"], local.date(), hour, totals, per_product
+
+
+def record_order_sales(snapshot):
+    """Adds one completed order, given its snapshot, to its seller's rollups."""
+    if snapshot.get("seller_id") is None or not snapshot["items"]:
+        return
+    seller_id, day, hour, totals, per_product = _sales_buckets(snapshot)
+    _increment(SellerDailySales, {"seller_id": seller_id, "date": day}, *totals)
+    _increment(SellerHourlySales, {"seller_id": seller_id, "hour": hour}, *totals)
+    for product_id, counts in per_product.items():
+        _increment(
+            ProductDailySales,
+            {"seller_id": seller_id, "product_id": product_id, "date": day},
+            *counts,
+        )
+
+
+def rebuild_sales_rollups(seller_id=None, batch_size=1000):
+    """
+    Recomputes the rollups from completed orders' snapshots, for one seller or
+    all of them, and marks those orders counted. Returns the number of orders
+    counted.
+    """
+    orders = Order.objects.filter(complete=True, snapshot__isnull=False, seller__isnull=False)
+    rollups = [SellerDailySales, SellerHourlySales, ProductDailySales]
+    if seller_id is not None:
+        orders = orders.filter(seller_id=seller_id)
+
+    daily, hourly, products = {}, {}, {}
+
+    def add(target, key, counts):
+        current = target.setdefault(key, [0, 0, Decimal("0")])
+        for i, value in enumerate(counts):
+            current[i] += value
+
+    counted, order_ids = 0, []
+    for order_id, snapshot in orders.values_list("pk", "snapshot").iterator(chunk_size=batch_size):
+        order_ids.append(order_id)
+        if not snapshot["items"]:
+            continue
+        seller, day, hour, totals, per_product = _sales_buckets(snapshot)
+        add(daily, (seller, day), totals)
+        add(hourly, (seller, hour), totals)
+        for product_id, counts in per_product.items():
+            add(products, (seller, product_id, day), counts)
+        counted += 1
+
+    # Products deleted since have lost their per-product rows.
+    existing = set(
+        Product.objects.filter(pk__in={key[1] for key in products}).values_list("pk", flat=True)
+    )
+    with transaction.atomic():
+        for model in rollups:
+            stale = model.objects.all()
+            if seller_id is not None:
+                stale = stale.filter(seller_id=seller_id)
+            stale.delete()
+        markers = CountedOrder.objects.all()
+        if seller_id is not None:
+            markers = markers.filter(order__seller_id=seller_id)
+        markers.delete()
+        CountedOrder.objects.bulk_create(
+            [CountedOrder(order_id=pk) for pk in order_ids], batch_size=batch_size
+        )
+        SellerDailySales.objects.bulk_create(
+            [SellerDailySales(seller_id=s, date=d, orders=o, units=u, revenue=r)
+             for (s, d), (o, u, r) in daily.items()],
+            batch_size=batch_size,
+        )
+        SellerHourlySales.objects.bulk_create(
+            [SellerHourlySales(seller_id=s, hour=h, orders=o, units=u, revenue=r)
+             for (s, h), (o, u, r) in hourly.items()],
+            batch_size=batch_size,
+        )
+        ProductDailySales.objects.bulk_create(
+            [ProductDailySales(seller_id=s, product_id=p, date=d, orders=o, units=u, revenue=r)
+             for (s, p, d), (o, u, r) in products.items() if p in existing],
+            batch_size=batch_size,
+        )
+    return counted
+
+
+def _day_bounds(start, end):
+    """Aware datetimes covering the local days start..end inclusive."""
+    return (
+        timezone.make_aware(datetime.combine(start, time.min)),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)),
+    )
+
+
+def _totals(rows):
+    totals = rows.aggregate(orders=Sum("orders"), units=Sum("units"), revenue=Sum("revenue"))
+    return {
+        "orders": totals["orders"] or 0,
+        "units": totals["units"] or 0,
+        "revenue": totals["revenue"] or Decimal("0.00"),
+    }
+
+
+def sales_report(seller_id, start, end, granularity="day"):
+    """
+    Returns {"totals": {...}, "series": [{"period", "orders", "units", "revenue"}]}
+    for the local days start..end inclusive, bucketed by `granularity`.
+    """
+    daily = SellerDailySales.objects.filter(seller_id=seller_id, date__range=(start, end))
+    if granularity == "hour":
+        lower, upper = _day_bounds(start, end)
+        series = SellerHourlySales.objects.filter(
+            seller_id=seller_id, hour__gte=lower, hour__lt=upper
+        ).order_by("hour").values("orders", "units", "revenue", period=F("hour"))
+    elif granularity == "day":
+        series = daily.order_by("date").values("orders", "units", "revenue", period=F("date"))
+    else:
+        series = (
+            daily.annotate(period=_TRUNCATE[granularity]("date"))
+            .values("period")
+            .annotate(orders=Sum("orders"), units=Sum("units"), revenue=Sum("revenue"))
+            .order_by("period")
+        )
+    return {"totals": _totals(daily), "series": list(series)}
+
+
+def top_products(seller_id, start, end, limit=10):
+    """The seller's best-selling products by revenue over the local days start..end."""
+    return list(
+        ProductDailySales.objects.filter(seller_id=seller_id, date__range=(start, end))
+        .values("product_id", product_name=F("product__name"))
+        .annotate(orders=Sum("orders"), units=Sum("units"), revenue=Sum("revenue"))
+        .order_by("-revenue", "product_id")[:limit]
+    )
@@ -1,16 +1,25 @@
 # ecommerce/sellers/api_urls.py
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .api_views import SellerProductViewSet
+from .api_views import (CatalogExportView, CatalogImportStatusView,
+                        CatalogImportView, SellerOrderViewSet, SellerProductViewSet,
+                        SellerSalesView, SellerTopProductsView)
 
 # --- Router Configuration ---
 # This section configures the router for the sellers API.
-# It registers the SellerProductViewSet.
+# It registers the SellerProductViewSet and the fulfilment queue.
 router = DefaultRouter()
 router.register(r'products', SellerProductViewSet, basename='seller-products')
+router.register(r'orders', SellerOrderViewSet, basename='seller-orders')
 
 # --- URL Patterns ---
-# This list contains all the URL patterns for the sellers API.
+# This list contains all the URL patterns for the sellers API,
+# including the bulk catalog import/export and dashboard analytics endpoints.
 urlpatterns = [
+    path('catalog/import/', CatalogImportView.as_view(), name='seller-catalog-import'),
+    path('catalog/import/<str:task_id>/', CatalogImportStatusView.as_view(), name='seller-catalog-import-status'),
+    path('catalog/export/', CatalogExportView.as_view(), name='seller-catalog-export'),
+    path('analytics/sales/', SellerSalesView.as_view(), name='seller-analytics-sales'),
+    path('analytics/products/', SellerTopProductsView.as_view(), name='seller-analytics-products'),
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
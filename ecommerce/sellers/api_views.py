@@ -1,22 +1,207 @@
 # In a new file: ecommerce/sellers/api_views.py
-from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticated
+import os
+import uuid
+
+from celery.result import AsyncResult
+from django.core.files.storage import default_storage
+from django.http import StreamingHttpResponse
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
-from .permissions import IsSellerAndOwner # You will create this permission
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
+
+from .analytics import sales_report, top_products
+from ecommerce.pagination import FulfilmentQueueCursorPagination
+
+from .catalog import (CATALOG_FORMATS, bulk_update_products, export_catalog_rows,
+                      stream_catalog)
+from .fulfilment import fulfilment_queue, transition_orders
+from .permissions import IsSeller, IsSellerAndOwner # You will create this permission
+from .serializers import (BULK_UPDATE_MAX_ITEMS, BulkPriceItemSerializer,
+                          BulkStockItemSerializer, FulfilmentQueueQuerySerializer,
+                          FulfilmentTransitionSerializer, SalesReportQuerySerializer,
+                          SellerOrderSerializer)
+from .tasks import import_catalog_task
 from store.models import Product
 from store.serializers import ProductSerializer
 
 class SellerProductViewSet(viewsets.ModelViewSet):
     """
-    API endpoint for sellers to manage their products.
+    API endpoint for sellers to manage their products, plus bulk stock and
+    price updates for ERP syncs: PATCH bulk/stock/ and bulk/price/ with a list
+    of {"id" or "sku", "stock" or "price"}.
     """
     serializer_class = ProductSerializer
-    permission_classes = [IsAuthenticated, IsSellerAndOwner]
+    permission_classes = [IsAuthenticated, IsSeller, IsSellerAndOwner]
+
+    @property
+    def seller_id(self):
+        # IsSeller has already loaded the profile onto the user.
+        return self.request.user.seller_profile.pk
 
     def get_queryset(self):
         """Only show products owned by the logged-in seller."""
-        return Product.objects.filter(seller__user=self.request.user)
+        return Product.objects.filter(seller_id=self.seller_id).select_related("seller")
 
     def perform_create(self, serializer):
         """Associate the new product with the logged-in seller."""
-        serializer.save(seller=self.request.user.seller_profile)
\ No newline at end of file
+        serializer.save(seller=self.request.user.seller_profile)
+
+    def _bulk_update(self, request, item_serializer_class, field):
+        items = item_serializer_class(
+            data=request.data, many=True, allow_empty=False, max_length=BULK_UPDATE_MAX_ITEMS
+        )
+        items.is_valid(raise_exception=True)
+        return Response(bulk_update_products(self.seller_id, items.validated_data, field))
+
+    @action(detail=False, methods=["patch"], url_path="bulk/stock", url_name="bulk-stock")
+    def bulk_stock(self, request):
+        """Sets stock on up to BULK_UPDATE_MAX_ITEMS products in one write."""
+        return self._bulk_update(request, BulkStockItemSerializer, "stock")
+
+    @action(detail=False, methods=["patch"], url_path="bulk/price", url_name="bulk-price")
+    def bulk_price(self, request):
+        """Sets prices on up to BULK_UPDATE_MAX_ITEMS products in one write."""
+        return self._bulk_update(request, BulkPriceItemSerializer, "price")
+
+
+class SellerOrderViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    The seller's fulfilment queue: GET lists completed orders in ?status=
+    (PAID by default), oldest first, with cursor pagination. POST status/
+    with {"ids": [...], "status": "PACKED"} moves many orders forward at once.
+    """
+    serializer_class = SellerOrderSerializer
+    permission_classes = [IsAuthenticated, IsSeller]
+    pagination_class = FulfilmentQueueCursorPagination
+
+    def get_queryset(self):
+        query = FulfilmentQueueQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        return fulfilment_queue(
+            self.request.user.seller_profile.pk, query.validated_data["status"]
+        ).only("pk", "date_ordered", "transaction_id", "fulfilment_status", "snapshot")
+
+    @action(detail=False, methods=["post"], url_path="status", url_name="status")
+    def transition(self, request):
+        serializer = FulfilmentTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = transition_orders(
+            request.user.seller_profile.pk,
+            serializer.validated_data["ids"],
+            serializer.validated_data["status"],
+        )
+        return Response(result)
+
+
+class CatalogImportView(APIView):
+    """
+    Accepts a CSV or JSON Lines catalog upload and imports it in the background.
+    The format comes from `file_format` or the file extension. Responds 202 with
+    the task id; progress is read from CatalogImportStatusView.
+    """
+    permission_classes = [IsAuthenticated, IsSeller]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"file": "This field is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get("file_format") or os.path.splitext(upload.name)[1].lstrip(".").lower()
+        if file_format not in CATALOG_FORMATS:
+            return Response(
+                {"file_format": f"Must be one of: {', '.join(CATALOG_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        seller = request.user.seller_profile
+        path = default_storage.save(
+            f"catalog_imports/{seller.pk}/{uuid.uuid4().hex}.{file_format}", upload
+        )
+        task = import_catalog_task.delay(seller.pk, path, file_format)
+        return Response(
+            {
+                "task_id": task.id,
+                "status_url": reverse("seller-catalog-import-status", args=[task.id], request=request),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class CatalogImportStatusView(APIView):
+    """Reports the state and running counts of a catalog import task."""
+    permission_classes = [IsAuthenticated, IsSeller]
+
+    def get(self, request, task_id):
+        result = AsyncResult(task_id)
+        info = result.info if isinstance(result.info, dict) else None
+        # Progress and results carry the seller id; never expose another seller's import.
+        if info is not None and info.get("seller_id") != request.user.seller_profile.pk:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response({"task_id": task_id, "state": result.state, "progress": info})
+
+
+class CatalogExportView(APIView):
+    """
+    Streams the seller's whole catalog as CSV (default) or JSON Lines
+    (?file_format=jsonl). Rows are read with a server-side iterator and written
+    as they are fetched, so memory use is flat regardless of catalog size.
+    """
+    permission_classes = [IsAuthenticated, IsSeller]
+
+    def get(self, request):
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in CATALOG_FORMATS:
+            return Response(
+                {"file_format": f"Must be one of: {', '.join(CATALOG_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows = export_catalog_rows(request.user.seller_profile.pk)
+        content_type = "text/csv" if file_format == "csv" else "application/x-ndjson"
+        response = StreamingHttpResponse(stream_catalog(rows, file_format), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="catalog.{file_format}"'
+        return response
+
+
+class SellerSalesView(APIView):
+    """
+    Sales totals and a time series for the seller's dashboard, read from the
+    pre-aggregated rollups. Query: start, end (YYYY-MM-DD), granularity
+    (hour, day, week or month).
+    """
+    permission_classes = [IsAuthenticated, IsSeller]
+
+    def get(self, request):
+        query = SalesReportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        report = sales_report(
+            request.user.seller_profile.pk, params["start"], params["end"], params["granularity"]
+        )
+        return Response(
+            {
+                "start": params["start"],
+                "end": params["end"],
+                "granularity": params["granularity"],
+                **report,
+            }
+        )
+
+
+class SellerTopProductsView(APIView):
+    """The seller's best-selling products by revenue. Query: start, end, limit."""
+    permission_classes = [IsAuthenticated, IsSeller]
+
+    def get(self, request):
+        query = SalesReportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        products = top_products(
+            request.user.seller_profile.pk, params["start"], params["end"], params["limit"]
+        )
+        return Response({"start": params["start"], "end": params["end"], "results": products})
@@ -0,0 +1,304 @@
+# ecommerce/sellers/catalog.py
+"""
+Bulk catalog import/export for sellers.
+
+Imports are streamed: rows are parsed lazily from the uploaded file, validated and
+written in fixed-size batches, so memory use does not grow with the file. Each
+batch costs one ownership query, one upsert (`bulk_create` with
+`update_conflicts` on `sku`) and one query re-checking the new SKUs' owners.
+Exports stream rows straight from a server-side
+iterator into the response. Bulk stock and price updates resolve every product
+with one query and write them with one `bulk_update`.
+
+Bulk writes send no model signals, so each import or bulk update bumps the
+catalog cache namespace once when it commits.
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from store.cache import CATALOG_NAMESPACE, bump_cache_version
+from store.models import Category, Product
+
+from .models import Seller
+from .serializers import CatalogRowSerializer
+
+CATALOG_FORMATS = ("csv", "jsonl")
+IMPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+# Fields a bulk PATCH may set; anything else goes through the product endpoint.
+BULK_UPDATE_FIELDS = ("stock", "price")
+# Only the first errors are kept in the result; `error_count` has the total.
+MAX_REPORTED_ERRORS = 100
+
+CATALOG_FIELDS = [
+    "sku",
+    "name",
+    "description",
+    "price",
+    "stock",
+    "brand",
+    "digital",
+    "category",
+]
+# Columns overwritten when an imported SKU already exists. `seller` is never
+# updated, so an import cannot take over another seller's product.
+UPSERT_FIELDS = [
+    "name",
+    "description",
+    "price",
+    "stock",
+    "brand",
+    "digital",
+    "category",
+    "updated_at",
+]
+
+
+class CategoryLookup:
+    """
+    Resolves category slugs, names or ids to primary keys for one import.
+    The index is loaded with a single query on first use and reused for every row.
+    """
+
+    def __init__(self):
+        self._index = None
+
+    def _load(self):
+        rows = list(Category.objects.values_list("pk", "slug", "name"))
+        index = {}
+        for pk, _, name in rows:
+            index.setdefault(name.strip().lower(), pk)
+            index[str(pk)] = pk
+        # Slugs are unique, so they win over (possibly duplicated) names.
+        for pk, slug, _ in rows:
+            if slug:
+                index[slug.lower()] = pk
+        return index
+
+    def resolve(self, value):
+        if self._index is None:
+            self._index = self._load()
+        return self._index.get(str(value).strip().lower())
+
+
+def iter_catalog_rows(stream, file_format):
+    """
+    Lazily yields one dict per row from a binary stream. Empty CSV cells are
+    dropped so serializer defaults apply; a malformed JSON line yields None.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if file_format == "csv":
+        for row in csv.DictReader(text):
+            yield {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and isinstance(value, str) and value.strip()
+            }
+        return
+
+    for line in text:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _record_error(result, line, detail):
+    result["error_count"] += 1
+    if len(result["errors"]) < MAX_REPORTED_ERRORS:
+        result["errors"].append({"line": line, "errors": detail})
+
+
+class _SkusTaken(Exception):
+    """Raised to roll back a batch whose new SKUs another seller created meanwhile."""
+
+    def __init__(self, skus):
+        super().__init__(skus)
+        self.skus = skus
+
+
+def _upsert_owned(seller_id, valid, taken, visible):
+    """
+    Upserts the rows of `valid` ({sku: (line, data)}) that the seller owns or
+    that are new, skipping SKUs in `taken`. Returns {sku: owner before the
+    write} for the rows considered. Must run inside a transaction: a SKU that
+    another seller inserts between the ownership query and the upsert is
+    caught afterwards and raises _SkusTaken, rolling the batch back.
+    """
+    owners = dict(
+        Product.objects.filter(sku__in=list(valid)).values_list("sku", "seller_id")
+    )
+    mine = [
+        sku for sku in valid
+        if sku not in taken and owners.get(sku, seller_id) == seller_id
+    ]
+    if mine:
+        Product.objects.bulk_create(
+            [Product(seller_id=seller_id, is_visible=visible, **valid[sku][1]) for sku in mine],
+            update_conflicts=True,
+            unique_fields=["sku"],
+            update_fields=UPSERT_FIELDS,
+        )
+    created = [sku for sku in mine if sku not in owners]
+    if created:
+        # `seller` is not in UPSERT_FIELDS, so a row someone else inserted
+        # meanwhile still names them; our upsert must not stand.
+        lost = set(
+            Product.objects.filter(sku__in=created)
+            .exclude(seller_id=seller_id)
+            .values_list("sku", flat=True)
+        )
+        if lost:
+            raise _SkusTaken(lost)
+    return owners
+
+
+def _import_batch(seller_id, batch, validator, result, visible):
+    valid = {}
+    for line, row in batch:
+        if not isinstance(row, dict):
+            _record_error(result, line, "Invalid row.")
+            continue
+        try:
+            data = validator.run_validation(row)
+        except serializers.ValidationError as exc:
+            _record_error(result, line, exc.detail)
+            continue
+        # A SKU repeated within the batch keeps its last row; an upsert cannot
+        # touch the same row twice in one statement.
+        valid[data["sku"]] = (line, data)
+
+    taken = set()
+    while True:
+        try:
+            with transaction.atomic():
+                owners = _upsert_owned(seller_id, valid, taken, visible)
+            break
+        except _SkusTaken as exc:
+            # Retry without them; each retry drops at least one SKU.
+            taken |= exc.skus
+
+    for sku, (line, data) in valid.items():
+        owner = owners.get(sku)
+        if sku in taken or (owner is not None and owner != seller_id):
+            _record_error(result, line, {"sku": ["This SKU belongs to another seller."]})
+            continue
+        result["updated" if owner is not None else "created"] += 1
+    result["processed"] += len(batch)
+
+
+def import_catalog(seller_id, rows, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """
+    Upserts a seller's products from an iterable of row dicts.
+    `progress`, if given, is called with the running result after every batch.
+    Returns a summary with created/updated counts and per-line errors.
+    """
+    # bulk_create skips Product.save(), so new rows get the seller's visibility here.
+    visible = Seller.objects.filter(pk=seller_id, is_active=True).exists()
+    validator = CatalogRowSerializer(context={"categories": CategoryLookup()})
+    result = {
+        "processed": 0,
+        "created": 0,
+        "updated": 0,
+        "error_count": 0,
+        "errors": [],
+    }
+    for batch in _batches(enumerate(rows, start=1), batch_size):
+        _import_batch(seller_id, batch, validator, result, visible)
+        if progress is not None:
+            progress(result)
+    if result["created"] or result["updated"]:
+        bump_cache_version(CATALOG_NAMESPACE)
+    return result
+
+
+def bulk_update_products(seller_id, items, field):
+    """
+    Sets `field` (stock or price) on many of a seller's products at once.
+    Each item is a dict with `id` or `sku` and the new value. Products that do
+    not exist or belong to another seller are reported, never touched.
+    Returns {"updated": count, "not_found": [identifiers]}.
+    """
+    if field not in BULK_UPDATE_FIELDS:
+        raise ValueError(f"Bulk updates only support {', '.join(BULK_UPDATE_FIELDS)}.")
+
+    by_id = {item["id"]: item[field] for item in items if item.get("id") is not None}
+    by_sku = {item["sku"]: item[field] for item in items if item.get("id") is None}
+    products = Product.objects.filter(seller_id=seller_id).only("pk", "sku", field)
+    if by_id and by_sku:
+        products = products.filter(Q(pk__in=list(by_id)) | Q(sku__in=list(by_sku)))
+    elif by_id:
+        products = products.filter(pk__in=list(by_id))
+    else:
+        products = products.filter(sku__in=list(by_sku))
+
+    now = timezone.now()
+    changed, found_ids, found_skus = [], set(), set()
+    for product in products:
+        if product.pk in by_id:
+            found_ids.add(product.pk)
+        if product.sku in by_sku:
+            found_skus.add(product.sku)
+        # A product named both by id and by sku takes the value given with its id.
+        value = by_id[product.pk] if product.pk in by_id else by_sku[product.sku]
+        if getattr(product, field) != value:
+            setattr(product, field, value)
+            product.updated_at = now
+            changed.append(product)
+
+    if changed:
+        with transaction.atomic():
+            Product.objects.bulk_update(changed, [field, "updated_at"], batch_size=IMPORT_BATCH_SIZE)
+            transaction.on_commit(lambda: bump_cache_version(CATALOG_NAMESPACE))
+
+    not_found = [pk for pk in by_id if pk not in found_ids]
+    not_found += [sku for sku in by_sku if sku not in found_skus]
+    return {"updated": len(changed), "not_found": not_found}
+
+
+def export_catalog_rows(seller_id):
+    """Yields the seller's products as tuples in CATALOG_FIELDS order."""
+    columns = [field if field != "category" else "category__slug" for field in CATALOG_FIELDS]
+    return (
+        Product.objects.filter(seller_id=seller_id)
+        .order_by("pk")
+        .values_list(*columns)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer streaming."""
+
+    def write(self, value):
+        return value
+
+
+def stream_catalog(rows, file_format):
+    """Encodes export rows one at a time as CSV or JSON Lines."""
+    if file_format == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(CATALOG_FIELDS)
+        for row in rows:
+            yield writer.writerow(row)
+        return
+
+    for row in rows:
+        yield json.dumps(dict(zip(CATALOG_FIELDS, row)), cls=DjangoJSONEncoder) + "\n"
@@ -0,0 +1,55 @@
+# ecommerce/sellers/fulfilment.py
+"""
+Seller order fulfilment.
+
+A completed order starts as PAID and moves forward through
+Order.FulfilmentStatus. A seller's queue is an index range scan on
+(seller, fulfilment_status, date_ordered), and a bulk transition is one
+ownership query plus one UPDATE, however many orders it covers.
+"""
+from django.db import transaction
+
+from store.models import Order
+
+FULFILMENT_FLOW = [
+    Order.FulfilmentStatus.PAID,
+    Order.FulfilmentStatus.PACKED,
+    Order.FulfilmentStatus.SHIPPED,
+    Order.FulfilmentStatus.DELIVERED,
+]
+
+
+def previous_statuses(status):
+    """Statuses an order may move to `status` from: any earlier step in the flow."""
+    return FULFILMENT_FLOW[:FULFILMENT_FLOW.index(status)]
+
+
+def fulfilment_queue(seller_id, status):
+    """The seller's completed orders currently in `status`."""
+    return Order.objects.filter(seller_id=seller_id, fulfilment_status=status, complete=True)
+
+
+def transition_orders(seller_id, order_ids, status):
+    """
+    Moves the seller's orders in `order_ids` to `status`. Orders that are not
+    the seller's, not completed, or already at or past `status` are skipped.
+    Returns {"updated": [ids], "skipped": [ids]}.
+    """
+    with transaction.atomic():
+        eligible = list(
+            Order.objects.select_for_update()
+            .filter(
+                seller_id=seller_id,
+                pk__in=order_ids,
+                complete=True,
+                fulfilment_status__in=previous_statuses(status),
+            )
+            .values_list("pk", flat=True)
+        )
+        if eligible:
+            Order.objects.filter(pk__in=eligible).update(fulfilment_status=status)
+    updated = set(eligible)
+    return {
+        "updated": sorted(updated),
+        "skipped": [pk for pk in dict.fromkeys(order_ids) if pk not in updated],
+    }
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from sellers.analytics import rebuild_sales_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute seller sales rollups from completed orders' snapshots"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seller",
+            type=int,
+            help="Only rebuild the rollups of this seller id.",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_sales_rollups(seller_id=options["seller"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt sales rollups from {count} completed order(s).")
+        )
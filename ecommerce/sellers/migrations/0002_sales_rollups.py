@@ -0,0 +1,68 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sellers', '0001_initial'),
+        ('store', '0013_create_missing_customers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orders', models.PositiveIntegerField(default=0, verbose_name='orders')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='units')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='revenue')),
+                ('date', models.DateField(verbose_name='date')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='store.product')),
+                ('seller', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='product_daily_sales', to='sellers.seller')),
+            ],
+            options={
+                'verbose_name': 'Product Daily Sales',
+                'verbose_name_plural': 'Product Daily Sales',
+                'ordering': ['seller', 'date'],
+                'indexes': [models.Index(fields=['seller', 'date'], name='sellers_pro_seller__7dfbdf_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'date'), name='unique_product_daily_sales')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SellerDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orders', models.PositiveIntegerField(default=0, verbose_name='orders')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='units')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='revenue')),
+                ('date', models.DateField(verbose_name='date')),
+                ('seller', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='sellers.seller')),
+            ],
+            options={
+                'verbose_name': 'Seller Daily Sales',
+                'verbose_name_plural': 'Seller Daily Sales',
+                'ordering': ['seller', 'date'],
+                'constraints': [models.UniqueConstraint(fields=('seller', 'date'), name='unique_seller_daily_sales')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SellerHourlySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orders', models.PositiveIntegerField(default=0, verbose_name='orders')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='units')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='revenue')),
+                ('hour', models.DateTimeField(verbose_name='hour')),
+                ('seller', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hourly_sales', to='sellers.seller')),
+            ],
+            options={
+                'verbose_name': 'Seller Hourly Sales',
+                'verbose_name_plural': 'Seller Hourly Sales',
+                'ordering': ['seller', 'hour'],
+                'constraints': [models.UniqueConstraint(fields=('seller', 'hour'), name='unique_seller_hourly_sales')],
+            },
+        ),
+    ]
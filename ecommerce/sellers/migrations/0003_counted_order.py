@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-19 14:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sellers', '0002_sales_rollups'),
+        ('store', '0016_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CountedOrder',
+            fields=[
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='sales_counted', serialize=False, to='store.order')),
+            ],
+            options={
+                'verbose_name': 'Counted Order',
+                'verbose_name_plural': 'Counted Orders',
+            },
+        ),
+    ]
@@ -36,6 +36,13 @@ class Seller(models.Model):
     def __str__(self):
         return self.business_name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remembers the stored active flag so activation changes can be detected on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_is_active = instance.__dict__.get("is_active")
+        return instance
+
 class SellerProfile(models.Model):
     """
     Holds additional, non-essential details about a seller.
@@ -61,3 +68,76 @@ class SellerProfile(models.Model):
 
     def __str__(self):
         return f"{self.seller.business_name} Profile"
+
+
+class SalesRollup(models.Model):
+    """
+    Pre-aggregated sales counters, incremented as orders complete (see
+    sellers.analytics). Dashboards read these rows instead of joining orders.
+    """
+    orders = models.PositiveIntegerField(_("orders"), default=0)
+    units = models.PositiveIntegerField(_("units"), default=0)
+    revenue = models.DecimalField(_("revenue"), max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        abstract = True
+
+
+class SellerDailySales(SalesRollup):
+    """A seller's completed sales for one local day."""
+    seller = models.ForeignKey(Seller, on_delete=models.CASCADE, related_name='daily_sales')
+    date = models.DateField(_("date"))
+
+    class Meta:
+        verbose_name = _("Seller Daily Sales")
+        verbose_name_plural = _("Seller Daily Sales")
+        ordering = ['seller', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['seller', 'date'], name='unique_seller_daily_sales'),
+        ]
+
+
+class SellerHourlySales(SalesRollup):
+    """A seller's completed sales for one hour, for intraday charts."""
+    seller = models.ForeignKey(Seller, on_delete=models.CASCADE, related_name='hourly_sales')
+    hour = models.DateTimeField(_("hour"))
+
+    class Meta:
+        verbose_name = _("Seller Hourly Sales")
+        verbose_name_plural = _("Seller Hourly Sales")
+        ordering = ['seller', 'hour']
+        constraints = [
+            models.UniqueConstraint(fields=['seller', 'hour'], name='unique_seller_hourly_sales'),
+        ]
+
+
+class ProductDailySales(SalesRollup):
+    """One product's completed sales for one local day."""
+    seller = models.ForeignKey(Seller, on_delete=models.CASCADE, related_name='product_daily_sales')
+    product = models.ForeignKey('store.Product', on_delete=models.CASCADE, related_name='daily_sales')
+    date = models.DateField(_("date"))
+
+    class Meta:
+        verbose_name = _("Product Daily Sales")
+        verbose_name_plural = _("Product Daily Sales")
+        ordering = ['seller', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'date'], name='unique_product_daily_sales'),
+        ]
+        indexes = [
+            models.Index(fields=['seller', 'date']),
+        ]
+
+
+class CountedOrder(models.Model):
+    """
+    Marks an order as already added to the sales rollups, so a retried or
+    redelivered rollup task cannot count it twice (see sellers.tasks).
+    """
+    order = models.OneToOneField(
+        'store.Order', on_delete=models.CASCADE, primary_key=True, related_name='sales_counted'
+    )
+
+    class Meta:
+        verbose_name = _("Counted Order")
+        verbose_name_plural = _("Counted Orders")
@@ -8,3 +8,11 @@ class IsSellerAndOwner(BasePermission):
     def has_object_permission(self, request, view, obj):
         # Assumes the object has a 'seller' attribute
         return hasattr(obj, 'seller') and request.user.is_authenticated and hasattr(request.user, 'seller_profile') and obj.seller == request.user.seller_profile
+
+
+class IsSeller(BasePermission):
+    """
+    Allows access only to authenticated users with a seller profile.
+    """
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and hasattr(request.user, 'seller_profile')
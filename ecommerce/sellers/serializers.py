@@ -1,8 +1,26 @@
 # ecommerce/sellers/serializers.py
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
+from .analytics import GRANULARITIES
+from store.models import Order
+
 from .models import Seller
 from users.serializers import UserDetailsSerializer # Now safe to import directly
 
+class SellerSummarySerializer(serializers.ModelSerializer):
+    """
+    The seller fields embedded in user details. It has no link back to the user,
+    so UserDetailsSerializer can nest it without recursing.
+    """
+
+    class Meta:
+        model = Seller
+        fields = ['id', 'business_name', 'is_active', 'created_at']
+        read_only_fields = fields
+
+
 class SellerSerializer(serializers.ModelSerializer):
     """
     Serializer for the Seller model.
@@ -12,5 +30,117 @@ class SellerSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Seller
-        fields = ['id', 'user_details', 'is_active', 'date_joined']
-        read_only_fields = ['id', 'user_details', 'date_joined']
\ No newline at end of file
+        fields = ['id', 'business_name', 'user_details', 'is_active', 'created_at']
+        read_only_fields = ['id', 'user_details', 'created_at']
+
+class CatalogRowSerializer(serializers.Serializer):
+    """
+    Validates one row of a bulk catalog import (see sellers.catalog).
+    Expects a `categories` lookup in the context; `category` may be a slug, name or id.
+    """
+    sku = serializers.CharField(max_length=50)
+    name = serializers.CharField(max_length=200)
+    description = serializers.CharField(required=False, allow_blank=True, default="")
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    stock = serializers.IntegerField(min_value=0, default=0)
+    brand = serializers.CharField(max_length=100, required=False, allow_blank=True, default="")
+    digital = serializers.BooleanField(default=False)
+    category = serializers.CharField(
+        source="category_id", required=False, allow_blank=True, allow_null=True, default=None
+    )
+
+    def validate_category(self, value):
+        """Maps the category reference to its primary key."""
+        if value in (None, ""):
+            return None
+        pk = self.context["categories"].resolve(value)
+        if pk is None:
+            raise serializers.ValidationError(f"Unknown category '{value}'.")
+        return pk
+
+
+
+class BulkProductUpdateItemSerializer(serializers.Serializer):
+    """One product in a bulk stock or price update, named by `id` or `sku`."""
+    id = serializers.IntegerField(required=False, min_value=1)
+    sku = serializers.CharField(required=False, max_length=50)
+
+    def validate(self, attrs):
+        if ("id" in attrs) == ("sku" in attrs):
+            raise serializers.ValidationError("Give exactly one of id or sku.")
+        return attrs
+
+
+class BulkStockItemSerializer(BulkProductUpdateItemSerializer):
+    stock = serializers.IntegerField(min_value=0)
+
+
+class BulkPriceItemSerializer(BulkProductUpdateItemSerializer):
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+
+
+# Larger syncs are split by the client; one request stays one short transaction.
+BULK_UPDATE_MAX_ITEMS = 1000
+
+class SalesReportQuerySerializer(serializers.Serializer):
+    """
+    Validates dashboard query parameters. Dates are local days, inclusive;
+    the default range is the last 30 days.
+    """
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    granularity = serializers.ChoiceField(choices=GRANULARITIES, default="day")
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+    MAX_HOURLY_DAYS = 31
+
+    def validate(self, attrs):
+        end = attrs.get("end") or timezone.localdate()
+        start = attrs.get("start") or end - timedelta(days=29)
+        if start > end:
+            raise serializers.ValidationError({"start": "Must not be after end."})
+        if attrs["granularity"] == "hour" and (end - start).days >= self.MAX_HOURLY_DAYS:
+            raise serializers.ValidationError(
+                {"granularity": f"Hourly reports cover at most {self.MAX_HOURLY_DAYS} days."}
+            )
+        attrs["start"], attrs["end"] = start, end
+        return attrs
+
+
+class SellerOrderSerializer(serializers.ModelSerializer):
+    """An order in a seller's fulfilment queue, read from its frozen snapshot."""
+    customer_name = serializers.ReadOnlyField(source="snapshot.customer_name")
+    items = serializers.ReadOnlyField(source="snapshot.items")
+    items_count = serializers.ReadOnlyField(source="snapshot.items_count")
+    total = serializers.ReadOnlyField(source="snapshot.total")
+    requires_shipping = serializers.ReadOnlyField(source="snapshot.requires_shipping")
+
+    class Meta:
+        model = Order
+        fields = [
+            "id",
+            "date_ordered",
+            "transaction_id",
+            "fulfilment_status",
+            "customer_name",
+            "items",
+            "items_count",
+            "total",
+            "requires_shipping",
+        ]
+        read_only_fields = fields
+
+
+class FulfilmentQueueQuerySerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Order.FulfilmentStatus.choices, default=Order.FulfilmentStatus.PAID)
+
+
+class FulfilmentTransitionSerializer(serializers.Serializer):
+    """Moves many orders to a later fulfilment status at once."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=BULK_UPDATE_MAX_ITEMS
+    )
+    # PAID is where orders start; it is never a transition target.
+    status = serializers.ChoiceField(
+        choices=[choice for choice in Order.FulfilmentStatus.choices if choice[0] != Order.FulfilmentStatus.PAID]
+    )
@@ -0,0 +1,16 @@
+# ecommerce/sellers/signals.py
+from django.db import transaction
+from django.dispatch import receiver
+
+from store.signals import order_completed
+
+from .tasks import record_order_sales_task
+
+
+@receiver(order_completed)
+def queue_sales_rollup(sender, order, snapshot, **kwargs):
+    """Counts a newly completed order in its seller's rollups once it commits."""
+    if snapshot.get("seller_id") is None:
+        return
+    order_id = order.pk
+    transaction.on_commit(lambda: record_order_sales_task.delay(order_id))
@@ -0,0 +1,59 @@
+# ecommerce/sellers/tasks.py
+import logging
+
+from celery import shared_task
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from store.models import Order
+
+from .analytics import record_order_sales
+from .catalog import import_catalog, iter_catalog_rows
+from .models import CountedOrder
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True)
+def import_catalog_task(self, seller_id, path, file_format):
+    """
+    Imports an uploaded catalog file for a seller, then deletes the upload.
+    Reports the running counts as PROGRESS state after every batch.
+    """
+
+    def report_progress(result):
+        if not self.request.is_eager:
+            self.update_state(state="PROGRESS", meta={"seller_id": seller_id, **result})
+
+    try:
+        with default_storage.open(path, "rb") as stream:
+            result = import_catalog(
+                seller_id, iter_catalog_rows(stream, file_format), progress=report_progress
+            )
+    finally:
+        default_storage.delete(path)
+
+    logger.info(
+        f"Catalog import for seller {seller_id} finished: {result['created']} created, "
+        f"{result['updated']} updated, {result['error_count']} error(s)."
+    )
+    return {"seller_id": seller_id, **result}
+
+
+@shared_task(ignore_result=True)
+def record_order_sales_task(order_id):
+    """
+    Adds a completed order to its seller's sales rollups. Queued when the order
+    commits, so completing a cart's orders never waits on rollup writes.
+    The order's CountedOrder row is created in the same transaction as the
+    increments, so a retry or redelivery of the task is a no-op.
+    """
+    snapshot = Order.objects.filter(pk=order_id).values_list("snapshot", flat=True).first()
+    if snapshot is None:
+        return
+    with transaction.atomic():
+        _, created = CountedOrder.objects.get_or_create(order_id=order_id)
+        if not created:
+            logger.info(f"Order {order_id} is already in the sales rollups; skipping.")
+            return
+        record_order_sales(snapshot)
@@ -5,6 +5,17 @@ from sellers.models import Seller, SellerProfile
 from store.models import Product, Category
 from rest_framework.test import APIClient
 from django.urls import reverse
+import io
+import json
+from django.core.files.uploadedfile import SimpleUploadedFile
+from sellers.catalog import import_catalog, iter_catalog_rows
+from sellers.tasks import import_catalog_task
+from sellers import signals as seller_signals
+from sellers.analytics import rebuild_sales_rollups
+from sellers.models import CountedOrder, ProductDailySales, SellerDailySales, SellerHourlySales
+from store.models import Order, OrderItem
+from decimal import Decimal
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -174,4 +185,344 @@ class TestSellerProductViewSet:
         response = api_client.get(reverse("seller-products-list"))
         assert response.status_code == 401
         response = api_client.post(reverse("seller-products-list"), {}, format='json')
-        assert response.status_code == 401
\ No newline at end of file
+        assert response.status_code == 401
+
+
+
+@pytest.mark.django_db
+class TestSellerBulkUpdates:
+    def test_bulk_stock_by_id_and_sku(self, seller_client, seller_user_and_profile, product_factory, django_assert_max_num_queries):
+        _, seller = seller_user_and_profile
+        products = [product_factory(seller=seller, name=f"P{i}", stock=1) for i in range(5)]
+        Product.objects.filter(pk=products[0].pk).update(sku="ERP-0")
+        payload = [{"sku": "ERP-0", "stock": 50}] + [{"id": p.pk, "stock": 7} for p in products[1:]]
+
+        # session + seller + product lookup + one UPDATE (+ savepoint)
+        with django_assert_max_num_queries(6):
+            response = seller_client.patch(reverse("seller-products-bulk-stock"), payload, format="json")
+
+        assert response.status_code == 200
+        assert response.data == {"updated": 5, "not_found": []}
+        assert Product.objects.get(sku="ERP-0").stock == 50
+        assert set(Product.objects.exclude(sku="ERP-0").values_list("stock", flat=True)) == {7}
+
+    def test_bulk_price_skips_other_sellers_products(self, seller_client, seller_user_and_profile, another_seller_user_and_profile, product_factory):
+        _, seller = seller_user_and_profile
+        _, other = another_seller_user_and_profile
+        mine = product_factory(seller=seller, name="Mine", price=10)
+        theirs = product_factory(seller=other, name="Theirs", price=10)
+
+        response = seller_client.patch(
+            reverse("seller-products-bulk-price"),
+            [{"id": mine.pk, "price": "12.50"}, {"id": theirs.pk, "price": "1.00"}, {"sku": "NOPE", "price": "3.00"}],
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert response.data == {"updated": 1, "not_found": [theirs.pk, "NOPE"]}
+        mine.refresh_from_db()
+        theirs.refresh_from_db()
+        assert mine.price == Decimal("12.50")
+        assert theirs.price == Decimal("10.00")
+
+    def test_bulk_update_bumps_catalog_version_once(self, seller_client, seller_user_and_profile, product_factory, django_capture_on_commit_callbacks):
+        from store.cache import CATALOG_NAMESPACE, get_cache_version
+        _, seller = seller_user_and_profile
+        products = [product_factory(seller=seller, name=f"P{i}") for i in range(3)]
+        before = get_cache_version(CATALOG_NAMESPACE)
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            seller_client.patch(
+                reverse("seller-products-bulk-stock"),
+                [{"id": p.pk, "stock": 99} for p in products],
+                format="json",
+            )
+
+        assert len(callbacks) == 1
+        assert get_cache_version(CATALOG_NAMESPACE) == before + 1
+
+    def test_bulk_update_validates_items(self, seller_client):
+        url = reverse("seller-products-bulk-stock")
+        assert seller_client.patch(url, [], format="json").status_code == 400
+        assert seller_client.patch(url, [{"stock": 1}], format="json").status_code == 400
+        assert seller_client.patch(url, [{"id": 1, "sku": "A", "stock": 1}], format="json").status_code == 400
+        assert seller_client.patch(url, [{"id": 1, "stock": -1}], format="json").status_code == 400
+
+@pytest.mark.django_db
+class TestCatalogImportExport:
+    CSV = (
+        "sku,name,price,stock,category,digital\n"
+        "SKU-1,Laptop,999.99,5,electronics,\n"
+        "SKU-2,E-book,4.50,,Electronics,true\n"
+        "SKU-3,Broken,not-a-price,1,,\n"
+        "SKU-4,Lost,1.00,1,no-such-category,\n"
+    )
+
+    def test_import_upserts_and_reports_errors(self, seller_user_and_profile):
+        _, seller = seller_user_and_profile
+        Category.objects.create(name="Electronics")
+        existing = Product.objects.create(seller=seller, name="Old Laptop", price=1, sku="SKU-1")
+
+        rows = iter_catalog_rows(io.BytesIO(self.CSV.encode()), "csv")
+        result = import_catalog(seller.pk, rows, batch_size=2)
+
+        assert result["processed"] == 4
+        assert result["created"] == 1
+        assert result["updated"] == 1
+        assert [error["line"] for error in result["errors"]] == [3, 4]
+        existing.refresh_from_db()
+        assert existing.name == "Laptop"
+        assert existing.stock == 5
+        assert existing.category.name == "Electronics"
+        ebook = Product.objects.get(sku="SKU-2")
+        assert ebook.seller == seller
+        assert ebook.digital is True
+        assert ebook.stock == 0
+
+    def test_import_cannot_overwrite_other_sellers_sku(self, seller_user_and_profile, another_seller_user_and_profile):
+        _, seller = seller_user_and_profile
+        _, other = another_seller_user_and_profile
+        Product.objects.create(seller=other, name="Theirs", price=1, sku="TAKEN")
+
+        rows = [{"sku": "TAKEN", "name": "Mine now", "price": "2.00"}, "garbage"]
+        result = import_catalog(seller.pk, rows)
+
+        assert result["created"] == result["updated"] == 0
+        assert result["error_count"] == 2
+        product = Product.objects.get(sku="TAKEN")
+        assert product.seller == other
+        assert product.name == "Theirs"
+
+    def test_import_rolls_back_sku_created_by_another_seller_mid_batch(
+        self, seller_user_and_profile, another_seller_user_and_profile, monkeypatch
+    ):
+        _, seller = seller_user_and_profile
+        _, other = another_seller_user_and_profile
+        bulk_create = Product.objects.bulk_create
+        raced = []
+
+        def racing_bulk_create(objs, **kwargs):
+            # The other seller creates RACE after the ownership query ran.
+            if not raced:
+                raced.append(Product.objects.create(seller=other, name="Theirs", price=1, sku="RACE"))
+            return bulk_create(objs, **kwargs)
+
+        monkeypatch.setattr(Product.objects, "bulk_create", racing_bulk_create)
+        rows = [
+            {"sku": "RACE", "name": "Mine now", "price": "2.00"},
+            {"sku": "FREE", "name": "Mine", "price": "3.00"},
+        ]
+        result = import_catalog(seller.pk, rows)
+
+        assert result["created"] == 1
+        assert result["errors"] == [{"line": 1, "errors": {"sku": ["This SKU belongs to another seller."]}}]
+        assert Product.objects.get(sku="FREE").seller == seller
+        assert not Product.objects.filter(sku="RACE", seller=seller).exists()
+        assert not Product.objects.filter(sku="RACE", name="Mine now").exists()
+
+    def test_import_endpoint_queues_task(self, seller_client, seller_user_and_profile, monkeypatch):
+        _, seller = seller_user_and_profile
+        queued = []
+
+        def fake_delay(*args):
+            queued.append(args)
+            return import_catalog_task.apply(args=args)
+
+        monkeypatch.setattr(import_catalog_task, "delay", fake_delay)
+        lines = "\n".join(
+            json.dumps({"sku": f"J-{i}", "name": f"Item {i}", "price": "1.00"}) for i in range(3)
+        )
+        upload = SimpleUploadedFile("catalog.jsonl", lines.encode())
+        response = seller_client.post(reverse("seller-catalog-import"), {"file": upload}, format="multipart")
+
+        assert response.status_code == 202
+        assert "task_id" in response.data
+        assert queued[0][0] == seller.pk
+        assert queued[0][2] == "jsonl"
+        assert Product.objects.filter(seller=seller, sku__startswith="J-").count() == 3
+
+    def test_import_rejects_unknown_format(self, seller_client):
+        upload = SimpleUploadedFile("catalog.xlsx", b"data")
+        response = seller_client.post(reverse("seller-catalog-import"), {"file": upload}, format="multipart")
+        assert response.status_code == 400
+
+    def test_export_streams_only_own_products(self, seller_client, seller_user_and_profile, another_seller_user_and_profile, product_factory):
+        _, seller = seller_user_and_profile
+        _, other = another_seller_user_and_profile
+        product_factory(seller=seller, name="Mine")
+        product_factory(seller=other, name="Theirs")
+
+        response = seller_client.get(reverse("seller-catalog-export"))
+        assert response.status_code == 200
+        assert response.streaming
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert lines[0] == "sku,name,description,price,stock,brand,digital,category"
+        assert len(lines) == 2
+        assert "Mine" in lines[1]
+
+        response = seller_client.get(reverse("seller-catalog-export"), {"file_format": "jsonl"})
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        assert [row["name"] for row in rows] == ["Mine"]
+
+
+@pytest.mark.django_db
+class TestSellerSalesAnalytics:
+    @pytest.fixture(autouse=True)
+    def rollups_inline(self, monkeypatch, django_capture_on_commit_callbacks):
+        task = seller_signals.record_order_sales_task
+        monkeypatch.setattr(task, "delay", task)
+        self.on_commit = django_capture_on_commit_callbacks
+
+    def _complete_order(self, seller, lines):
+        order = Order.objects.create(seller=seller)
+        for product, quantity in lines:
+            OrderItem.objects.create(order=order, product=product, quantity=quantity)
+        with self.on_commit(execute=True):
+            order.mark_complete(transaction_id=f"tx-{order.pk}")
+        return order
+
+    def test_completion_updates_rollups_once(self, seller_user_and_profile, product_factory):
+        _, seller = seller_user_and_profile
+        phone = product_factory(seller=seller, name="Phone", price=100)
+        case = product_factory(seller=seller, name="Case", price=5)
+
+        order = self._complete_order(seller, [(phone, 1), (case, 2)])
+        self._complete_order(seller, [(phone, 2)])
+        order.mark_complete()  # re-completing must not double count
+
+        daily = SellerDailySales.objects.get(seller=seller, date=timezone.localdate())
+        assert (daily.orders, daily.units, daily.revenue) == (2, 5, Decimal("310.00"))
+        hourly = SellerHourlySales.objects.get(seller=seller)
+        assert (hourly.orders, hourly.revenue) == (2, Decimal("310.00"))
+        per_product = {row.product_id: row for row in ProductDailySales.objects.filter(seller=seller)}
+        assert (per_product[phone.pk].orders, per_product[phone.pk].units) == (2, 3)
+        assert per_product[case.pk].revenue == Decimal("10.00")
+
+    def test_redelivered_task_does_not_double_count(self, seller_user_and_profile, product_factory):
+        _, seller = seller_user_and_profile
+        phone = product_factory(seller=seller, name="Phone", price=100)
+        order = self._complete_order(seller, [(phone, 1)])
+
+        seller_signals.record_order_sales_task(order.pk)  # a retry or broker redelivery
+
+        daily = SellerDailySales.objects.get(seller=seller)
+        assert (daily.orders, daily.units, daily.revenue) == (1, 1, Decimal("100.00"))
+
+    def test_rebuild_matches_incremental_rollups(self, seller_user_and_profile, product_factory):
+        _, seller = seller_user_and_profile
+        phone = product_factory(seller=seller, name="Phone", price=100)
+        self._complete_order(seller, [(phone, 1)])
+        self._complete_order(seller, [(phone, 3)])
+        before = list(SellerDailySales.objects.values("date", "orders", "units", "revenue"))
+
+        SellerDailySales.objects.update(orders=0)
+        assert rebuild_sales_rollups(seller_id=seller.pk) == 2
+
+        assert list(SellerDailySales.objects.values("date", "orders", "units", "revenue")) == before
+        assert ProductDailySales.objects.get(product=phone).units == 4
+        assert CountedOrder.objects.filter(order__seller=seller).count() == 2
+
+    def test_sales_endpoint_reads_only_own_rollups(
+        self, seller_client, seller_user_and_profile, another_seller_user_and_profile,
+        product_factory, django_assert_max_num_queries,
+    ):
+        _, seller = seller_user_and_profile
+        _, other = another_seller_user_and_profile
+        self._complete_order(seller, [(product_factory(seller=seller, name="Mine", price=20), 2)])
+        self._complete_order(other, [(product_factory(seller=other, name="Theirs", price=999), 1)])
+
+        with django_assert_max_num_queries(5):
+            response = seller_client.get(reverse("seller-analytics-sales"))
+        assert response.status_code == 200
+        assert response.data["totals"]["orders"] == 1
+        assert response.data["totals"]["revenue"] == Decimal("40.00")
+        assert [row["period"] for row in response.data["series"]] == [timezone.localdate()]
+
+        for granularity in ("hour", "week", "month"):
+            response = seller_client.get(reverse("seller-analytics-sales"), {"granularity": granularity})
+            assert response.status_code == 200
+            assert sum(row["orders"] for row in response.data["series"]) == 1
+
+        response = seller_client.get(reverse("seller-analytics-products"))
+        assert [row["product_name"] for row in response.data["results"]] == ["Mine"]
+
+    def test_sales_endpoint_validates_range(self, seller_client):
+        response = seller_client.get(
+            reverse("seller-analytics-sales"), {"start": "2025-02-01", "end": "2025-01-01"}
+        )
+        assert response.status_code == 400
+        response = seller_client.get(
+            reverse("seller-analytics-sales"),
+            {"start": "2025-01-01", "end": "2025-03-01", "granularity": "hour"},
+        )
+        assert response.status_code == 400
+
+    def test_non_seller_cannot_read_analytics(self, api_client, create_user):
+        api_client.force_authenticate(user=create_user("buyer@example.com", "buyerpass"))
+        assert api_client.get(reverse("seller-analytics-sales")).status_code == 403
+
+
+@pytest.mark.django_db
+class TestSellerFulfilmentQueue:
+    def _paid_order(self, seller, product):
+        order = Order.objects.create(seller=seller)
+        OrderItem.objects.create(order=order, product=product, quantity=1)
+        order.mark_complete(transaction_id=f"tx-{order.pk}")
+        return order
+
+    def test_completion_enters_queue_as_paid(self, seller_user_and_profile, product_factory):
+        _, seller = seller_user_and_profile
+        order = self._paid_order(seller, product_factory(seller=seller))
+        assert order.fulfilment_status == Order.FulfilmentStatus.PAID
+        Order.objects.filter(pk=order.pk).update(fulfilment_status=Order.FulfilmentStatus.SHIPPED)
+        order.refresh_from_db()
+        order.mark_complete()  # completing again never resets fulfilment
+        assert order.fulfilment_status == Order.FulfilmentStatus.SHIPPED
+
+    def test_queue_lists_own_orders_oldest_first(
+        self, seller_client, seller_user_and_profile, another_seller_user_and_profile,
+        product_factory, django_assert_max_num_queries,
+    ):
+        _, seller = seller_user_and_profile
+        _, other = another_seller_user_and_profile
+        product = product_factory(seller=seller)
+        orders = [self._paid_order(seller, product) for _ in range(3)]
+        self._paid_order(other, product_factory(seller=other))
+        Order.objects.create(seller=seller)  # an open cart is never queued
+
+        with django_assert_max_num_queries(4):
+            response = seller_client.get(reverse("seller-orders-list"))
+
+        assert response.status_code == 200
+        assert [row["id"] for row in response.data["results"]] == [o.pk for o in orders]
+        assert response.data["results"][0]["items_count"] == 1
+        assert seller_client.get(reverse("seller-orders-list"), {"status": "SHIPPED"}).data["results"] == []
+        assert seller_client.get(reverse("seller-orders-list"), {"status": "LOST"}).status_code == 400
+
+    def test_bulk_transition_moves_only_eligible_orders(
+        self, seller_client, seller_user_and_profile, another_seller_user_and_profile, product_factory,
+    ):
+        _, seller = seller_user_and_profile
+        _, other = another_seller_user_and_profile
+        product = product_factory(seller=seller)
+        first, second = self._paid_order(seller, product), self._paid_order(seller, product)
+        theirs = self._paid_order(other, product_factory(seller=other))
+        Order.objects.filter(pk=second.pk).update(fulfilment_status=Order.FulfilmentStatus.DELIVERED)
+
+        response = seller_client.post(
+            reverse("seller-orders-status"),
+            {"ids": [first.pk, second.pk, theirs.pk], "status": "SHIPPED"},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert response.data == {"updated": [first.pk], "skipped": [second.pk, theirs.pk]}
+        statuses = dict(Order.objects.values_list("pk", "fulfilment_status"))
+        assert statuses[first.pk] == "SHIPPED"
+        assert statuses[second.pk] == "DELIVERED"
+        assert statuses[theirs.pk] == "PAID"
+
+        response = seller_client.post(
+            reverse("seller-orders-status"), {"ids": [first.pk], "status": "PAID"}, format="json"
+        )
+        assert response.status_code == 400
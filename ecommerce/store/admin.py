@@ -1,10 +1,18 @@
 # ecommerce/store/admin.py
 from django.contrib import admin
+from django.db.models import Q
 from django.utils.html import \
     format_html  # Import format_html for safer HTML rendering
+from ecommerce.pagination import EstimatedCountPaginator
 
-from .models import (Category, Customer, Order, OrderItem, Product,
-                     ShippingAddress)
+from .models import (Category, Customer, Order, OrderHistory, OrderItem,
+                     Product, ProductVariant, Review, ShippingAddress)
+
+
+class ProductVariantInline(admin.TabularInline):
+    model = ProductVariant
+    extra = 0
+    fields = ("sku", "name", "color", "size", "price_override", "stock")
 
 
 class ProductAdmin(admin.ModelAdmin):
@@ -36,19 +44,30 @@ class ProductAdmin(admin.ModelAdmin):
         "sku",
         "rating",
         "reviews_count",
-        "image_url",
-        "image_preview",  # 'image_url' is for upload, 'image_preview' is for display
+        "image_file",
+        "image_preview",  # 'image_file' is for upload, 'image_preview' is for display
+        "image_width",
+        "image_height",
     )
 
-    # Make 'image_preview' read-only as it's derived from 'image_url'
-    readonly_fields = ("image_preview",)
+    # Make 'image_preview' read-only as it's derived from 'image_file'.
+    # 'rating' and 'reviews_count' are maintained from Review rows; the image
+    # dimensions are recorded by the thumbnail task.
+    readonly_fields = ("image_preview", "rating", "reviews_count", "image_width", "image_height")
 
-    # Custom method to display image thumbnail in admin list and detail view
+    # Custom method to display image thumbnail in admin list and detail view.
+    # Uses the smallest generated rendition so the changelist never loads originals.
     def image_preview(self, obj):
-        if obj.image_url:  # Check if image_url exists
+        if obj.image_file:  # Check if an image was uploaded
+            renditions = sorted(obj.image_renditions or [], key=lambda r: r["width"])
+            url = (
+                obj.image_file.storage.url(renditions[0]["name"])
+                if renditions
+                else obj.image_file.url
+            )
             return format_html(
                 '<img src="{}" style="max-height: 100px; border-radius: 4px;" />',
-                obj.image_url.url,
+                url,
             )
         return format_html(
             '<span style="color: #888;">No Image</span>'
@@ -56,19 +75,129 @@ class ProductAdmin(admin.ModelAdmin):
 
     image_preview.short_description = "Image Preview"  # Column header in admin
 
+    inlines = [ProductVariantInline]
+
+    list_select_related = ("seller", "category")
+
     # Optional: Add filters for better navigation in admin
-    list_filter = ("category", "brand", "digital", "seller")
+    list_filter = ("category", "brand", "digital", "is_visible")
+
+    # Exact SKU or case-sensitive name prefix, both served by indexes; an
+    # icontains over name and description scanned the whole table.
+    search_fields = ("sku__exact", "name__startswith")
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ("name", "path", "depth")
+    readonly_fields = ("path", "depth")
+    prepopulated_fields = {"slug": ("name",)}
+    search_fields = ("^name", "^path")
+    ordering = ("path",)
+
+
+class ReviewAdmin(admin.ModelAdmin):
+    list_display = ("product", "user", "rating", "created_at")
+    list_filter = ("rating",)
+    list_select_related = ("product", "user")
+    raw_id_fields = ("product", "user")
+    search_fields = ("product__name", "user__email")
+
+
+class OrderHistoryAdmin(admin.ModelAdmin):
+    list_display = ("order", "customer", "date_ordered", "total", "items_count", "status")
+    list_filter = ("status",)
+    list_select_related = ("customer",)
+    raw_id_fields = ("order", "customer")
+
+
+def search_by_order_id(queryset, search_term, field="order_id"):
+    """
+    Filters on an exact order id, which is indexed; any other term matches
+    nothing. Without a term (the unsearched changelist) every row is listed.
+    """
+    term = search_term.strip()
+    if not term:
+        return queryset
+    if not term.isdigit():
+        return queryset.none()
+    return queryset.filter(**{field: int(term)})
+
+
+class CustomerAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "name", "email")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    search_fields = ("user__email__exact",)
+
+
+class OrderAdmin(admin.ModelAdmin):
+    """
+    Orders are the largest tables in the admin: rows are listed with their
+    related objects joined, foreign keys use raw id widgets instead of loading
+    every cart, customer and seller, and searches are exact index lookups.
+    """
+    list_display = (
+        "id",
+        "seller",
+        "customer",
+        "complete",
+        "fulfilment_status",
+        "transaction_id",
+        "date_ordered",
+    )
+    list_filter = ("complete", "fulfilment_status")
+    list_select_related = ("seller", "customer__user")
+    raw_id_fields = ("cart", "customer")
+    autocomplete_fields = ("seller",)
+    search_fields = ("transaction_id__exact",)
+    search_help_text = "Order id or transaction id"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        condition = Q(transaction_id=term)
+        if term.isdigit():
+            condition |= Q(pk=int(term))
+        return queryset.filter(condition), False
+
+
+class OrderItemAdmin(admin.ModelAdmin):
+    list_display = ("id", "order", "product", "quantity", "date_added")
+    list_select_related = ("order", "product")
+    raw_id_fields = ("order", "product")
+    search_fields = ("order__id__exact",)
+    search_help_text = "Order id"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        return search_by_order_id(queryset, search_term), False
+
 
-    # Optional: Add search fields
-    search_fields = ("name", "description", "brand", "sku")
+class ShippingAddressAdmin(admin.ModelAdmin):
+    list_display = ("address", "city", "state", "customer", "order", "date_added")
+    list_select_related = ("customer__user", "order")
+    raw_id_fields = ("customer", "order")
+    search_fields = ("order__id__exact",)
+    search_help_text = "Order id"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
-    # Optional: Date hierarchy for created_at/updated_at
-    date_hierarchy = "created_at"
+    def get_search_results(self, request, queryset, search_term):
+        return search_by_order_id(queryset, search_term), False
 
 
 admin.site.register(Product, ProductAdmin)
-admin.site.register(Customer)
-admin.site.register(Category)
-admin.site.register(Order)
-admin.site.register(OrderItem)
-admin.site.register(ShippingAddress)
+admin.site.register(Review, ReviewAdmin)
+admin.site.register(Customer, CustomerAdmin)
+admin.site.register(Category, CategoryAdmin)
+admin.site.register(Order, OrderAdmin)
+admin.site.register(OrderHistory, OrderHistoryAdmin)
+admin.site.register(OrderItem, OrderItemAdmin)
+admin.site.register(ShippingAddress, ShippingAddressAdmin)
@@ -5,13 +5,16 @@ from . import api_views
 
 # --- Router Configuration ---
 # This section configures the router for the store API.
-# It registers the ProductViewSet, OrderViewSet, and CartViewSet.
+# It registers the ProductViewSet, ProductVariantViewSet, CategoryViewSet, OrderViewSet, CartViewSet, and ReviewViewSet.
 router = DefaultRouter()
 router.register(r'products', api_views.ProductViewSet, basename='product')
+router.register(r'variants', api_views.ProductVariantViewSet, basename='variant')
+router.register(r'categories', api_views.CategoryViewSet, basename='category')
 # Re-register OrderViewSet to handle /orders/
 router.register(r'orders', api_views.OrderViewSet, basename='order')
 # Keep carts if other parts of frontend use it, otherwise remove.
 router.register(r'carts', api_views.CartViewSet, basename='cart')
+router.register(r'reviews', api_views.ReviewViewSet, basename='review')
 
 # --- URL Patterns ---
 # This list contains all the URL patterns for the store API.
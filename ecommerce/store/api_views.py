@@ -1,19 +1,31 @@
 # ecommerce/store/api_views.py
-import json
 import uuid
 from django.db import transaction
-from django.db.models import F, Sum, Case, When, Value, BooleanField
+from django.db.models import (BooleanField, Case, F, IntegerField, Min,
+                              Prefetch, Sum, Value, When)
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import (AllowAny, IsAuthenticated,
+                                        IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Cart, Customer, Order, OrderItem, Product
-from .serializers import (OrderSerializer, ProductSerializer,
+from ecommerce.authentication import StatelessReadAuthenticationMixin
+from ecommerce.pagination import OrderHistoryCursorPagination
+
+from .categories import get_category_tree, resolve_category_path
+from .customers import get_request_customer
+from .models import (Cart, Category, Order, OrderHistory, OrderItem, Product,
+                     ProductVariant, Review)
+from .serializers import (CategorySerializer, OrderHistorySerializer,
+                          OrderSerializer,
+                          ProductDetailSerializer, ProductListSerializer,
+                          ProductVariantLookupSerializer,
                           ReadOnlyOrderItemSerializer,
+                          ReviewSerializer,
                           WritableOrderItemSerializer,
                           CartSerializer)
 
@@ -23,12 +35,186 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     API endpoint that allows products to be viewed.
     Read-only as products are managed via Django Admin.
     """
-    queryset = Product.objects.select_related("category", "seller").filter(seller__is_active=True).order_by("name")
-    serializer_class = ProductSerializer
+    # is_visible mirrors the seller's active flag, so listing never joins sellers;
+    # the page's sellers are fetched in one extra query for display.
+    queryset = (
+        Product.objects.filter(is_visible=True)
+        .select_related("category")
+        .prefetch_related("seller")
+        .order_by("name")
+    )
+    serializer_class = ProductListSerializer
+    permission_classes = [AllowAny]
+    # Public catalog reads never look at the caller, so skip authentication.
+    authentication_classes = []
+
+    def get_serializer_class(self):
+        if self.action == "retrieve":
+            return ProductDetailSerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        """
+        Annotates each product with the cheapest variant price and the stock summed
+        across its variants in the same query (products without variants fall back
+        to their own price and stock).
+        Supports ?category=<id|slug>, which includes every product in that
+        category's subtree via a prefix match on the materialized path.
+        """
+        queryset = super().get_queryset().annotate(
+            min_price=Min(Coalesce("variants__price_override", "price")),
+            total_stock=Coalesce(
+                Sum("variants__stock"), "stock", output_field=IntegerField()
+            ),
+        )
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related("variants")
+        category = self.request.query_params.get("category")
+        if category:
+            path = resolve_category_path(category)
+            if path is None:
+                return queryset.none()
+            queryset = queryset.filter(category__path__startswith=path)
+        return queryset
+
+    @action(detail=False, methods=["get"], url_path="top_rated")
+    def top_rated(self, request):
+        """
+        Lists products by their precomputed average rating.
+        Served from the (rating, reviews_count) index; no reviews are aggregated here.
+        """
+        try:
+            min_reviews = max(int(request.query_params.get("min_reviews", 1)), 1)
+        except ValueError:
+            return Response(
+                {"min_reviews": "Must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = (
+            self.get_queryset()
+            .filter(reviews_count__gte=min_reviews)
+            .order_by("-rating", "-reviews_count", "id")
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+
+class ProductVariantViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    SKU lookup for POS and warehouse scanners: GET /variants/<sku>/.
+    A single query on the unique SKU index, joined to the product.
+    """
+    queryset = ProductVariant.objects.select_related("product").filter(
+        product__is_visible=True
+    )
+    serializer_class = ProductVariantLookupSerializer
     permission_classes = [AllowAny]
+    authentication_classes = []
+    lookup_field = "sku"
+    lookup_value_regex = "[^/]+"
+
+
+class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for product categories.
+    `tree/` returns the whole navigation tree from cache, with an ETag derived
+    from the cache version so clients can revalidate cheaply.
+    """
+    queryset = Category.objects.all()
+    serializer_class = CategorySerializer
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    pagination_class = None
+
+    @action(detail=False, methods=["get"], url_path="tree")
+    def tree(self, request):
+        """Returns the nested category tree without touching the database on a cache hit."""
+        version, payload = get_category_tree()
+        etag = f'"category-tree-{version}"'
+        if request.headers.get("If-None-Match") == etag:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({"version": version, "results": payload["tree"]})
+        response["ETag"] = etag
+        response["Cache-Control"] = "public, max-age=60"
+        return response
+
+
+class ReviewViewSet(StatelessReadAuthenticationMixin, viewsets.ModelViewSet):
+    """
+    API endpoint for product reviews.
+    Anyone can read; authenticated users create reviews and manage their own.
+    Each write adjusts the product's rating aggregates incrementally.
+    """
+    serializer_class = ReviewSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get_queryset(self):
+        """Filters by ?product=<id>; writes are limited to the user's own reviews."""
+        queryset = Review.objects.all()
+        product_id = self.request.query_params.get("product")
+        if product_id:
+            if not product_id.isdigit():
+                raise ValidationError({"product": "Must be an integer."})
+            queryset = queryset.filter(product_id=product_id)
+        if self.request.method not in ("GET", "HEAD", "OPTIONS"):
+            queryset = queryset.filter(user_id=self.request.user.pk)
+        return queryset
+
+
+def _cart_with_orders(queryset):
+    """
+    Prefetches everything CartSerializer renders (orders, their items and the
+    items' products and sellers), so a cart costs the same three queries
+    however many lines it has.
+    """
+    return queryset.prefetch_related(
+        Prefetch("orders__orderitem_set", queryset=OrderItem.objects.select_related("product__seller"))
+    )
+
+
+def _apply_cart_quantities(cart, quantities):
+    """
+    Sets each product's quantity, from a {product: quantity} dict, in the cart's
+    open order for the product's seller; 0 removes the line. Orders are created
+    per seller as needed, and line items are deleted, updated and inserted with
+    one statement each, whatever the number of products.
+    """
+    orders = {order.seller_id: order for order in Order.objects.filter(cart=cart, complete=False)}
+    for seller_id in {p.seller_id for p, quantity in quantities.items() if quantity > 0} - orders.keys():
+        orders[seller_id], _ = Order.objects.get_or_create(cart=cart, seller_id=seller_id, complete=False)
+
+    existing = {
+        item.product_id: item
+        for item in OrderItem.objects.filter(order__in=list(orders.values()), product__in=list(quantities))
+    }
+    to_delete, to_update, to_create = [], [], []
+    for product, quantity in quantities.items():
+        item = existing.get(product.pk)
+        if quantity <= 0:
+            if item is not None:
+                to_delete.append(item.pk)
+        elif item is None:
+            to_create.append(OrderItem(order=orders[product.seller_id], product=product, quantity=quantity))
+        elif item.quantity != quantity:
+            item.quantity = quantity
+            to_update.append(item)
+
+    if to_delete:
+        OrderItem.objects.filter(pk__in=to_delete).delete()
+    if to_update:
+        OrderItem.objects.bulk_update(to_update, ["quantity"])
+    if to_create:
+        OrderItem.objects.bulk_create(to_create)
 
 
 class OrderViewSet(
+    StatelessReadAuthenticationMixin,
     mixins.CreateModelMixin, # Needed for POST /orders/ (add to cart)
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
@@ -60,7 +246,7 @@ class OrderViewSet(
         ).prefetch_related('orderitem_set__product')
 
         if user.is_authenticated:
-            customer, _ = Customer.objects.get_or_create(user=user)
+            customer = get_request_customer(self.request)
             if self.action == 'list':
                 return queryset.filter(customer=customer, complete=True)
             return queryset.filter(customer=customer)
@@ -69,12 +255,27 @@ class OrderViewSet(
             
         return queryset.none()
 
+    def list(self, request, *args, **kwargs):
+        """
+        Authenticated users get their order history from the OrderHistory read
+        model, newest first with cursor pagination. Guests still list their
+        session cart.
+        """
+        if not request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+
+        queryset = OrderHistory.objects.filter(customer__user_id=request.user.pk)
+        paginator = OrderHistoryCursorPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = OrderHistorySerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
     def _get_or_create_cart(self, user, session_key):
         """
         Helper method to get or create a Cart instance.
         """
         if user.is_authenticated:
-            customer, _ = Customer.objects.get_or_create(user=user)
+            customer = get_request_customer(self.request)
             cart, created = Cart.objects.get_or_create(customer=customer)
         elif session_key:
             cart, created = Cart.objects.get_or_create(session_key=session_key)
@@ -108,47 +309,41 @@ class OrderViewSet(
             # If "items" key is not present, assume it's a single item directly in request.data
             items_payload = [request.data]
 
-        with transaction.atomic():
-            for item_data in items_payload:
-                serializer = WritableOrderItemSerializer(data=item_data)
-                if not serializer.is_valid(raise_exception=False): # Don't raise immediately, collect errors
-                    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-                product_id = serializer.validated_data.get("product_id")
-                quantity = serializer.validated_data.get("quantity")
-
-                if product_id is None or quantity is None:
-                    return Response(
-                        {"detail": "Both 'product_id' and 'quantity' are required for each item."},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
+        # Every product is resolved with one query, so validation does not query per item.
+        product_ids = {
+            str(item.get("product_id")) for item in items_payload if isinstance(item, dict)
+        }
+        products = {
+            str(product.pk): product
+            for product in Product.objects.filter(
+                pk__in=[pk for pk in product_ids if pk.isdigit()]
+            )
+        }
 
-                product = get_object_or_404(Product, id=product_id)
-                seller = product.seller
+        quantities = {}
+        for item_data in items_payload:
+            serializer = WritableOrderItemSerializer(data=item_data, context={"products": products})
+            if not serializer.is_valid(raise_exception=False): # Don't raise immediately, collect errors
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-                order, _ = Order.objects.get_or_create(
-                    cart=cart, seller=seller, complete=False
-                )
+            product_id = serializer.validated_data.get("product_id")
+            quantity = serializer.validated_data.get("quantity")
 
-                order_item, item_created = OrderItem.objects.get_or_create(
-                    order=order, product=product
+            if product_id is None or quantity is None:
+                return Response(
+                    {"detail": "Both 'product_id' and 'quantity' are required for each item."},
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
+            # A product listed twice keeps its last quantity.
+            quantities[products[product_id]] = quantity
 
-                if quantity > 0:
-                    order_item.quantity = quantity
-                    order_item.save()
-                else:
-                    order_item.delete()
+        with transaction.atomic():
+            _apply_cart_quantities(cart, quantities)
 
-        cart.refresh_from_db() # Refresh to get latest related objects
+        cart = _cart_with_orders(Cart.objects.all()).get(pk=cart.pk)
         cart_serializer = CartSerializer(cart)
         response_data = cart_serializer.data
 
-        # --- DEBUGGING PRINT STATEMENT ---
-        import json
-        print(f"DEBUG: CartSerializer output for response:\n{json.dumps(response_data, indent=2)}")
-        # ---------------------------------
-
         response_data["message"] = "Cart updated successfully."
 
         if not user.is_authenticated and cart_created and cart.session_key:
@@ -166,10 +361,10 @@ class OrderViewSet(
 
         cart = None
         if user.is_authenticated:
-            customer, _ = Customer.objects.get_or_create(user=user)
-            cart = Cart.objects.filter(customer=customer).first()
+            customer = get_request_customer(self.request)
+            cart = _cart_with_orders(Cart.objects.filter(customer=customer)).first()
         elif session_key:
-            cart = Cart.objects.filter(session_key=session_key).first()
+            cart = _cart_with_orders(Cart.objects.filter(session_key=session_key)).first()
 
         if not cart:
             return Response(
@@ -209,9 +404,9 @@ class OrderViewSet(
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        customer, _ = Customer.objects.get_or_create(user=request.user)
+        customer = get_request_customer(request)
         
-        if cart.customer != customer:
+        if cart.customer_id != customer.pk:
             return Response(
                 {"detail": "You do not have permission to complete this cart."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -227,7 +422,8 @@ class OrderViewSet(
         with transaction.atomic():
             for order in incomplete_orders:
                 products_to_update = []
-                for item in order.orderitem_set.select_related('product').all():
+                items = list(order.orderitem_set.select_related('product'))
+                for item in items:
                     if item.product.stock < item.quantity:
                         transaction.set_rollback(True)
                         return Response(
@@ -242,17 +438,14 @@ class OrderViewSet(
                 if products_to_update:
                     Product.objects.bulk_update(products_to_update, ['stock'])
 
-                order.complete = True
-                order.date_ordered = timezone.now()
-                order.transaction_id = str(uuid.uuid4())
-                order.save()
+                order.mark_complete(transaction_id=uuid.uuid4(), items=items)
 
-        cart.refresh_from_db()
+        cart = _cart_with_orders(Cart.objects.all()).get(pk=cart.pk)
         serializer = CartSerializer(cart)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class CartViewSet(viewsets.ModelViewSet):
+class CartViewSet(StatelessReadAuthenticationMixin, viewsets.ModelViewSet):
     """API endpoint for managing carts."""
     serializer_class = CartSerializer
     permission_classes = [AllowAny]
@@ -263,7 +456,7 @@ class CartViewSet(viewsets.ModelViewSet):
         session_key = self.request.headers.get("X-Session-Key")
 
         if user.is_authenticated:
-            customer, _ = Customer.objects.get_or_create(user=user)
+            customer = get_request_customer(self.request)
             return Cart.objects.filter(customer=customer)
         elif session_key:
             return Cart.objects.filter(session_key=session_key)
@@ -279,10 +472,10 @@ class CartViewSet(viewsets.ModelViewSet):
 
         cart = None
         if user.is_authenticated:
-            customer, _ = Customer.objects.get_or_create(user=user)
-            cart = Cart.objects.filter(customer=customer).first()
+            customer = get_request_customer(self.request)
+            cart = _cart_with_orders(Cart.objects.filter(customer=customer)).first()
         elif session_key:
-            cart = Cart.objects.filter(session_key=session_key).first()
+            cart = _cart_with_orders(Cart.objects.filter(session_key=session_key)).first()
 
         if not cart:
             return Response(
@@ -328,18 +521,16 @@ class CartViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        customer, _ = Customer.objects.get_or_create(user=request.user)
+        customer = get_request_customer(request)
         cart.customer = customer
         cart.save()
 
         with transaction.atomic():
             for order in cart.orders.filter(complete=False):
-                order.complete = True
-                order.date_ordered = timezone.now()
-                order.transaction_id = str(uuid.uuid4())
-                order.save()
+                items = list(order.orderitem_set.select_related('product'))
+                order.mark_complete(transaction_id=uuid.uuid4(), items=items)
 
-                for item in order.orderitem_set.all():
+                for item in items:
                     item.product.stock -= item.quantity
                     item.product.save()
 
@@ -0,0 +1,53 @@
+# ecommerce/store/cache.py
+"""
+Versioned cache namespaces.
+
+Cached payloads embed the current namespace version in their key. Invalidating a
+namespace is a single counter bump; stale entries are never read again and simply
+expire, so there is no need to track or delete individual keys.
+"""
+import time
+
+from django.core.cache import cache
+
+CATEGORY_TREE_NAMESPACE = "category_tree"
+# Bumped whenever product data shown in the catalog changes.
+CATALOG_NAMESPACE = "catalog"
+
+
+def _version_key(namespace):
+    return f"cache_version:{namespace}"
+
+
+def _initial_version():
+    # Seeded from the clock so a counter lost to eviction never restarts at a
+    # version whose payloads may still be cached.
+    return int(time.time() * 1000)
+
+
+def get_cache_version(namespace):
+    """Returns the current version number for a namespace, initialising it if unset."""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key) or _initial_version()
+    return version
+
+
+def bump_cache_version(namespace):
+    """Invalidates everything cached under a namespace."""
+    key = _version_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The counter was evicted or never set.
+        version = _initial_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def versioned_key(namespace, *parts):
+    """Builds a cache key bound to the namespace's current version."""
+    suffix = ":".join(str(part) for part in parts)
+    return f"{namespace}:v{get_cache_version(namespace)}:{suffix}"
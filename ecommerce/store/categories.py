@@ -0,0 +1,65 @@
+# ecommerce/store/categories.py
+"""
+Cached category tree.
+
+The navigation menu is requested on every page load, so the whole tree is built
+with one query and cached under a versioned key. Any category save/delete bumps
+the version (see store.signals), which makes the next request rebuild it.
+"""
+from django.core.cache import cache
+
+from .cache import CATEGORY_TREE_NAMESPACE, get_cache_version
+from .models import Category
+
+CATEGORY_TREE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def build_category_tree():
+    """
+    Returns the nested tree plus a flat id/slug -> path index.
+    Ordering by path guarantees every parent is seen before its children.
+    """
+    nodes = {}
+    roots = []
+    paths = {}
+    rows = Category.objects.order_by("path").values(
+        "id", "name", "slug", "path", "depth", "parent_id"
+    )
+    for row in rows:
+        node = {
+            "id": row["id"],
+            "name": row["name"],
+            "slug": row["slug"],
+            "path": row["path"],
+            "depth": row["depth"],
+            "children": [],
+        }
+        nodes[row["id"]] = node
+        parent = nodes.get(row["parent_id"])
+        if parent is not None:
+            parent["children"].append(node)
+        else:
+            roots.append(node)
+        paths[str(row["id"])] = row["path"]
+        paths[row["slug"]] = row["path"]
+    return {"tree": roots, "paths": paths}
+
+
+def get_category_tree():
+    """Returns (version, payload) for the current tree, building it on a cache miss."""
+    version = get_cache_version(CATEGORY_TREE_NAMESPACE)
+    key = f"{CATEGORY_TREE_NAMESPACE}:v{version}"
+    payload = cache.get(key)
+    if payload is None:
+        payload = build_category_tree()
+        cache.set(key, payload, timeout=CATEGORY_TREE_CACHE_TIMEOUT)
+    return version, payload
+
+
+def resolve_category_path(value):
+    """
+    Maps a category id or slug to its materialized path using the cached tree,
+    so filtering a product listing by category costs no extra query.
+    """
+    _, payload = get_category_tree()
+    return payload["paths"].get(str(value))
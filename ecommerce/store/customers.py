@@ -0,0 +1,61 @@
+# ecommerce/store/customers.py
+"""
+Customer resolution for authenticated requests.
+
+Registration creates the Customer alongside the user (see
+users.serializers.CustomRegisterSerializer), so the request path only reads.
+The lookup is memoized on the request and cached across requests by user id,
+so cart and order endpoints resolve the customer at most once per request and
+usually without touching the database.
+"""
+from django.core.cache import cache
+
+from .models import Customer
+
+CUSTOMER_CACHE_TIMEOUT = 60 * 60
+_REQUEST_ATTR = "_store_customer"
+
+
+def _cache_key(user_id):
+    return f"customer:user:{user_id}"
+
+
+def get_customer_for_user(user):
+    """
+    Returns the Customer for a registered user from cache, falling back to the
+    database. Users created before customers were made at signup get one here.
+    """
+    key = _cache_key(user.pk)
+    customer = cache.get(key)
+    if customer is None:
+        customer = Customer.objects.filter(user_id=user.pk).first()
+        if customer is None:
+            customer, _ = Customer.objects.get_or_create(
+                user_id=user.pk, defaults={"email": user.email}
+            )
+        cache.set(key, customer, timeout=CUSTOMER_CACHE_TIMEOUT)
+    return customer
+
+
+def get_request_customer(request):
+    """
+    Returns the Customer for the request's authenticated user (None for guests),
+    resolved once per request. Works with both DRF and plain Django requests.
+    """
+    # DRF wraps the HttpRequest; memoize on the underlying one so both share it.
+    http_request = getattr(request, "_request", request)
+    user = request.user
+    if not user.is_authenticated:
+        return None
+    # Keyed by user id so a lookup made before authentication never sticks.
+    cached = getattr(http_request, _REQUEST_ATTR, None)
+    if cached is None or cached[0] != user.pk:
+        cached = (user.pk, get_customer_for_user(user))
+        setattr(http_request, _REQUEST_ATTR, cached)
+    return cached[1]
+
+
+def invalidate_customer_cache(user_id):
+    """Drops the cached Customer for a user; called when the customer changes."""
+    if user_id is not None:
+        cache.delete(_cache_key(user_id))
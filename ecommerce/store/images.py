@@ -0,0 +1,133 @@
+# ecommerce/store/images.py
+"""
+Responsive product image renditions.
+
+After an upload, a Celery task (store.tasks.generate_product_thumbnails_task)
+resizes the original to a few fixed widths in modern formats and stores the
+copies next to it through the field's storage, so they land in MEDIA_ROOT
+locally and in S3 in production. Listings then serve a `srcset` instead of the
+full-resolution original.
+"""
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from django.db.models import Q
+from PIL import Image, ImageOps, features
+
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_WIDTHS = (160, 320, 640, 1024)
+THUMBNAIL_QUALITY = 80
+RENDITIONS_DIR = "product_images/renditions"
+
+# format name -> (Pillow codec feature, Pillow format). AVIF is only produced
+# when the installed Pillow was built with it.
+_FORMATS = {
+    "avif": ("avif", "AVIF"),
+    "webp": ("webp", "WEBP"),
+}
+
+
+def available_formats():
+    """Returns the rendition formats the installed Pillow can encode, best first."""
+    return [name for name, (feature, _) in _FORMATS.items() if features.check(feature)]
+
+
+def _rendition_name(original_name, width, file_format):
+    stem = os.path.splitext(os.path.basename(original_name))[0]
+    return f"{RENDITIONS_DIR}/{stem}-{width}w.{file_format}"
+
+
+def _encode(image, file_format):
+    buffer = io.BytesIO()
+    image.save(buffer, format=_FORMATS[file_format][1], quality=THUMBNAIL_QUALITY)
+    return buffer.getvalue()
+
+
+def delete_renditions(storage, renditions):
+    """Removes previously generated files; missing files are ignored."""
+    for rendition in renditions:
+        try:
+            storage.delete(rendition["name"])
+        except Exception:
+            logger.warning(f"Could not delete image rendition {rendition['name']}.", exc_info=True)
+
+
+def generate_product_thumbnails(product_id):
+    """
+    Builds the renditions for a product's current image and records them with
+    the original's dimensions. Returns the number of files written.
+    The final update is conditional on the image being unchanged, so a task that
+    raced a newer upload discards its work instead of overwriting fresher data.
+    """
+    product = Product.objects.filter(pk=product_id).only(
+        "image_file", "image_renditions"
+    ).first()
+    if product is None:
+        return 0
+
+    storage = product.image_file.storage
+    previous = product.image_renditions or []
+    original_name = product.image_file.name
+
+    width = height = None
+    renditions = []
+    if original_name:
+        with product.image_file.open("rb") as original:
+            with Image.open(original) as source:
+                image = ImageOps.exif_transpose(source)
+                width, height = image.size
+                if image.mode not in ("RGB", "RGBA"):
+                    image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+                # Never upscale; images narrower than every target get one copy.
+                targets = [w for w in THUMBNAIL_WIDTHS if w < width] or [width]
+                for target in targets:
+                    resized = image.resize(
+                        (target, max(1, round(height * target / width))),
+                        Image.Resampling.LANCZOS,
+                    )
+                    for file_format in available_formats():
+                        name = storage.save(
+                            _rendition_name(original_name, target, file_format),
+                            ContentFile(_encode(resized, file_format)),
+                        )
+                        renditions.append(
+                            {
+                                "format": file_format,
+                                "width": resized.width,
+                                "height": resized.height,
+                                "name": name,
+                            }
+                        )
+
+    unchanged = Q(image_file=original_name) if original_name else (
+        Q(image_file="") | Q(image_file__isnull=True)
+    )
+    updated = Product.objects.filter(unchanged, pk=product_id).update(
+        image_width=width, image_height=height, image_renditions=renditions
+    )
+    if not updated:
+        delete_renditions(storage, renditions)
+        return 0
+    # Storages that overwrite (e.g. S3) may have reused a previous name.
+    written = {rendition["name"] for rendition in renditions}
+    delete_renditions(storage, [r for r in previous if r["name"] not in written])
+    return len(renditions)
+
+
+def build_srcsets(renditions, url_for):
+    """
+    Groups renditions into one `srcset` string per format, e.g.
+    {"webp": "https://.../a-160w.webp 160w, https://.../a-320w.webp 320w"}.
+    `url_for` maps a storage name to a public URL.
+    """
+    srcsets = {}
+    for rendition in sorted(renditions, key=lambda r: r["width"]):
+        entry = f"{url_for(rendition['name'])} {rendition['width']}w"
+        srcsets.setdefault(rendition["format"], []).append(entry)
+    return {file_format: ", ".join(entries) for file_format, entries in srcsets.items()}
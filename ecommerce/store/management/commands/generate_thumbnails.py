@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from store.models import Product
+from store.tasks import generate_product_thumbnails_task
+
+
+class Command(BaseCommand):
+    help = "Queue responsive image renditions for products that have an image but none yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate renditions for every product with an image.",
+        )
+
+    def handle(self, *args, **options):
+        products = Product.objects.exclude(image_file="").exclude(image_file__isnull=True)
+        if not options["all"]:
+            products = products.filter(image_renditions=[])
+        count = 0
+        for product_id in products.values_list("pk", flat=True).iterator():
+            generate_product_thumbnails_task.delay(product_id)
+            count += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"Queued thumbnail generation for {count} product(s).")
+        )
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def populate_category_slugs_and_paths(apps, schema_editor):
+    """Existing categories become roots: slug from name, path "<slug>/"."""
+    Category = apps.get_model('store', 'Category')
+
+    used_slugs = set()
+    categories = []
+    for category in Category.objects.order_by('pk').iterator():
+        slug = slugify(category.name) or f"category-{category.pk}"
+        if slug in used_slugs:
+            slug = f"{slug}-{category.pk}"
+        used_slugs.add(slug)
+        category.slug = slug
+        category.path = f"{slug}/"
+        category.depth = 0
+        categories.append(category)
+
+    if categories:
+        Category.objects.bulk_update(categories, ['slug', 'path', 'depth'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0007_product_rating_sum_review'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='children', to='store.category'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        # Added without the unique constraint first so existing rows can be backfilled.
+        migrations.AddField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(blank=True, default='', max_length=120),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_category_slugs_and_paths, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=120, unique=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0008_category_tree'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sku', models.CharField(help_text='Stock Keeping Unit, unique identifier for this variant.', max_length=50, unique=True, verbose_name='SKU')),
+                ('name', models.CharField(blank=True, help_text="e.g. 'Black / 128GB'", max_length=200, verbose_name='name')),
+                ('color', models.CharField(blank=True, max_length=50, verbose_name='color')),
+                ('size', models.CharField(blank=True, max_length=50, verbose_name='size')),
+                ('price_override', models.DecimalField(blank=True, decimal_places=2, help_text='Leave empty to use the product price.', max_digits=10, null=True, verbose_name='price override')),
+                ('stock', models.PositiveIntegerField(default=0, verbose_name='stock')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='store.product')),
+            ],
+            options={
+                'verbose_name': 'Product Variant',
+                'verbose_name_plural': 'Product Variants',
+                'ordering': ['product', 'sku'],
+            },
+        ),
+    ]
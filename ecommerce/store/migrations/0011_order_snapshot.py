@@ -0,0 +1,61 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:40
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def backfill_order_snapshots(apps, schema_editor):
+    """
+    Completed orders get a snapshot from their current rows. Prices at the time
+    of purchase are not recorded anywhere, so current prices are the best available.
+    """
+    Order = apps.get_model('store', 'Order')
+    OrderItem = apps.get_model('store', 'OrderItem')
+
+    orders = Order.objects.filter(complete=True, snapshot__isnull=True).select_related('customer')
+    for order in orders.iterator(chunk_size=500):
+        lines = []
+        total = Decimal("0.00")
+        for item in OrderItem.objects.filter(order=order).select_related('product'):
+            if item.product is None or not item.quantity:
+                continue
+            line_total = item.product.price * item.quantity
+            total += line_total
+            lines.append({
+                "product_id": item.product_id,
+                "product_name": item.product.name,
+                "sku": item.product.sku,
+                "digital": bool(item.product.digital),
+                "unit_price": str(item.product.price),
+                "quantity": item.quantity,
+                "total": str(line_total),
+            })
+        order.snapshot = {
+            "id": order.pk,
+            "seller_id": order.seller_id,
+            "customer_name": order.customer.name if order.customer and order.customer.name else "Guest",
+            "transaction_id": order.transaction_id,
+            "completed_at": order.date_ordered.isoformat() if order.date_ordered else None,
+            "items": lines,
+            "items_count": sum(line["quantity"] for line in lines),
+            "total": str(total),
+            "requires_shipping": any(not line["digital"] for line in lines),
+        }
+        order.save(update_fields=['snapshot'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0010_product_image_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='snapshot',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='snapshot'),
+        ),
+        migrations.RunPython(backfill_order_snapshots, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:42
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_order_history(apps, schema_editor):
+    """Creates history rows for orders completed before the table existed."""
+    Order = apps.get_model('store', 'Order')
+    OrderHistory = apps.get_model('store', 'OrderHistory')
+
+    rows = []
+    orders = Order.objects.filter(complete=True, snapshot__isnull=False)
+    for order in orders.iterator(chunk_size=1000):
+        rows.append(OrderHistory(
+            order_id=order.pk,
+            customer_id=order.customer_id,
+            date_ordered=order.date_ordered,
+            total=Decimal(order.snapshot["total"]),
+            items_count=order.snapshot["items_count"],
+            status="COMPLETED",
+            transaction_id=order.transaction_id,
+        ))
+        if len(rows) >= 1000:
+            OrderHistory.objects.bulk_create(rows, ignore_conflicts=True)
+            rows = []
+    if rows:
+        OrderHistory.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sellers', '0001_initial'),
+        ('store', '0011_order_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderHistory',
+            fields=[
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='history', serialize=False, to='store.order')),
+                ('date_ordered', models.DateTimeField(verbose_name='date ordered')),
+                ('total', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='total')),
+                ('items_count', models.PositiveIntegerField(default=0, verbose_name='items count')),
+                ('status', models.CharField(default='COMPLETED', max_length=20, verbose_name='status')),
+                ('transaction_id', models.CharField(blank=True, max_length=100, null=True, verbose_name='transaction id')),
+            ],
+            options={
+                'verbose_name': 'Order History',
+                'verbose_name_plural': 'Order History',
+                'ordering': ['-date_ordered'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer', 'complete', '-date_ordered'], name='store_order_custome_a85b7b_idx'),
+        ),
+        migrations.AddField(
+            model_name='orderhistory',
+            name='customer',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='order_history', to='store.customer'),
+        ),
+        migrations.AddIndex(
+            model_name='orderhistory',
+            index=models.Index(fields=['customer', '-date_ordered'], name='store_order_custome_d109e4_idx'),
+        ),
+        migrations.RunPython(backfill_order_history, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:05
+
+from django.db import migrations
+
+
+def create_missing_customers(apps, schema_editor):
+    """Gives every existing user a Customer, now that signup creates one."""
+    User = apps.get_model('users', 'User')
+    Customer = apps.get_model('store', 'Customer')
+
+    users = User.objects.filter(customer__isnull=True).only('pk', 'email')
+    rows = []
+    for user in users.iterator(chunk_size=1000):
+        rows.append(Customer(user_id=user.pk, email=user.email))
+        if len(rows) >= 1000:
+            Customer.objects.bulk_create(rows, ignore_conflicts=True)
+            rows = []
+    if rows:
+        Customer.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0012_order_history'),
+        ('users', '0003_alter_user_email'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_customers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:10
+
+from django.db import migrations, models
+
+
+def mark_completed_orders_paid(apps, schema_editor):
+    """Existing completed orders enter the fulfilment queue as paid."""
+    Order = apps.get_model('store', 'Order')
+    Order.objects.filter(complete=True, fulfilment_status__isnull=True).update(fulfilment_status='PAID')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sellers', '0002_sales_rollups'),
+        ('store', '0013_create_missing_customers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='fulfilment_status',
+            field=models.CharField(blank=True, choices=[('PAID', 'Paid'), ('PACKED', 'Packed'), ('SHIPPED', 'Shipped'), ('DELIVERED', 'Delivered')], max_length=10, null=True, verbose_name='fulfilment status'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['seller', 'fulfilment_status', 'date_ordered'], name='store_order_seller__3d20af_idx'),
+        ),
+        migrations.RunPython(mark_completed_orders_paid, migrations.RunPython.noop),
+    ]
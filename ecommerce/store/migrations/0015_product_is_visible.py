@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:18
+
+from django.db import migrations, models
+
+
+def copy_seller_visibility(apps, schema_editor):
+    """Makes the products of active sellers visible."""
+    Product = apps.get_model('store', 'Product')
+    Product.objects.filter(seller__is_active=True).update(is_visible=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sellers', '0002_sales_rollups'),
+        ('store', '0014_order_fulfilment_status'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='store_produ_rating_163051_idx',
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='is_visible',
+            field=models.BooleanField(default=False, editable=False, verbose_name='visible'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['name', 'id'], name='store_product_visible_name'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['-rating', '-reviews_count', 'id'], name='store_product_visible_rating'),
+        ),
+        migrations.RunPython(copy_seller_visibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sellers', '0002_sales_rollups'),
+        ('store', '0015_product_is_visible'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['transaction_id'], name='store_order_transac_47334b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['name'], name='store_product_name_prefix', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
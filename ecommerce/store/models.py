@@ -1,14 +1,40 @@
 # ecommerce/store/models.py
+from decimal import Decimal
+
 from django.conf import settings
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
+from django.utils import timezone
+from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from sellers.models import Seller
 
 
 class Category(models.Model):
-    """Represents a product category."""
+    """
+    Represents a product category in a tree.
+
+    Each category stores its materialized path (the slugs from the root down,
+    e.g. "electronics/phones/"), so a whole subtree is a single indexed prefix
+    match on `path` instead of a recursive walk over `parent`.
+    """
+    PATH_SEPARATOR = "/"
+
     name = models.CharField(max_length=100, unique=True)
+    slug = models.SlugField(max_length=120, unique=True, blank=True)
     description = models.TextField(blank=True, null=True)
+    parent = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name="children",
+    )
+    path = models.CharField(max_length=255, db_index=True, editable=False, default="")
+    depth = models.PositiveSmallIntegerField(editable=False, default=0)
 
     class Meta:
         verbose_name = _("Category")
@@ -18,6 +44,48 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
+    def _unique_slug(self):
+        base = slugify(self.name) or "category"
+        slug, suffix = base, 2
+        while Category.objects.filter(slug=slug).exclude(pk=self.pk).exists():
+            slug, suffix = f"{base}-{suffix}", suffix + 1
+        return slug
+
+    def _build_path(self):
+        parent_path = self.parent.path if self.parent_id else ""
+        return f"{parent_path}{self.slug}{self.PATH_SEPARATOR}"
+
+    def clean(self):
+        """Rejects moving a category underneath itself or one of its descendants."""
+        if self.parent_id and self.pk:
+            if self.parent_id == self.pk or (
+                self.path and self.parent.path.startswith(self.path)
+            ):
+                raise ValidationError(
+                    {"parent": _("A category cannot be nested under itself or its descendants.")}
+                )
+
+    def save(self, *args, **kwargs):
+        """Keeps `path` and `depth` in step and rewrites descendants when they move."""
+        if not self.slug:
+            self.slug = self._unique_slug()
+        self.clean()
+
+        old_path = self.path
+        old_depth = self.depth
+        self.path = self._build_path()
+        self.depth = self.path.count(self.PATH_SEPARATOR) - 1
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if old_path and old_path != self.path:
+                Category.objects.filter(path__startswith=old_path).exclude(
+                    pk=self.pk
+                ).update(
+                    path=Concat(Value(self.path), Substr("path", len(old_path) + 1)),
+                    depth=F("depth") + (self.depth - old_depth),
+                )
+
 
 class Customer(models.Model):
     """Represents a customer, who may or may not be a registered user."""
@@ -60,6 +128,16 @@ class Product(models.Model):
     image_file = models.ImageField(
         _("image file"), null=True, blank=True, upload_to="product_images/"
     )
+    # Filled in by the thumbnail task (see store.images) after each upload.
+    image_width = models.PositiveIntegerField(_("image width"), null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(_("image height"), null=True, blank=True, editable=False)
+    image_renditions = models.JSONField(
+        _("image renditions"),
+        default=list,
+        blank=True,
+        editable=False,
+        help_text=_("Resized copies of the image: [{'format', 'width', 'height', 'name'}]"),
+    )
     category = models.ForeignKey(
         Category,
         null=True,
@@ -92,6 +170,14 @@ class Product(models.Model):
         default=0,
         help_text=_("Total number of reviews for this product"),
     )
+    # Running total of all review ratings. Kept in step with reviews_count so the
+    # average can be adjusted incrementally instead of recomputed from Review rows.
+    rating_sum = models.PositiveIntegerField(
+        _("rating sum"),
+        default=0,
+        editable=False,
+        help_text=_("Sum of all review ratings for this product"),
+    )
 
     seller = models.ForeignKey(
         Seller,
@@ -99,6 +185,10 @@ class Product(models.Model):
         related_name='products',
         verbose_name=_("seller")
     )
+    # Copy of seller.is_active, so catalog queries filter and order on product
+    # indexes alone. Set on create and kept in step by store.signals when a
+    # seller is activated or deactivated.
+    is_visible = models.BooleanField(_("visible"), default=False, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -112,11 +202,48 @@ class Product(models.Model):
             models.Index(fields=["brand"]),
             models.Index(fields=["created_at"]),
             models.Index(fields=["seller"]),
+            # Serves the admin's name prefix search (LIKE 'abc%') on PostgreSQL.
+            models.Index(
+                fields=["name"], name="store_product_name_prefix", opclasses=["varchar_pattern_ops"]
+            ),
+            # Public catalog orderings cover visible products only.
+            models.Index(
+                fields=["name", "id"],
+                condition=models.Q(is_visible=True),
+                name="store_product_visible_name",
+            ),
+            models.Index(
+                fields=["-rating", "-reviews_count", "id"],
+                condition=models.Q(is_visible=True),
+                name="store_product_visible_rating",
+            ),
         ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remembers the stored image and seller so changes can be detected on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_image_name = instance.__dict__.get("image_file")
+        instance._loaded_seller_id = instance.__dict__.get("seller_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Copies the seller's active flag onto new products and products that change seller."""
+        if self._state.adding or getattr(self, "_loaded_seller_id", self.seller_id) != self.seller_id:
+            self.is_visible = self._seller_is_active()
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "is_visible"}
+            self._loaded_seller_id = self.seller_id
+        super().save(*args, **kwargs)
+
+    def _seller_is_active(self):
+        if Product.seller.is_cached(self):
+            return self.seller.is_active
+        return Seller.objects.filter(pk=self.seller_id, is_active=True).exists()
+
     @property
     def image_url(self):
         """Returns the URL of the product image."""
@@ -125,8 +252,106 @@ class Product(models.Model):
         return ""
 
 
+class ProductVariant(models.Model):
+    """
+    Represents a purchasable variant of a product (e.g. a colour/size combination)
+    with its own SKU, stock and optional price.
+    """
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="variants"
+    )
+    sku = models.CharField(
+        _("SKU"),
+        max_length=50,
+        unique=True,
+        help_text=_("Stock Keeping Unit, unique identifier for this variant."),
+    )
+    name = models.CharField(
+        _("name"), max_length=200, blank=True, help_text=_("e.g. 'Black / 128GB'")
+    )
+    color = models.CharField(_("color"), max_length=50, blank=True)
+    size = models.CharField(_("size"), max_length=50, blank=True)
+    price_override = models.DecimalField(
+        _("price override"),
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text=_("Leave empty to use the product price."),
+    )
+    stock = models.PositiveIntegerField(_("stock"), default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Product Variant")
+        verbose_name_plural = _("Product Variants")
+        ordering = ["product", "sku"]
+
+    def __str__(self):
+        return f"{self.sku} ({self.name})" if self.name else self.sku
+
+    @property
+    def price(self):
+        """Returns the variant's effective price."""
+        if self.price_override is not None:
+            return self.price_override
+        return self.product.price
+
+
+class Review(models.Model):
+    """Represents a customer's rating and review of a product."""
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="reviews"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="product_reviews",
+    )
+    rating = models.PositiveSmallIntegerField(
+        _("rating"),
+        validators=[MinValueValidator(1), MaxValueValidator(5)],
+        help_text=_("Rating from 1 to 5"),
+    )
+    comment = models.TextField(_("comment"), blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Review")
+        verbose_name_plural = _("Reviews")
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "user"], name="unique_review_per_user"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["product", "-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.rating}/5 for {self.product_id} by {self.user_id}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remembers the stored product and rating so edits can be applied as deltas."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_product_id = instance.__dict__.get("product_id")
+        instance._loaded_rating = instance.__dict__.get("rating")
+        return instance
+
+
 class Order(models.Model):
     """Represents an order, which can be a shopping cart or a completed order."""
+
+    class FulfilmentStatus(models.TextChoices):
+        PAID = "PAID", _("Paid")
+        PACKED = "PACKED", _("Packed")
+        SHIPPED = "SHIPPED", _("Shipped")
+        DELIVERED = "DELIVERED", _("Delivered")
+
     # This now represents a sub-order for a single seller
     cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name='orders', null=True) # Link to parent cart
     seller = models.ForeignKey(Seller, on_delete=models.PROTECT, related_name='orders', null=True, blank=True) # <-- MODIFIED: Added null=True, blank=True
@@ -144,6 +369,18 @@ class Order(models.Model):
     session_key = models.CharField(
         max_length=255, null=True, blank=True, unique=True
     )  # Unique ID for guest carts
+    # Frozen copy of the line items, prices and totals, written once when the order
+    # completes. Receipts and order history read this instead of the live rows.
+    snapshot = models.JSONField(_("snapshot"), null=True, blank=True, editable=False)
+    # Set to PAID when the order completes and only ever moves forward through
+    # FulfilmentStatus (see sellers.fulfilment). Carts have none.
+    fulfilment_status = models.CharField(
+        _("fulfilment status"),
+        max_length=10,
+        choices=FulfilmentStatus.choices,
+        null=True,
+        blank=True,
+    )
 
     class Meta:
         verbose_name = _("Order")
@@ -152,6 +389,10 @@ class Order(models.Model):
         indexes = [
             models.Index(fields=["complete"]),
             models.Index(fields=["-date_ordered"]),
+            models.Index(fields=["customer", "complete", "-date_ordered"]),
+            models.Index(fields=["transaction_id"]),
+            # Seller fulfilment queues: one seller, one status, oldest first.
+            models.Index(fields=["seller", "fulfilment_status", "date_ordered"]),
         ]
 
     def __str__(self):
@@ -181,6 +422,122 @@ class Order(models.Model):
         total = sum([item.quantity for item in orderitems])
         return total
 
+    def build_snapshot(self, items=None):
+        """
+        Returns the order's line items, prices and totals as a JSON-ready dict.
+        Pass `items` (with products loaded) or prefetch `orderitem_set__product`
+        to avoid a query; otherwise the items are read with one joined query.
+        """
+        if items is None:
+            if "orderitem_set" in getattr(self, "_prefetched_objects_cache", {}):
+                items = self.orderitem_set.all()
+            else:
+                items = self.orderitem_set.select_related("product")
+
+        lines = []
+        total = Decimal("0.00")
+        for item in items:
+            if item.product is None or not item.quantity:
+                continue
+            line_total = item.product.price * item.quantity
+            total += line_total
+            lines.append(
+                {
+                    "product_id": item.product_id,
+                    "product_name": item.product.name,
+                    "sku": item.product.sku,
+                    "digital": bool(item.product.digital),
+                    "unit_price": str(item.product.price),
+                    "quantity": item.quantity,
+                    "total": str(line_total),
+                }
+            )
+        return {
+            "id": self.pk,
+            "seller_id": self.seller_id,
+            "customer_name": self.customer.name if self.customer and self.customer.name else "Guest",
+            "transaction_id": self.transaction_id,
+            "completed_at": self.date_ordered.isoformat() if self.date_ordered else None,
+            "items": lines,
+            "items_count": sum(line["quantity"] for line in lines),
+            "total": str(total),
+            "requires_shipping": any(not line["digital"] for line in lines),
+        }
+
+    def mark_complete(self, transaction_id=None, items=None):
+        """
+        Completes the order and freezes its snapshot. The snapshot is only
+        written the first time, so later price changes never alter a receipt.
+        """
+        self.complete = True
+        self.date_ordered = timezone.now()
+        if transaction_id is not None:
+            self.transaction_id = str(transaction_id)
+        first_completion = self.snapshot is None
+        if first_completion:
+            self.snapshot = self.build_snapshot(items=items)
+            self.fulfilment_status = self.FulfilmentStatus.PAID
+        self.save()
+        OrderHistory.record(self)
+        if first_completion:
+            from .signals import order_completed
+            order_completed.send(sender=Order, order=self, snapshot=self.snapshot)
+
+    def get_snapshot(self):
+        """Returns the frozen snapshot, or a live one for orders that never completed."""
+        return self.snapshot if self.snapshot is not None else self.build_snapshot()
+
+
+class OrderHistory(models.Model):
+    """
+    Denormalized summary of a completed order for customer order history.
+    Written by Order.mark_complete, so listing a customer's orders is a single
+    index range scan with no joins or aggregation over order items.
+    """
+    order = models.OneToOneField(
+        Order, on_delete=models.CASCADE, primary_key=True, related_name="history"
+    )
+    customer = models.ForeignKey(
+        Customer, on_delete=models.SET_NULL, null=True, blank=True, related_name="order_history"
+    )
+    date_ordered = models.DateTimeField(_("date ordered"))
+    total = models.DecimalField(_("total"), max_digits=12, decimal_places=2)
+    items_count = models.PositiveIntegerField(_("items count"), default=0)
+    status = models.CharField(_("status"), max_length=20, default="COMPLETED")
+    transaction_id = models.CharField(_("transaction id"), max_length=100, null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Order History")
+        verbose_name_plural = _("Order History")
+        ordering = ["-date_ordered"]
+        indexes = [
+            models.Index(fields=["customer", "-date_ordered"]),
+        ]
+
+    def __str__(self):
+        return f"Order {self.order_id} ({self.status})"
+
+    @classmethod
+    def record(cls, order):
+        """Upserts the history row for a completed order from its snapshot in one query."""
+        snapshot = order.get_snapshot()
+        row = cls(
+            order=order,
+            customer_id=order.customer_id,
+            date_ordered=order.date_ordered,
+            total=Decimal(snapshot["total"]),
+            items_count=snapshot["items_count"],
+            status="COMPLETED",
+            transaction_id=order.transaction_id,
+        )
+        cls.objects.bulk_create(
+            [row],
+            update_conflicts=True,
+            unique_fields=["order"],
+            update_fields=["customer", "date_ordered", "total", "items_count", "status", "transaction_id"],
+        )
+        return row
+
 
 class OrderItem(models.Model):
     """Represents an item within an Order (cart item or line item in a completed order)."""
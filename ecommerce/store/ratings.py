@@ -0,0 +1,103 @@
+# ecommerce/store/ratings.py
+"""
+Incremental maintenance of Product.rating / reviews_count / rating_sum.
+
+Every review write adjusts the running sum and count on its product with a single
+UPDATE built from F-expressions, so catalog reads never aggregate Review rows.
+reconcile_product_ratings() repairs any drift (e.g. rows changed with raw SQL or
+queryset.update(), which bypass signals) and is run periodically by Celery beat.
+"""
+import logging
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    FloatField,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce
+
+from .models import Product, Review
+
+logger = logging.getLogger(__name__)
+
+RATING_QUANTUM = Decimal("0.01")
+
+
+def apply_rating_delta(product_id, sum_delta, count_delta):
+    """
+    Adjusts a product's running rating sum/count and recomputes the average in one
+    UPDATE. The new average is derived from the pre-update column values plus the
+    deltas, so concurrent writers never read-modify-write in Python.
+    """
+    if not sum_delta and not count_delta:
+        return 0
+    new_sum = F("rating_sum") + sum_delta
+    new_count = F("reviews_count") + count_delta
+    return Product.objects.filter(pk=product_id).update(
+        rating_sum=new_sum,
+        reviews_count=new_count,
+        rating=Case(
+            When(
+                reviews_count__gt=-count_delta,
+                then=Cast(new_sum, FloatField()) / new_count,
+            ),
+            default=Value(Decimal("0.00")),
+            output_field=DecimalField(max_digits=3, decimal_places=2),
+        ),
+    )
+
+
+def average_rating(rating_sum, reviews_count):
+    """Returns the 2dp average used for Product.rating."""
+    if not reviews_count:
+        return Decimal("0.00")
+    return (Decimal(rating_sum) / Decimal(reviews_count)).quantize(
+        RATING_QUANTUM, rounding=ROUND_HALF_UP
+    )
+
+
+def reconcile_product_ratings(batch_size=500):
+    """
+    Recomputes aggregates from Review rows and rewrites only the products whose
+    stored sum/count have drifted. Returns the number of products corrected.
+    """
+    reviews = Review.objects.filter(product=OuterRef("pk")).values("product")
+    drifted = (
+        Product.objects.annotate(
+            actual_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum("rating")).values("total")), 0
+            ),
+            actual_count=Coalesce(
+                Subquery(reviews.annotate(total=Count("id")).values("total")), 0
+            ),
+        )
+        .exclude(rating_sum=F("actual_sum"), reviews_count=F("actual_count"))
+        .only("id", "rating_sum", "reviews_count", "rating")
+    )
+
+    corrected = 0
+    batch = []
+    for product in drifted.iterator(chunk_size=batch_size):
+        product.rating_sum = product.actual_sum
+        product.reviews_count = product.actual_count
+        product.rating = average_rating(product.actual_sum, product.actual_count)
+        batch.append(product)
+        if len(batch) >= batch_size:
+            Product.objects.bulk_update(batch, ["rating_sum", "reviews_count", "rating"])
+            corrected += len(batch)
+            batch = []
+    if batch:
+        Product.objects.bulk_update(batch, ["rating_sum", "reviews_count", "rating"])
+        corrected += len(batch)
+
+    if corrected:
+        logger.warning(f"Reconciled rating aggregates for {corrected} product(s).")
+    return corrected
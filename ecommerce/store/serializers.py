@@ -1,7 +1,30 @@
 # ecommerce/store/serializers.py
+from urllib.parse import urljoin
+
 from rest_framework import serializers
 
-from .models import Cart, Customer, Order, OrderItem, Product
+from .images import build_srcsets
+from .models import (
+    Cart,
+    Category,
+    Customer,
+    Order,
+    OrderHistory,
+    OrderItem,
+    Product,
+    ProductVariant,
+    Review,
+)
+
+
+# --- Category Serializer ---
+class CategorySerializer(serializers.ModelSerializer):
+    """Serializer for a single category; the full tree is served pre-built."""
+
+    class Meta:
+        model = Category
+        fields = ["id", "name", "slug", "description", "parent", "path", "depth"]
+        read_only_fields = fields
 
 
 # --- Read-only Product Serializer (for nested use in OrderItem) ---
@@ -9,6 +32,7 @@ class ProductSerializer(serializers.ModelSerializer):
     """Serializer for the Product model."""
     seller = serializers.StringRelatedField()
     image_url = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
@@ -20,6 +44,9 @@ class ProductSerializer(serializers.ModelSerializer):
             "price",
             "digital",
             "image_url",
+            "image_srcset",
+            "image_width",
+            "image_height",
             "brand",
             "sku",
             "rating",
@@ -29,18 +56,101 @@ class ProductSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        # rating and reviews_count are maintained from Review rows (see store.ratings)
+        read_only_fields = [
+            "id",
+            "rating",
+            "reviews_count",
+            "image_width",
+            "image_height",
+            "created_at",
+            "updated_at",
+        ]
+
+    def _absolute_url(self, url):
+        """
+        Makes a media URL absolute. The request's base URL is resolved once per
+        serializer (one instance serves every row of a list), not once per image.
+        """
+        if not hasattr(self, "_base_url"):
+            request = self.context.get("request")
+            self._base_url = request.build_absolute_uri("/") if request else None
+        # Fallback for when request is not in context
+        return urljoin(self._base_url, url) if self._base_url else url
 
     def get_image_url(self, obj):
         """Returns the absolute URL of the product image."""
         if obj.image_file:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.image_file.url)
-            # Fallback for when request is not in context
-            return obj.image_file.url
+            return self._absolute_url(obj.image_file.url)
         return None
 
+    def get_image_srcset(self, obj):
+        """Returns a `srcset` string per rendition format, e.g. {"webp": "... 320w, ... 640w"}."""
+        if not obj.image_renditions:
+            return {}
+        storage = obj.image_file.storage
+        return build_srcsets(
+            obj.image_renditions, lambda name: self._absolute_url(storage.url(name))
+        )
+
+
+# --- Product Variant Serializers ---
+class ProductVariantSerializer(serializers.ModelSerializer):
+    """Serializer for a variant nested under its product."""
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = ProductVariant
+        fields = ["id", "sku", "name", "color", "size", "price", "stock"]
+        read_only_fields = fields
+
+
+class ProductVariantLookupSerializer(ProductVariantSerializer):
+    """Flat payload for SKU scans: the variant plus just enough of its product."""
+    product_id = serializers.IntegerField(read_only=True)
+    product_name = serializers.CharField(source="product.name", read_only=True)
+
+    class Meta(ProductVariantSerializer.Meta):
+        fields = ProductVariantSerializer.Meta.fields + ["product_id", "product_name"]
+        read_only_fields = fields
+
+
+class ProductListSerializer(ProductSerializer):
+    """
+    Product listing row. `min_price` and `total_stock` are annotated across the
+    product's variants by ProductViewSet, falling back to the product's own values.
+    """
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    total_stock = serializers.IntegerField(read_only=True)
+
+    class Meta(ProductSerializer.Meta):
+        fields = ProductSerializer.Meta.fields + ["min_price", "total_stock"]
+
+
+class ProductDetailSerializer(ProductListSerializer):
+    """Single product with its variants."""
+    variants = ProductVariantSerializer(many=True, read_only=True)
+
+    class Meta(ProductListSerializer.Meta):
+        fields = ProductListSerializer.Meta.fields + ["variants"]
+
+
+# --- Review Serializer ---
+class ReviewSerializer(serializers.ModelSerializer):
+    """Serializer for product reviews written by the requesting user."""
+    user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+
+    class Meta:
+        model = Review
+        fields = ["id", "product", "user", "rating", "comment", "created_at", "updated_at"]
+        read_only_fields = ["id", "created_at", "updated_at"]
+
+    def validate_product(self, value):
+        """Prevents a review from being moved to another product."""
+        if self.instance and value != self.instance.product:
+            raise serializers.ValidationError("A review cannot be moved to another product.")
+        return value
+
 
 # --- Writable OrderItem Serializer (for handling input to Order) ---
 class WritableOrderItemSerializer(
@@ -56,10 +166,16 @@ class WritableOrderItemSerializer(
         fields = ["product_id", "quantity"]
 
     def validate_product_id(self, value):
-        """Validates that the product exists."""
-        try:
-            Product.objects.get(id=value)
-        except Product.DoesNotExist:
+        """
+        Validates that the product exists. Callers validating many items pass
+        the products, keyed by str(id), as context["products"] to skip the query.
+        """
+        products = self.context.get("products")
+        if products is not None:
+            exists = value in products
+        else:
+            exists = value.isdigit() and Product.objects.filter(id=value).exists()
+        if not exists:
             raise serializers.ValidationError(
                 f"Product with ID '{value}' does not exist."
             )
@@ -83,6 +199,17 @@ class ReadOnlyOrderItemSerializer(serializers.ModelSerializer):
         fields = ["id", "product", "quantity", "get_total"]
 
 
+# --- Order History Serializer ---
+class OrderHistorySerializer(serializers.ModelSerializer):
+    """One row of a customer's order history (see OrderHistory)."""
+    id = serializers.IntegerField(source="order_id", read_only=True)
+
+    class Meta:
+        model = OrderHistory
+        fields = ["id", "date_ordered", "total", "items_count", "status", "transaction_id"]
+        read_only_fields = fields
+
+
 # --- Order Serializer (primarily for reading/outputting Order data) ---
 class OrderSerializer(serializers.ModelSerializer):
     """Serializer for the Order model."""
@@ -107,6 +234,7 @@ class OrderSerializer(serializers.ModelSerializer):
             "cart_items_count",
             "has_shipping_items",
             "items",
+            "snapshot",
         ]
         read_only_fields = [
             "id",
@@ -0,0 +1,104 @@
+# ecommerce/store/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from sellers.models import Seller
+
+from .cache import CATALOG_NAMESPACE, CATEGORY_TREE_NAMESPACE, bump_cache_version
+from .customers import invalidate_customer_cache
+from .models import Category, Customer, Product, Review
+from .ratings import apply_rating_delta
+from .tasks import generate_product_thumbnails_task
+
+# Sent by Order.mark_complete the first time an order completes, inside the
+# same transaction, with `order` and its frozen `snapshot`.
+order_completed = Signal()
+
+
+@receiver(post_save, sender=Review)
+def update_product_rating_on_save(sender, instance, created, **kwargs):
+    """Applies a new or edited review to its product's running aggregates."""
+    previous_product_id = getattr(instance, "_loaded_product_id", None)
+    previous_rating = getattr(instance, "_loaded_rating", None)
+
+    if created or previous_product_id is None:
+        apply_rating_delta(instance.product_id, instance.rating, 1)
+    elif previous_product_id != instance.product_id:
+        apply_rating_delta(previous_product_id, -previous_rating, -1)
+        apply_rating_delta(instance.product_id, instance.rating, 1)
+    else:
+        apply_rating_delta(instance.product_id, instance.rating - previous_rating, 0)
+
+    instance._loaded_product_id = instance.product_id
+    instance._loaded_rating = instance.rating
+
+
+@receiver(post_delete, sender=Review)
+def update_product_rating_on_delete(sender, instance, **kwargs):
+    """Removes a deleted review from its product's running aggregates."""
+    product_id = getattr(instance, "_loaded_product_id", None) or instance.product_id
+    rating = getattr(instance, "_loaded_rating", None) or instance.rating
+    apply_rating_delta(product_id, -rating, -1)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_tree(sender, **kwargs):
+    """
+    Any change to a category invalidates the cached navigation tree. Deferred to
+    commit so a rebuild never caches a half-applied subtree move.
+    """
+    transaction.on_commit(lambda: bump_cache_version(CATEGORY_TREE_NAMESPACE))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_catalog(sender, **kwargs):
+    """
+    Invalidates cached catalog data once the product change commits. Bulk
+    writes (catalog imports, bulk stock and price updates) send no signals and
+    bump the namespace once themselves.
+    """
+    transaction.on_commit(lambda: bump_cache_version(CATALOG_NAMESPACE))
+
+
+@receiver(post_save, sender=Seller)
+def sync_product_visibility(sender, instance, created, **kwargs):
+    """
+    Shows or hides all of a seller's products with one UPDATE when the seller
+    is activated or deactivated, then invalidates the catalog once.
+    """
+    previous = getattr(instance, "_loaded_is_active", None)
+    instance._loaded_is_active = instance.is_active
+    if created or previous is None or previous == instance.is_active:
+        return
+    changed = (
+        Product.objects.filter(seller_id=instance.pk)
+        .exclude(is_visible=instance.is_active)
+        .update(is_visible=instance.is_active)
+    )
+    if changed:
+        transaction.on_commit(lambda: bump_cache_version(CATALOG_NAMESPACE))
+
+
+@receiver(post_save, sender=Product)
+def queue_product_thumbnails(sender, instance, created, **kwargs):
+    """Schedules rendition generation whenever the product image changes."""
+    if "image_file" in instance.get_deferred_fields():
+        return
+    current = instance.image_file.name or None
+    previous = getattr(instance, "_loaded_image_name", None) or None
+    if current == previous:
+        return
+    instance._loaded_image_name = current
+    transaction.on_commit(lambda: generate_product_thumbnails_task.delay(instance.pk))
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def invalidate_cached_customer(sender, instance, **kwargs):
+    """Drops the cross-request customer cache entry once the change commits."""
+    user_id = instance.user_id
+    if user_id is not None:
+        transaction.on_commit(lambda: invalidate_customer_cache(user_id))
@@ -0,0 +1,28 @@
+# ecommerce/store/tasks.py
+import logging
+
+from celery import shared_task
+
+from .images import generate_product_thumbnails
+from .ratings import reconcile_product_ratings
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def reconcile_product_ratings_task():
+    """
+    Periodic safety net for the incremental rating aggregates.
+    Scheduled via CELERY_BEAT_SCHEDULE in settings.
+    """
+    corrected = reconcile_product_ratings()
+    logger.info(f"Rating reconciliation finished; {corrected} product(s) corrected.")
+    return corrected
+
+
+@shared_task(ignore_result=True)
+def generate_product_thumbnails_task(product_id):
+    """Builds responsive renditions for a product's newly uploaded image."""
+    written = generate_product_thumbnails(product_id)
+    logger.info(f"Generated {written} image rendition(s) for product {product_id}.")
+    return written
@@ -0,0 +1,104 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from ecommerce import pagination
+from ecommerce.pagination import EstimatedCountPaginator
+from sellers.models import Seller
+from store.models import Customer, Order, OrderItem, Product
+
+User = get_user_model()
+
+
+@pytest.fixture
+def admin_client(client, db):
+    user = User.objects.create_user(
+        email="ops@example.com", password="opspass", is_staff=True, is_superuser=True
+    )
+    client.force_login(user)
+    return client
+
+
+def create_orders(count):
+    user = User.objects.create_user(email=f"seller{count}@example.com", password="pass")
+    seller = Seller.objects.create(user=user, business_name=f"Admin Seller {count}")
+    product = Product.objects.create(seller=seller, name="Cable", price=Decimal("5.00"))
+    orders = []
+    for i in range(count):
+        buyer = User.objects.create_user(email=f"buyer{count}-{i}@example.com", password="pass")
+        customer = Customer.objects.create(user=buyer, name=f"Buyer {i}")
+        order = Order.objects.create(seller=seller, customer=customer, transaction_id=f"TX{count}-{i}")
+        OrderItem.objects.create(order=order, product=product, quantity=1)
+        orders.append(order)
+    return orders
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("model", ["order", "orderitem"])
+def test_changelist_queries_do_not_grow_with_rows(admin_client, model, django_assert_max_num_queries):
+    url = reverse(f"admin:store_{model}_changelist")
+    create_orders(2)
+    with django_assert_max_num_queries(12) as small:
+        assert admin_client.get(url).status_code == 200
+    create_orders(10)
+    with django_assert_max_num_queries(len(small.captured_queries)):
+        assert admin_client.get(url).status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("model", ["order", "orderitem", "shippingaddress"])
+def test_unsearched_changelist_lists_every_row(admin_client, model):
+    from store.models import ShippingAddress
+    for order in create_orders(3):
+        ShippingAddress.objects.create(
+            customer=order.customer, order=order, address="1 Main St", city="Nairobi", state="NA", zipcode="00100"
+        )
+
+    response = admin_client.get(reverse(f"admin:store_{model}_changelist"))
+
+    assert response.status_code == 200
+    assert len(response.context["cl"].result_list) == 3
+
+
+@pytest.mark.django_db
+def test_order_search_matches_ids_exactly(admin_client):
+    orders = create_orders(3)
+    url = reverse("admin:store_order_changelist")
+
+    response = admin_client.get(url, {"q": str(orders[1].pk)})
+    assert list(response.context["cl"].result_list) == [orders[1]]
+
+    response = admin_client.get(url, {"q": orders[2].transaction_id})
+    assert list(response.context["cl"].result_list) == [orders[2]]
+
+
+@pytest.mark.django_db
+def test_paginator_estimates_only_unfiltered_large_tables(monkeypatch):
+    create_orders(2)
+    monkeypatch.setattr(pagination, "estimated_row_count", lambda model, using="default": 5_000_000)
+
+    paginator = EstimatedCountPaginator(Order.objects.all(), 100)
+    assert (paginator.count, paginator.count_is_estimate) == (5_000_000, True)
+    paginator = EstimatedCountPaginator(Order.objects.filter(complete=False), 100)
+    assert (paginator.count, paginator.count_is_estimate) == (2, False)
+
+    monkeypatch.setattr(pagination, "estimated_row_count", lambda model, using="default": None)
+    assert EstimatedCountPaginator(Order.objects.all(), 100).count == 2
+
+
+@pytest.mark.django_db
+def test_paginator_caches_counts_above_the_exact_limit(monkeypatch, django_assert_num_queries):
+    from django.core.cache import cache
+
+    cache.clear()
+    create_orders(5)
+    monkeypatch.setattr(EstimatedCountPaginator, "exact_count_limit", 3)
+    queryset = Order.objects.filter(complete=False)
+
+    with django_assert_num_queries(2):  # capped count, then the full count
+        paginator = EstimatedCountPaginator(queryset, 2)
+        assert (paginator.count, paginator.count_is_estimate) == (5, True)
+    with django_assert_num_queries(1):  # capped count; the full count is cached
+        assert EstimatedCountPaginator(queryset, 2).count == 5
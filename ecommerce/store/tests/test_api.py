@@ -3,6 +3,9 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from store.customers import get_request_customer
 from store.models import Product, Category, Customer, Cart, Order, OrderItem
 from sellers.models import Seller, SellerProfile
 from decimal import Decimal
@@ -13,6 +16,11 @@ User = get_user_model()
 def api_client():
     return APIClient()
 
+@pytest.fixture(autouse=True)
+def clear_cross_request_cache():
+    # Cached customers are keyed by user id, which the test database reuses.
+    cache.clear()
+
 @pytest.fixture
 def create_user():
     def _create_user(email, password, is_staff=False, is_superuser=False):
@@ -74,6 +82,18 @@ class TestProductViewSet:
         assert len(response.data["results"]) == 1
         assert response.data["results"][0]["name"] == "Active Product"
 
+    def test_list_reports_whether_count_is_estimated(self, api_client, product_factory, seller_user_and_profile):
+        _, seller = seller_user_and_profile
+        seller.is_active = True
+        seller.save()
+        for i in range(3):
+            product_factory(seller=seller, name=f"Counted {i}")
+
+        response = api_client.get(reverse("product-list"))
+
+        assert response.data["count"] == 3
+        assert response.data["count_is_estimate"] is False
+
     def test_retrieve_product_from_active_seller(self, api_client, product_factory, seller_user_and_profile):
         _, seller1 = seller_user_and_profile
         seller1.is_active = True
@@ -92,6 +112,39 @@ class TestProductViewSet:
 
         response = api_client.get(reverse("product-detail", args=[product1.id]))
         assert response.status_code == status.HTTP_404_NOT_FOUND
+    def test_seller_activation_toggles_product_visibility(
+        self, api_client, product_factory, seller_user_and_profile, django_capture_on_commit_callbacks
+    ):
+        from store.cache import CATALOG_NAMESPACE, get_cache_version
+        _, seller = seller_user_and_profile
+        products = [product_factory(seller=seller, name=f"Hidden {i}") for i in range(3)]
+        assert not any(Product.objects.filter(pk__in=[p.pk for p in products]).values_list("is_visible", flat=True))
+
+        before = get_cache_version(CATALOG_NAMESPACE)
+        with django_capture_on_commit_callbacks(execute=True):
+            seller.is_active = True
+            seller.save()
+        assert Product.objects.filter(seller=seller, is_visible=True).count() == 3
+        assert get_cache_version(CATALOG_NAMESPACE) == before + 1
+
+        seller.is_active = False
+        seller.save()
+        assert not Product.objects.filter(seller=seller, is_visible=True).exists()
+
+    def test_catalog_query_does_not_join_sellers(self, api_client, product_factory, seller_user_and_profile):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        _, seller = seller_user_and_profile
+        seller.is_active = True
+        seller.save()
+        product_factory(seller=seller, name="Visible")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse("product-list"))
+
+        assert response.data["results"][0]["seller"] == "Test Seller"
+        product_queries = [q["sql"] for q in queries if 'FROM "store_product"' in q["sql"]]
+        assert product_queries and not any("sellers_seller" in sql for sql in product_queries)
 
 @pytest.mark.django_db
 class TestCartViewSet:
@@ -188,3 +241,177 @@ class TestCartViewSet:
         response = api_client.get(reverse("cart-my-cart"))
         assert response.status_code == status.HTTP_404_NOT_FOUND
         assert "No active cart found" in response.data["detail"]
+
+@pytest.mark.django_db
+class TestCategoryTree:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    def test_subtree_product_listing(self, api_client, seller_user_and_profile):
+        _, seller = seller_user_and_profile
+        seller.is_active = True
+        seller.save()
+        electronics = Category.objects.create(name="Electronics")
+        phones = Category.objects.create(name="Phones", parent=electronics)
+        books = Category.objects.create(name="Books")
+        Product.objects.create(seller=seller, name="Phone", price=1, category=phones)
+        Product.objects.create(seller=seller, name="TV", price=1, category=electronics)
+        Product.objects.create(seller=seller, name="Novel", price=1, category=books)
+
+        response = api_client.get(reverse("product-list"), {"category": "electronics"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [p["name"] for p in response.data["results"]] == ["Phone", "TV"]
+
+        response = api_client.get(reverse("product-list"), {"category": phones.id})
+        assert [p["name"] for p in response.data["results"]] == ["Phone"]
+
+    def test_tree_is_cached_and_invalidated(
+        self, api_client, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            electronics = Category.objects.create(name="Electronics")
+            Category.objects.create(name="Phones", parent=electronics)
+
+        response = api_client.get(reverse("category-tree"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"][0]["children"][0]["slug"] == "phones"
+        etag = response["ETag"]
+
+        with django_assert_num_queries(0):
+            response = api_client.get(reverse("category-tree"), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Category.objects.create(name="Books")
+        response = api_client.get(reverse("category-tree"), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert len(response.data["results"]) == 2
+
+
+@pytest.mark.django_db
+class TestOrderHistory:
+    def test_list_serves_history_with_cursor_pagination(
+        self, authenticated_client, product_factory, seller_user_and_profile, django_assert_max_num_queries
+    ):
+        _, seller = seller_user_and_profile
+        user = User.objects.get(email="test@example.com")
+        customer = Customer.objects.create(user=user, name="History Customer")
+        product = product_factory(seller=seller, price=Decimal("10.00"))
+        for quantity in range(1, 13):
+            order = Order.objects.create(customer=customer, seller=seller)
+            OrderItem.objects.create(order=order, product=product, quantity=quantity)
+            order.mark_complete(transaction_id=f"TX{quantity}")
+        Order.objects.create(customer=customer, seller=seller)  # open cart, not history
+
+        with django_assert_max_num_queries(1):
+            response = authenticated_client.get(reverse("order-list"))
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.data["results"]
+        assert len(first_page) == 10
+        assert first_page[0]["transaction_id"] == "TX12"
+        assert first_page[0]["items_count"] == 12
+        assert first_page[0]["total"] == "120.00"
+
+        response = authenticated_client.get(response.data["next"])
+        assert [row["transaction_id"] for row in response.data["results"]] == ["TX2", "TX1"]
+        assert response.data["next"] is None
+
+    def test_other_customers_orders_are_not_listed(self, authenticated_client, create_user, product_factory, seller_user_and_profile):
+        _, seller = seller_user_and_profile
+        other = Customer.objects.create(user=create_user("other@example.com", "password123"))
+        order = Order.objects.create(customer=other, seller=seller)
+        OrderItem.objects.create(order=order, product=product_factory(seller=seller), quantity=1)
+        order.mark_complete()
+
+        response = authenticated_client.get(reverse("order-list"))
+        assert response.data["results"] == []
+
+
+@pytest.mark.django_db
+class TestCustomerResolution:
+    def test_registration_creates_customer(self, api_client):
+        response = api_client.post(
+            reverse("rest_register"), {"email": "signup@example.com", "password": "Str0ngPass!"}
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Customer.objects.filter(user__email="signup@example.com").exists()
+
+    def test_customer_resolved_once_per_request_and_cached_across_requests(
+        self, create_user, rf, django_assert_num_queries
+    ):
+        user = create_user("resolve@example.com", "password123")
+        customer = Customer.objects.create(user=user)
+        request = rf.get("/")
+        request.user = user
+
+        with django_assert_num_queries(1):
+            assert get_request_customer(request) == customer
+            assert get_request_customer(request) == customer
+
+        next_request = rf.get("/")
+        next_request.user = user
+        with django_assert_num_queries(0):
+            assert get_request_customer(next_request) == customer
+
+    def test_user_without_customer_gets_one_lazily(self, authenticated_client):
+        user = User.objects.get(email="test@example.com")
+        response = authenticated_client.get(reverse("cart-my-cart"))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert Customer.objects.filter(user=user).count() == 1
+
+    def test_guest_has_no_customer(self, rf):
+        request = rf.get("/")
+        request.user = AnonymousUser()
+        assert get_request_customer(request) is None
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    def test_request_is_logged_with_per_view_metrics(
+        self, api_client, product_factory, seller_user_and_profile, settings, caplog
+    ):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        settings.METRICS_LOG_REQUESTS = True
+        _, seller = seller_user_and_profile
+        seller.is_active = True
+        seller.save()
+        product_factory(seller=seller, name="Measured")
+
+        with caplog.at_level("INFO", logger="ecommerce.metrics"):
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.get(reverse("product-list"))
+
+        record = next(r for r in caplog.records if r.name == "ecommerce.metrics")
+        assert record.view == "product-list"
+        assert record.status == status.HTTP_200_OK
+        assert record.db_queries == len(queries)
+        assert record.response_bytes == len(response.content)
+        assert 0 < record.serializer_time_ms <= record.duration_ms
+
+    def test_cache_hits_and_misses_are_counted(self):
+        from ecommerce.cache_backends import InstrumentedLocMemCache
+        from ecommerce.metrics import collect_stats
+        backend = InstrumentedLocMemCache("metrics-test", {})
+
+        with collect_stats() as stats:
+            assert backend.get("a") is None
+            backend.set("a", 1)
+            assert backend.get("a") == 1
+            assert backend.get_many(["a", "b"]) == {"a": 1}
+
+        assert (stats.cache_hits, stats.cache_misses) == (2, 2)
+
+    def test_metrics_endpoint_requires_token(self, api_client, settings):
+        settings.METRICS_AUTH_TOKEN = "scrape-token"
+
+        response = api_client.get(reverse("metrics"))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        pytest.importorskip("prometheus_client")
+        api_client.get(reverse("product-list"))
+        response = api_client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer scrape-token")
+        assert response.status_code == status.HTTP_200_OK
+        assert b'ecommerce_request_db_queries_count{view="product-list"}' in response.content
@@ -0,0 +1,99 @@
+import io
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+
+from sellers.models import Seller
+from store import signals
+from store.images import generate_product_thumbnails
+from store.models import Product
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    calls = []
+    monkeypatch.setattr(signals.generate_product_thumbnails_task, "delay", calls.append)
+    return calls
+
+
+@pytest.fixture
+def seller(db):
+    user = User.objects.create_user(email="images@example.com", password="sellerpass")
+    return Seller.objects.create(user=user, business_name="Image Seller", is_active=True)
+
+
+def png_upload(width=800, height=400):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(buffer, format="PNG")
+    return SimpleUploadedFile("photo.png", buffer.getvalue(), content_type="image/png")
+
+
+@pytest.mark.django_db
+def test_upload_queues_thumbnails_once(seller, queued, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        product = Product.objects.create(
+            seller=seller, name="Photo", price=Decimal("1.00"), image_file=png_upload()
+        )
+    assert queued == [product.pk]
+
+    product = Product.objects.get(pk=product.pk)
+    with django_capture_on_commit_callbacks(execute=True):
+        product.name = "Renamed"
+        product.save()
+    assert queued == [product.pk]
+
+
+@pytest.mark.django_db
+def test_generate_thumbnails_records_renditions(seller, queued, media_root):
+    product = Product.objects.create(
+        seller=seller, name="Photo", price=Decimal("1.00"), image_file=png_upload()
+    )
+
+    written = generate_product_thumbnails(product.pk)
+
+    product.refresh_from_db()
+    assert (product.image_width, product.image_height) == (800, 400)
+    # 1024 is wider than the original and is skipped
+    assert written == len(product.image_renditions)
+    webp = sorted(
+        (r for r in product.image_renditions if r["format"] == "webp"), key=lambda r: r["width"]
+    )
+    assert [(r["width"], r["height"]) for r in webp] == [(160, 80), (320, 160), (640, 320)]
+    for rendition in product.image_renditions:
+        assert (media_root / rendition["name"]).exists()
+
+    # Regenerating replaces the previous files
+    old_names = [r["name"] for r in product.image_renditions]
+    generate_product_thumbnails(product.pk)
+    product.refresh_from_db()
+    assert len(product.image_renditions) == len(old_names)
+    assert not any((media_root / name).exists() for name in old_names)
+
+
+@pytest.mark.django_db
+def test_api_exposes_srcset(seller, queued):
+    product = Product.objects.create(
+        seller=seller, name="Photo", price=Decimal("1.00"), image_file=png_upload(400, 400)
+    )
+    generate_product_thumbnails(product.pk)
+
+    response = APIClient().get(reverse("product-detail", kwargs={"pk": product.pk}))
+    assert response.status_code == 200
+    assert response.data["image_width"] == 400
+    assert response.data["image_url"].startswith("http://testserver/media/")
+    entries = response.data["image_srcset"]["webp"].split(", ")
+    assert entries[0].startswith("http://testserver/media/product_images/renditions/")
+    assert [entry.rsplit(" ", 1)[1] for entry in entries] == ["160w", "320w"]
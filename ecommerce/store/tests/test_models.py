@@ -2,6 +2,7 @@ from decimal import Decimal
 
 import pytest
 from django.contrib.auth import get_user_model
+from sellers.models import Seller
 from store.models import Category, Customer, Order, OrderItem, Product
 
 User = get_user_model()
@@ -132,3 +133,55 @@ def test_order_shipping_property(customer_user, product_digital, product_physica
     OrderItem.objects.create(order=store_order, product=product_digital, quantity=1)
     OrderItem.objects.create(order=store_order, product=product_physical, quantity=1)
     assert store_order.shipping is True
+
+
+@pytest.mark.django_db
+def test_category_materialized_path_follows_moves():
+    electronics = Category.objects.create(name="Electronics")
+    phones = Category.objects.create(name="Phones", parent=electronics)
+    android = Category.objects.create(name="Android Phones", parent=phones)
+    assert phones.path == "electronics/phones/"
+    assert android.path == "electronics/phones/android-phones/"
+    assert android.depth == 2
+
+    gadgets = Category.objects.create(name="Gadgets")
+    phones.parent = gadgets
+    phones.save()
+    android.refresh_from_db()
+    assert android.path == "gadgets/phones/android-phones/"
+    assert android.depth == 2
+
+
+@pytest.mark.django_db
+def test_category_cannot_move_under_descendant():
+    from django.core.exceptions import ValidationError
+
+    parent = Category.objects.create(name="Parent")
+    child = Category.objects.create(name="Child", parent=parent)
+    parent.parent = child
+    with pytest.raises(ValidationError):
+        parent.save()
+
+
+@pytest.mark.django_db
+def test_order_snapshot_is_frozen_at_completion():
+    seller_user = User.objects.create_user(email="snapshot@example.com", password="pass12345")
+    seller = Seller.objects.create(user=seller_user, business_name="Lamp Seller")
+    customer = Customer.objects.create(name="Snap Customer")
+    product = Product.objects.create(
+        seller=seller, name="Lamp", price=Decimal("40.00"), digital=False
+    )
+    order = Order.objects.create(customer=customer)
+    OrderItem.objects.create(order=order, product=product, quantity=3)
+
+    order.mark_complete(transaction_id="TX1")
+    product.price = Decimal("55.00")
+    product.save()
+    order.mark_complete(transaction_id="TX1")
+
+    order.refresh_from_db()
+    assert order.snapshot["total"] == "120.00"
+    assert order.snapshot["items"][0]["unit_price"] == "40.00"
+    assert order.snapshot["items"][0]["product_name"] == "Lamp"
+    assert order.snapshot["requires_shipping"] is True
+    assert order.get_snapshot() == order.snapshot
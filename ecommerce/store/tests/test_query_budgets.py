@@ -0,0 +1,267 @@
+"""
+Query budgets for the API hot paths.
+
+Every test builds its scenario (a catalog, a cart, an order history) at each
+size in SIZES and calls the endpoint once per size. The endpoint must stay
+within its budget and run the same number of queries at every size, so an
+N+1 introduced anywhere on the path fails here before it reaches production.
+"""
+import json
+import uuid
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from payment.models import Transaction
+from sellers.models import Seller, SellerProfile
+from store.models import Cart, Category, Customer, Order, Product
+
+User = get_user_model()
+
+# Scenario sizes: line items per cart, products per page, orders per history.
+SIZES = (1, 8)
+
+
+@pytest.fixture(autouse=True)
+def clear_cross_request_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def assert_query_budget(django_assert_max_num_queries):
+    """
+    assert_query_budget(budget, build, call, expected_status=200)
+
+    For each size in SIZES, runs `call(build(size))` and checks the response
+    status, that it ran at most `budget` queries, and that the count did not
+    change with the size.
+    """
+    def check(budget, build, call, expected_status=status.HTTP_200_OK):
+        counts = {}
+        for size in SIZES:
+            scenario = build(size)
+            with django_assert_max_num_queries(budget) as captured:
+                response = call(scenario)
+            assert response.status_code == expected_status, getattr(response, "data", response)
+            counts[size] = len(captured.captured_queries)
+        assert len(set(counts.values())) == 1, f"Query count grows with size: {counts}"
+    return check
+
+
+@pytest.fixture
+def sequence():
+    """Unique suffixes, so scenarios built in the same test never collide."""
+    counter = iter(range(1, 1_000_000))
+    return lambda: next(counter)
+
+
+@pytest.fixture
+def make_seller(sequence):
+    def _make_seller():
+        n = sequence()
+        user = User.objects.create_user(email=f"seller{n}@example.com", password="sellerpass")
+        seller = Seller.objects.create(user=user, business_name=f"Seller {n}", is_active=True)
+        SellerProfile.objects.create(seller=seller)
+        return seller
+    return _make_seller
+
+
+@pytest.fixture
+def make_products(sequence):
+    def _make_products(seller, count, price="10.00", stock=100):
+        category, _ = Category.objects.get_or_create(name="Electronics")
+        return [
+            Product.objects.create(
+                seller=seller,
+                name=f"Product {sequence()}",
+                price=Decimal(price),
+                category=category,
+                stock=stock,
+            )
+            for _ in range(count)
+        ]
+    return _make_products
+
+
+@pytest.fixture
+def make_shopper(sequence):
+    """A customer with an authenticated client of its own."""
+    def _make_shopper():
+        n = sequence()
+        user = User.objects.create_user(email=f"shopper{n}@example.com", password="password123")
+        customer = Customer.objects.create(user=user, name=f"Shopper {n}", email=user.email)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return customer, client
+    return _make_shopper
+
+
+@pytest.fixture
+def make_cart(make_seller, make_products):
+    """
+    A customer's open cart with `size` line items split across two sellers,
+    so it holds one order per seller.
+    """
+    def _make_cart(customer, size):
+        cart = Cart.objects.create(customer=customer)
+        sellers = [make_seller(), make_seller()]
+        for i, product in enumerate(make_products(sellers[0], size) + make_products(sellers[1], size)):
+            order, _ = Order.objects.get_or_create(
+                cart=cart, seller=product.seller, customer=customer, complete=False
+            )
+            order.orderitem_set.create(product=product, quantity=1 + i % 3)
+        return cart
+    return _make_cart
+
+
+@pytest.fixture
+def cart_scenario(make_shopper, make_cart):
+    def build(size):
+        customer, client = make_shopper()
+        return client, make_cart(customer, size)
+    return build
+
+
+@pytest.mark.django_db
+class TestStoreQueryBudgets:
+    def test_product_list(self, assert_query_budget, make_seller, make_products):
+        def build(size):
+            cache.clear()
+            make_products(make_seller(), size)
+            return APIClient()
+
+        assert_query_budget(3, build, lambda client: client.get(reverse("product-list")))
+
+    def test_order_create(self, assert_query_budget, make_shopper, make_seller, make_products):
+        def build(size):
+            _, client = make_shopper()
+            products = make_products(make_seller(), size) + make_products(make_seller(), size)
+            return client, [{"product_id": str(p.pk), "quantity": 2} for p in products]
+
+        assert_query_budget(
+            22,
+            build,
+            lambda scenario: scenario[0].post(reverse("order-list"), {"items": scenario[1]}, format="json"),
+        )
+
+    def test_order_history_list(self, assert_query_budget, make_shopper, make_cart):
+        def build(size):
+            customer, client = make_shopper()
+            for _ in range(size):
+                cart = make_cart(customer, 1)
+                for order in cart.orders.all():
+                    order.mark_complete(transaction_id=uuid.uuid4())
+            return client
+
+        assert_query_budget(1, build, lambda client: client.get(reverse("order-list")))
+
+    def test_my_cart(self, assert_query_budget, cart_scenario):
+        assert_query_budget(
+            4, cart_scenario, lambda scenario: scenario[0].get(reverse("order-my-cart"))
+        )
+
+    def test_complete_order(self, assert_query_budget, cart_scenario):
+        assert_query_budget(
+            19,
+            cart_scenario,
+            lambda scenario: scenario[0].post(reverse("order-complete-order", args=[scenario[1].pk])),
+        )
+
+
+@pytest.mark.django_db
+class TestPaymentQueryBudgets:
+    @pytest.fixture
+    def pending_payment(self, cart_scenario, sequence):
+        def build(size):
+            client, cart = cart_scenario(size)
+            n = sequence()
+            transaction = Transaction.objects.create(
+                cart=cart,
+                phone="254712345678",
+                amount=Decimal("100.00"),
+                merchant_request_id=f"mr_{n}",
+                checkout_request_id=f"co_{n}",
+                status="PENDING",
+            )
+            transaction.orders.set(cart.orders.all())
+            return client, cart, transaction
+        return build
+
+    @patch("django_daraja.mpesa.core.MpesaClient.stk_push")
+    def test_stk_push(self, mock_stk_push, assert_query_budget, cart_scenario):
+        mock_stk_push.side_effect = lambda **kwargs: {
+            "ResponseCode": "0",
+            "MerchantRequestID": f"mr_{uuid.uuid4()}",
+            "CheckoutRequestID": f"co_{uuid.uuid4()}",
+            "CustomerMessage": "Success. Request accepted for processing",
+        }
+
+        def call(scenario):
+            client, cart = scenario
+            order = cart.orders.first()
+            return client.post(
+                reverse("api_stk_push"),
+                {"phone_number": "254712345678", "order_id": order.pk},
+                format="json",
+            )
+
+        assert_query_budget(12, cart_scenario, call)
+
+    @patch("payment.api_views.send_payment_receipt_email")
+    def test_callback(self, send_email_mock, assert_query_budget, pending_payment):
+        def call(scenario):
+            _, _, transaction = scenario
+            body = {
+                "Body": {
+                    "stkCallback": {
+                        "MerchantRequestID": transaction.merchant_request_id,
+                        "CheckoutRequestID": transaction.checkout_request_id,
+                        "ResultCode": 0,
+                        "ResultDesc": "The service request is processed successfully.",
+                        "CallbackMetadata": {
+                            "Item": [{"Name": "MpesaReceiptNumber", "Value": f"R{transaction.pk}"}]
+                        },
+                    }
+                }
+            }
+            return APIClient().post(
+                reverse("mpesa_stk_push_callback"), json.dumps(body), content_type="application/json"
+            )
+
+        assert_query_budget(12, pending_payment, call)
+
+    def test_status(self, assert_query_budget, pending_payment):
+        def call(scenario):
+            client, _, transaction = scenario
+            return client.get(reverse("api_payment_status"), {"transaction_id": transaction.pk})
+
+        assert_query_budget(2, pending_payment, call)
+
+
+@pytest.mark.django_db
+class TestSellerAndAuthQueryBudgets:
+    def test_seller_product_list(self, assert_query_budget, make_seller, make_products):
+        def build(size):
+            seller = make_seller()
+            make_products(seller, size)
+            client = APIClient()
+            client.force_authenticate(user=seller.user)
+            return client
+
+        assert_query_budget(2, build, lambda client: client.get(reverse("seller-products-list")))
+
+    def test_auth_user(self, assert_query_budget, make_seller, make_products):
+        def build(size):
+            seller = make_seller()
+            make_products(seller, size)
+            client = APIClient()
+            client.force_authenticate(user=seller.user)
+            return client
+
+        assert_query_budget(1, build, lambda client: client.get(reverse("rest_user_details")))
@@ -0,0 +1,127 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from sellers.models import Seller
+from store.models import Product, Review
+from store.ratings import reconcile_product_ratings
+
+User = get_user_model()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def seller(db):
+    user = User.objects.create_user(email="seller@example.com", password="sellerpass")
+    return Seller.objects.create(user=user, business_name="Review Seller", is_active=True)
+
+
+@pytest.fixture
+def product(seller):
+    return Product.objects.create(
+        seller=seller, name="Reviewed Product", price=Decimal("10.00"), stock=5
+    )
+
+
+@pytest.fixture
+def reviewers(db):
+    return [
+        User.objects.create_user(email=f"reviewer{i}@example.com", password="pass12345")
+        for i in range(3)
+    ]
+
+
+@pytest.mark.django_db
+def test_review_create_updates_aggregates(product, reviewers):
+    Review.objects.create(product=product, user=reviewers[0], rating=5)
+    Review.objects.create(product=product, user=reviewers[1], rating=2)
+    product.refresh_from_db()
+    assert product.reviews_count == 2
+    assert product.rating_sum == 7
+    assert product.rating == Decimal("3.50")
+
+
+@pytest.mark.django_db
+def test_review_edit_and_delete_adjust_aggregates(product, reviewers):
+    review = Review.objects.create(product=product, user=reviewers[0], rating=5)
+    Review.objects.create(product=product, user=reviewers[1], rating=3)
+
+    review = Review.objects.get(pk=review.pk)
+    review.rating = 1
+    review.save()
+    product.refresh_from_db()
+    assert product.rating_sum == 4
+    assert product.rating == Decimal("2.00")
+
+    review.delete()
+    product.refresh_from_db()
+    assert product.reviews_count == 1
+    assert product.rating == Decimal("3.00")
+
+    Review.objects.all().delete()
+    product.refresh_from_db()
+    assert product.reviews_count == 0
+    assert product.rating_sum == 0
+    assert product.rating == Decimal("0.00")
+
+
+@pytest.mark.django_db
+def test_reconcile_repairs_drift(product, reviewers):
+    Review.objects.create(product=product, user=reviewers[0], rating=4)
+    Review.objects.create(product=product, user=reviewers[1], rating=5)
+    # queryset.update() bypasses signals, leaving the aggregates stale
+    Review.objects.filter(user=reviewers[0]).update(rating=1)
+    Product.objects.filter(pk=product.pk).update(reviews_count=10)
+
+    assert reconcile_product_ratings() == 1
+    product.refresh_from_db()
+    assert product.reviews_count == 2
+    assert product.rating_sum == 6
+    assert product.rating == Decimal("3.00")
+    assert reconcile_product_ratings() == 0
+
+
+@pytest.mark.django_db
+def test_top_rated_listing(api_client, seller, reviewers):
+    low = Product.objects.create(seller=seller, name="Low", price=Decimal("1.00"))
+    high = Product.objects.create(seller=seller, name="High", price=Decimal("1.00"))
+    Product.objects.create(seller=seller, name="Unrated", price=Decimal("1.00"))
+    Review.objects.create(product=low, user=reviewers[0], rating=2)
+    Review.objects.create(product=high, user=reviewers[0], rating=5)
+
+    response = api_client.get(reverse("product-top-rated"))
+    assert response.status_code == 200
+    assert [p["name"] for p in response.data["results"]] == ["High", "Low"]
+
+
+@pytest.mark.django_db
+def test_user_can_review_product_once(api_client, product, reviewers):
+    api_client.force_authenticate(user=reviewers[0])
+    url = reverse("review-list")
+    response = api_client.post(url, {"product": product.id, "rating": 4}, format="json")
+    assert response.status_code == 201
+    response = api_client.post(url, {"product": product.id, "rating": 5}, format="json")
+    assert response.status_code == 400
+    product.refresh_from_db()
+    assert product.reviews_count == 1
+
+
+@pytest.mark.django_db
+def test_review_list_filters_by_product(api_client, product, reviewers):
+    Review.objects.create(product=product, user=reviewers[0], rating=4)
+    url = reverse("review-list")
+
+    response = api_client.get(url, {"product": product.id})
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 1
+
+    response = api_client.get(url, {"product": "abc"})
+    assert response.status_code == 400
+    assert "product" in response.data
@@ -0,0 +1,79 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from sellers.models import Seller
+from store.models import Product, ProductVariant
+
+User = get_user_model()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def seller(db):
+    user = User.objects.create_user(email="variants@example.com", password="sellerpass")
+    return Seller.objects.create(user=user, business_name="Variant Seller", is_active=True)
+
+
+@pytest.fixture
+def phone(seller):
+    product = Product.objects.create(
+        seller=seller, name="Phone", price=Decimal("500.00"), stock=0
+    )
+    ProductVariant.objects.create(
+        product=product, sku="PHONE-BLK-128", name="Black / 128GB", stock=4
+    )
+    ProductVariant.objects.create(
+        product=product,
+        sku="PHONE-BLK-64",
+        name="Black / 64GB",
+        price_override=Decimal("420.00"),
+        stock=6,
+    )
+    return product
+
+
+@pytest.mark.django_db
+def test_listing_aggregates_variants(api_client, seller, phone):
+    Product.objects.create(seller=seller, name="Cable", price=Decimal("5.00"), stock=30)
+
+    response = api_client.get(reverse("product-list"))
+    assert response.status_code == 200
+    rows = {row["name"]: row for row in response.data["results"]}
+    assert rows["Phone"]["min_price"] == "420.00"
+    assert rows["Phone"]["total_stock"] == 10
+    assert "variants" not in rows["Phone"]
+    # products without variants fall back to their own price and stock
+    assert rows["Cable"]["min_price"] == "5.00"
+    assert rows["Cable"]["total_stock"] == 30
+
+
+@pytest.mark.django_db
+def test_detail_includes_variants(api_client, phone):
+    response = api_client.get(reverse("product-detail", kwargs={"pk": phone.pk}))
+    assert response.status_code == 200
+    variants = {v["sku"]: v for v in response.data["variants"]}
+    assert variants["PHONE-BLK-128"]["price"] == "500.00"
+    assert variants["PHONE-BLK-64"]["price"] == "420.00"
+
+
+@pytest.mark.django_db
+def test_sku_lookup(api_client, phone, django_assert_num_queries):
+    url = reverse("variant-detail", kwargs={"sku": "PHONE-BLK-64"})
+    with django_assert_num_queries(1):
+        response = api_client.get(url)
+    assert response.status_code == 200
+    assert response.data["product_id"] == phone.pk
+    assert response.data["product_name"] == "Phone"
+    assert response.data["price"] == "420.00"
+    assert response.data["stock"] == 6
+
+    missing = api_client.get(reverse("variant-detail", kwargs={"sku": "NOPE"}))
+    assert missing.status_code == 404
@@ -1,5 +1,6 @@
 import json
 
+from .customers import get_request_customer
 from .models import Customer, Order, OrderItem, Product
 
 
@@ -47,10 +48,7 @@ def cookieCart(request):
 
 def cartData(request):
     if request.user.is_authenticated:
-        # Get or create customer profile for authenticated users
-        customer, created = Customer.objects.get_or_create(
-            user=request.user, email=request.user.email
-        )
+        customer = get_request_customer(request)
         order, created = Order.objects.get_or_create(customer=customer, complete=False)
         items = order.orderitem_set.select_related("product").all()
         cartItems = order.get_cart_items
@@ -7,6 +7,7 @@ from django.http import JsonResponse
 from django.shortcuts import render
 
 from store.models import *
+from store.customers import get_request_customer
 from store.utils import cookieCart, cartData
 from emails.services import send_order_confirmation
 import logging
@@ -59,7 +60,7 @@ def updateItem(request):
     print("Action:", action)
     print("Product:", productId)
 
-    customer = request.user.customer
+    customer = get_request_customer(request)
     product = Product.objects.get(id=productId)
     order, created = Order.objects.get_or_create(customer=customer, complete=False)
 
@@ -84,7 +85,7 @@ def processOrder(request):
     data = json.loads(request.body)
 
     if request.user.is_authenticated:
-        customer = request.user.customer
+        customer = get_request_customer(request)
         order, created = Order.objects.get_or_create(customer=customer, complete=False)
     else:
         print("User is not logged in")
@@ -115,11 +116,13 @@ def processOrder(request):
             )
 
     total = float(data["form"]["total"])
-    order.transaction_id = transaction_id
+    items = list(order.orderitem_set.select_related("product"))
 
-    if total == order.get_cart_total:
-        order.complete = True
-    order.save()
+    if total == float(sum(item.get_total for item in items)):
+        order.mark_complete(transaction_id=transaction_id, items=items)
+    else:
+        order.transaction_id = transaction_id
+        order.save()
 
     # Send order confirmation email when order is completed
     if order.complete:
@@ -127,21 +130,12 @@ def processOrder(request):
             customer.user.email if customer.user else None
         )
         if recipient_email:
-            send_order_confirmation(recipient_email, {
-                'id': order.id,
-                'customer_name': customer.name if customer else 'Guest',
-                'get_cart_total': str(order.get_cart_total),
-                'items': [{
-                    'product_name': item.product.name,
-                    'quantity': item.quantity,
-                    'get_total': str(item.get_total)
-                } for item in order.orderitem_set.all()]
-            })
+            send_order_confirmation(recipient_email, order.snapshot)
         logger.info(
             f"Order {order.id} completed and confirmation email sent to {recipient_email}"
         )
 
-    if order.shipping == True:
+    if any(item.product and not item.product.digital for item in items):
         ShippingAddress.objects.create(
             customer=customer,
             order=order,
@@ -4,12 +4,18 @@ import logging
 from allauth.account.adapter import DefaultAccountAdapter
 from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
 from allauth.socialaccount.models import SocialApp
-from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.exceptions import MultipleObjectsReturned
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from store.cache import get_cache_version
 
 logger = logging.getLogger(__name__)
 
+SOCIAL_APPS_NAMESPACE = "social_apps"
+# (provider, site_id, client_id) -> (namespace version, SocialApp)
+_resolved_apps = {}
+
 class CustomAccountAdapter(DefaultAccountAdapter):
     def clean_username(self):
         # Prevent allauth from trying to create a username
@@ -41,60 +47,42 @@ class CustomAccountAdapter(DefaultAccountAdapter):
 class DebugSocialAccountAdapter(DefaultSocialAccountAdapter):
     def get_app(self, request, provider, client_id=None):
         """
-        Overrides the default get_app to add detailed debugging and resolve the MultipleObjectsReturned issue.
+        Returns the single database SocialApp for the provider on the current
+        site (optionally matching client_id), raising DoesNotExist or
+        MultipleObjectsReturned otherwise. Resolved apps are kept in memory per
+        process and dropped when a SocialApp changes (see users.signals), so
+        repeated logins do no app lookup queries.
         """
-        logger.info(f"[ADAPTER] get_app called for provider: {provider}, client_id: {client_id}")
-
-        try:
-            # Start with a base queryset for the provider on the current site
-            apps = SocialApp.objects.on_site(request).filter(provider=provider)
-            logger.info(f"[ADAPTER] Found {apps.count()} app(s) for provider '{provider}' on the current site.")
-
-            if client_id:
-                apps = apps.filter(client_id=client_id)
-                logger.info(f"[ADAPTER] Filtered to {apps.count()} app(s) with client_id '{client_id}'.")
-
-            if apps.count() == 0:
-                logger.error(f"[ADAPTER] SocialApp.DoesNotExist for provider '{provider}' and client_id '{client_id}'. Please check your Django admin.")
-                raise SocialApp.DoesNotExist # Or ObjectDoesNotExist for clarity with allauth
+        site_id = get_current_site(request).pk if request else None
+        key = (provider, site_id, client_id)
+        version = get_cache_version(SOCIAL_APPS_NAMESPACE)
+        cached = _resolved_apps.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
 
-            if apps.count() > 1:
-                # If multiple apps are found even after site and provider filtering,
-                # it's still an issue that needs to be addressed in the admin.
-                # But for the purpose of getting one, we can return the first,
-                # or raise the error more definitively from here.
-                # Given allauth expects unique, raising here is better than silently picking one.
-                logger.error(f"[ADAPTER] SocialApp.MultipleObjectsReturned for provider '{provider}' and client_id '{client_id}'. Found {apps.count()} apps. There should be only one SocialApp for this provider on this site.")
-                raise MultipleObjectsReturned # Explicitly raise here if you find multiple
-            
-            # If exactly one app is found after filtering, return it.
-            if apps.count() == 1:
-                logger.info(f"[ADAPTER] Successfully retrieved single app for provider '{provider}'.")
-                return apps.first() # Return the single app found by your query
+        apps = SocialApp.objects.filter(provider=provider)
+        if site_id is not None:
+            apps = apps.filter(sites__id=site_id)
+        if client_id:
+            apps = apps.filter(client_id=client_id)
+        apps = list(apps[:2])
 
-            # Fallback to super() if for some reason the above logic doesn't return,
-            # though ideally the above covers all expected scenarios (0, 1, >1).
-            # This line might not be strictly necessary with the above, but kept for safety.
-            return super().get_app(request, provider, client_id=client_id)
+        if not apps:
+            logger.error(f"[ADAPTER] No SocialApp for provider '{provider}' and client_id '{client_id}'. Please check your Django admin.")
+            raise SocialApp.DoesNotExist
+        if len(apps) > 1:
+            logger.error(f"[ADAPTER] Multiple SocialApps for provider '{provider}' and client_id '{client_id}'. There should be only one SocialApp for this provider on this site.")
+            raise MultipleObjectsReturned
 
-        except ObjectDoesNotExist as e: # Catch ObjectDoesNotExist from your raise or super()
-            logger.error(f"[ADAPTER] Final catch: SocialApp.DoesNotExist for provider '{provider}'. Ensure a SocialApp is configured in the Django admin.")
-            raise e
-        except MultipleObjectsReturned as e: # Catch MultipleObjectsReturned from your raise or super()
-            logger.error(f"[ADAPTER] Final catch: SocialApp.MultipleObjectsReturned for provider '{provider}'. Please remove duplicate SocialApp entries in the Django admin.")
-            raise e
-        except Exception as e:
-            logger.error(f"[ADAPTER] An unexpected error occurred in get_app: {e}", exc_info=True)
-            raise e
+        logger.debug(f"[ADAPTER] Resolved SocialApp for provider '{provider}'.")
+        _resolved_apps[key] = (version, apps[0])
+        return apps[0]
 
     def sociallogin(self, request, sociallogin):
-        logger.info(f"[ADAPTER] sociallogin called for user: {sociallogin.user.email}")
-        logger.info(f"[ADAPTER] SocialLogin instance: {sociallogin}")
+        # Token values are credentials and are never logged.
+        logger.debug(f"[ADAPTER] sociallogin called for user: {sociallogin.user.email}")
         if sociallogin.token:
-            logger.info(f"[ADAPTER] SocialToken exists: {sociallogin.token}")
-            logger.info(f"[ADAPTER] SocialToken.token: {sociallogin.token.token}")
-            logger.info(f"[ADAPTER] SocialToken.token_secret: {sociallogin.token.token_secret}")
-            logger.info(f"[ADAPTER] SocialToken.expires_at: {sociallogin.token.expires_at}")
+            logger.debug(f"[ADAPTER] SocialToken present, expires at {sociallogin.token.expires_at}")
         else:
             logger.warning("[ADAPTER] SocialToken is None or empty.")
         return super().sociallogin(request, sociallogin)
@@ -0,0 +1,24 @@
+# ecommerce/users/backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class PhoneNumberBackend(ModelBackend):
+    """
+    Authenticates `authenticate(phone_number=..., password=...)` with a single
+    lookup on the unique phone_number index. Requests without a phone number
+    are left to the other backends.
+    """
+
+    def authenticate(self, request, phone_number=None, password=None, **kwargs):
+        if not phone_number or password is None:
+            return None
+        UserModel = get_user_model()
+        user = UserModel._default_manager.filter(phone_number=phone_number).first()
+        if user is None:
+            # Hash anyway so unknown numbers take as long as wrong passwords.
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,107 @@
+# ecommerce/users/hashers.py
+"""
+Password hashers.
+
+New passwords are hashed with Argon2 using the ARGON2_* settings; existing
+PBKDF2 hashes still verify and are upgraded on the next successful login.
+
+Hashing is the most expensive thing the auth endpoints do, and it runs on the
+same workers that serve the catalog. With PASSWORD_HASHING_POOL_SIZE > 0 both
+hashers run on a small per-process thread pool (argon2-cffi and hashlib release
+the GIL while hashing), so at most that many hashes compete with other requests
+for CPU. Callers beyond the pool and its PASSWORD_HASHING_QUEUE_SIZE backlog wait
+up to PASSWORD_HASHING_QUEUE_TIMEOUT seconds and then fail with
+PasswordHashingBusy instead of piling up. The hashers also run outside DRF
+(admin login, allauth forms), so the exception is a plain one;
+users.middleware.PasswordHashingBusyMiddleware turns it into a 503 everywhere.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing pool and its backlog are full."""
+
+
+class BoundedHashingPool:
+    """A thread pool that admits at most `workers + queue_size` callers at once."""
+
+    def __init__(self, workers, queue_size):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hashing")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._local = threading.local()
+
+    def _call(self, func, args, kwargs):
+        self._local.inside = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._local.inside = False
+
+    def run(self, func, *args, timeout=None, **kwargs):
+        # Hashers call each other (PBKDF2's verify() calls encode()); nested calls
+        # run inline instead of waiting on the pool they are already using.
+        if getattr(self._local, "inside", False):
+            return func(*args, **kwargs)
+        if not self._slots.acquire(timeout=timeout):
+            raise PasswordHashingBusy()
+        try:
+            return self._executor.submit(self._call, func, args, kwargs).result()
+        finally:
+            self._slots.release()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """Returns this process's pool, or None when hashing runs inline."""
+    global _pool
+    size = getattr(settings, "PASSWORD_HASHING_POOL_SIZE", 0)
+    if not size:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BoundedHashingPool(size, getattr(settings, "PASSWORD_HASHING_QUEUE_SIZE", 0))
+    return _pool
+
+
+def run_hashing(func, *args, **kwargs):
+    pool = get_hashing_pool()
+    if pool is None:
+        return func(*args, **kwargs)
+    timeout = getattr(settings, "PASSWORD_HASHING_QUEUE_TIMEOUT", 2)
+    return pool.run(func, *args, timeout=timeout, **kwargs)
+
+
+class BoundedHashingMixin:
+    """Runs encode() and verify() through the hashing pool."""
+
+    def encode(self, password, salt, *args, **kwargs):
+        return run_hashing(super().encode, password, salt, *args, **kwargs)
+
+    def verify(self, password, encoded):
+        return run_hashing(super().verify, password, encoded)
+
+
+class TunedArgon2PasswordHasher(BoundedHashingMixin, Argon2PasswordHasher):
+    """
+    Argon2id with its cost taken from the ARGON2_* settings each time params()
+    is called, so both hashing and must_update() follow the current settings.
+    """
+
+    def params(self):
+        params = super().params()
+        params.time_cost = getattr(settings, "ARGON2_TIME_COST", self.time_cost)
+        params.memory_cost = getattr(settings, "ARGON2_MEMORY_COST", self.memory_cost)
+        params.parallelism = getattr(settings, "ARGON2_PARALLELISM", self.parallelism)
+        return params
+
+
+class BoundedPBKDF2PasswordHasher(BoundedHashingMixin, PBKDF2PasswordHasher):
+    """Verifies legacy PBKDF2 hashes through the same pool until they are upgraded."""
@@ -0,0 +1,59 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from ecommerce.authentication import StatelessReadAuthenticationMixin
+from users.serializers import CachedBlacklistTokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-request authentication: default chain vs JWT claims vs none"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=2000)
+        parser.add_argument("--email", help="User to issue the token for (default: first active user)")
+
+    def _measure(self, authenticators, header, iterations):
+        factory = RequestFactory()
+
+        def authenticate():
+            request = Request(
+                factory.get("/api/v1/orders/", HTTP_AUTHORIZATION=header),
+                authenticators=[auth() for auth in authenticators],
+            )
+            return request.user
+
+        authenticate()  # warm up
+        with CaptureQueriesContext(connection) as queries:
+            authenticate()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            authenticate()
+        micros = (time.perf_counter() - start) / iterations * 1_000_000
+        return micros, len(queries)
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.filter(is_active=True)
+        if options["email"]:
+            users = users.filter(email=options["email"])
+        user = users.order_by("pk").first()
+        if user is None:
+            raise CommandError("No active user to issue a token for.")
+
+        token = CachedBlacklistTokenObtainPairSerializer.get_token(user).access_token
+        bearer = f"Bearer {token}"
+        cases = {
+            "default chain, bearer": (api_settings.DEFAULT_AUTHENTICATION_CLASSES, bearer),
+            "default chain, anonymous": (api_settings.DEFAULT_AUTHENTICATION_CLASSES, ""),
+            "JWT claims, bearer": (StatelessReadAuthenticationMixin.read_authentication_classes, bearer),
+            "catalog (no auth)": ([], ""),
+        }
+        for label, (authenticators, header) in cases.items():
+            micros, queries = self._measure(authenticators, header, options["iterations"])
+            self.stdout.write(f"  {label:<26} {micros:8.1f} µs/request  {queries} queries")
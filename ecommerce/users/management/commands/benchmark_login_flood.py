@@ -0,0 +1,79 @@
+import statistics
+import threading
+import time
+
+from django.contrib.auth.hashers import check_password, get_hasher, make_password
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from store.api_views import ProductViewSet
+from users import hashers
+from users.hashers import PasswordHashingBusy
+
+
+class Command(BaseCommand):
+    help = "Measure catalog latency while other threads flood password verification"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--flood-threads", type=int, default=8)
+        parser.add_argument("--duration", type=float, default=3.0, help="Seconds per scenario")
+        parser.add_argument("--pool-size", type=int, default=1)
+        parser.add_argument("--hasher", default=None, help="Hasher algorithm (default: PASSWORD_HASHERS[0])")
+
+    def _scenario(self, flood_threads, duration, encoded):
+        view = ProductViewSet.as_view({"get": "list"})
+        factory = APIRequestFactory()
+        stop = threading.Event()
+        counts = {"hashes": 0, "rejected": 0}
+        lock = threading.Lock()
+
+        def flood():
+            while not stop.is_set():
+                try:
+                    check_password("flood-password", encoded)
+                    key = "hashes"
+                except PasswordHashingBusy:
+                    key = "rejected"
+                with lock:
+                    counts[key] += 1
+
+        threads = [threading.Thread(target=flood, daemon=True) for _ in range(flood_threads)]
+        for thread in threads:
+            thread.start()
+
+        latencies = []
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            view(factory.get("/api/v1/products/")).render()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        stop.set()
+        for thread in threads:
+            thread.join()
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) >= 20 else latencies[-1]
+        return statistics.median(latencies), p95, counts["hashes"] / duration, counts["rejected"]
+
+    def handle(self, *args, **options):
+        algorithm = options["hasher"] or get_hasher().algorithm
+        encoded = make_password("flood-password", hasher=algorithm)
+        flood_threads, duration = options["flood_threads"], options["duration"]
+        pool_size = options["pool_size"]
+
+        scenarios = [
+            ("no flood", 0, 0),
+            ("flood, inline hashing", flood_threads, 0),
+            (f"flood, pool of {pool_size}", flood_threads, pool_size),
+        ]
+        self.stdout.write(self.style.MIGRATE_HEADING(f"hasher: {algorithm}"))
+        for label, threads, size in scenarios:
+            hashers._pool = None
+            with override_settings(PASSWORD_HASHING_POOL_SIZE=size, PASSWORD_HASHING_QUEUE_SIZE=threads):
+                p50, p95, rate, rejected = self._scenario(threads, duration, encoded)
+            self.stdout.write(
+                f"  {label:<24} catalog p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  "
+                f"{rate:6.1f} hashes/s  {rejected} rejected"
+            )
+        hashers._pool = None
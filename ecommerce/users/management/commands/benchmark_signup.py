@@ -0,0 +1,46 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from users.serializers import CustomRegisterSerializer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark signup through CustomRegisterSerializer (rolled back afterwards)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        run = uuid.uuid4().hex[:8]
+
+        def signup(i):
+            serializer = CustomRegisterSerializer(
+                data={"email": f"bench-{run}-{i}@example.com", "password": "Bench-Pass-123"}
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        try:
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as queries:
+                    signup(0)
+                start = time.perf_counter()
+                for i in range(1, iterations + 1):
+                    signup(i)
+                elapsed = time.perf_counter() - start
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(f"  queries per signup  {len(queries)}")
+        self.stdout.write(f"  ms per signup       {elapsed / iterations * 1000:8.1f}")
+        self.stdout.write(f"  signups per second  {iterations / elapsed:8.1f}")
@@ -0,0 +1,33 @@
+# ecommerce/users/middleware.py
+from django.http import HttpResponse, JsonResponse
+from django.utils.translation import gettext as _
+
+from .hashers import PasswordHashingBusy
+
+# Seconds a client should wait before retrying when the hashing pool is full.
+RETRY_AFTER_SECONDS = 5
+
+
+class PasswordHashingBusyMiddleware:
+    """
+    Answers 503 with Retry-After when password hashing is over capacity (see
+    users.hashers), for API views as well as admin and allauth form logins.
+    API requests get DRF's usual {"detail": ...} body.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, PasswordHashingBusy):
+            return None
+        detail = _("Too many sign-in requests are being processed. Please try again shortly.")
+        if request.path.startswith("/api/"):
+            response = JsonResponse({"detail": detail}, status=503)
+        else:
+            response = HttpResponse(detail, status=503, content_type="text/plain; charset=utf-8")
+        response["Retry-After"] = str(RETRY_AFTER_SECONDS)
+        return response
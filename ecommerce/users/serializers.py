@@ -1,12 +1,15 @@
 # ecommerce/users/serializers.py
 from django.contrib.auth import get_user_model, authenticate
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from allauth.account.utils import setup_user_email
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 
 from .models import User, UserProfile
+from .tokens import CachedBlacklistRefreshToken
 from sellers.models import Seller
+from store.models import Customer
 
 User = get_user_model()
 
@@ -44,12 +47,8 @@ class CustomLoginSerializer(serializers.Serializer):
             # Authenticate using email
             user = authenticate(request=self.context.get('request'), email=email, password=password)
         elif phone_number:
-            # Find user by phone number, then authenticate using their email
-            try:
-                user_obj = User.objects.get(phone_number=phone_number)
-                user = authenticate(request=self.context.get('request'), email=user_obj.email, password=password)
-            except User.DoesNotExist:
-                pass  # User with this phone number does not exist
+            # Handled by users.backends.PhoneNumberBackend in one lookup
+            user = authenticate(request=self.context.get('request'), phone_number=phone_number, password=password)
 
         if not user:
             msg = _('Unable to log in with provided credentials.')
@@ -80,12 +79,7 @@ class CustomRegisterSerializer(serializers.ModelSerializer):
         if email and phone_number:
             raise serializers.ValidationError(_("Please provide either an email or a phone number for registration, not both."))
 
-        if email and User.objects.filter(email=email).exists():
-            raise serializers.ValidationError(_("A user with that email already exists."))
-
-        if phone_number and User.objects.filter(phone_number=phone_number).exists():
-            raise serializers.ValidationError(_("A user with that phone number already exists."))
-
+        # Uniqueness is left to the database constraints; see create().
         return data
 
     def create(self, validated_data):
@@ -100,8 +94,17 @@ class CustomRegisterSerializer(serializers.ModelSerializer):
         if phone_number and not email:
             validated_data['email'] = None
 
-        user = User.objects.create_user(**validated_data)
-        UserProfile.objects.create(user=user)
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(**validated_data)
+                UserProfile.objects.create(user=user)
+                # Created up front so cart and order requests never have to write one.
+                Customer.objects.create(user=user, email=user.email)
+        except IntegrityError:
+            # Only one identifier is accepted, so it is the one that clashed.
+            if email:
+                raise serializers.ValidationError(_("A user with that email already exists."))
+            raise serializers.ValidationError(_("A user with that phone number already exists."))
         return user
 
 
@@ -147,21 +150,25 @@ class UserDetailsSerializer(serializers.ModelSerializer):
         
         return instance
 
-    def get_is_seller(self, obj):
-        """Checks if the user is a seller."""
-        return hasattr(obj, 'seller_profile') and obj.seller_profile.is_active
-
-    def get_seller_profile(self, obj):
-        """Returns the seller profile of the user."""
-        from sellers.serializers import SellerSerializer
+    @staticmethod
+    def _seller(obj):
+        """The user's Seller or None; free when seller_profile is select_related."""
         try:
-            seller_instance = obj.seller_profile
-            if seller_instance:
-                return SellerSerializer(seller_instance).data
-            return None
+            return obj.seller_profile
         except Seller.DoesNotExist:
             return None
 
+    def get_is_seller(self, obj):
+        """Checks if the user is an active seller."""
+        seller = self._seller(obj)
+        return bool(seller and seller.is_active)
+
+    def get_seller_profile(self, obj):
+        """Returns the user's seller summary, or None."""
+        from sellers.serializers import SellerSummarySerializer
+        seller = self._seller(obj)
+        return SellerSummarySerializer(seller).data if seller else None
+
 
 class PasswordChangeSerializer(serializers.Serializer):
     """Serializer for password change."""
@@ -204,4 +211,14 @@ class EmailChangeSerializer(serializers.Serializer):
             user.save()
             setup_user_email(request, user, [])
 
-        return user
\ No newline at end of file
+        return user
+
+
+class CachedBlacklistTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issues refresh tokens checked against the cache-backed blacklist (users.tokens)."""
+    token_class = CachedBlacklistRefreshToken
+
+
+class CachedBlacklistTokenRefreshSerializer(TokenRefreshSerializer):
+    """Rotates refresh tokens against the cache-backed blacklist (users.tokens)."""
+    token_class = CachedBlacklistRefreshToken
@@ -0,0 +1,55 @@
+# ecommerce/users/signals.py
+from allauth.socialaccount.models import SocialApp
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from sellers.models import Seller
+from store.cache import bump_cache_version
+
+from .adapters import SOCIAL_APPS_NAMESPACE
+from .models import User, UserProfile
+from .tokens import revoke_user_tokens
+from .user_details import invalidate_user_details
+
+
+@receiver(post_save, sender=SocialApp)
+@receiver(post_delete, sender=SocialApp)
+@receiver(m2m_changed, sender=SocialApp.sites.through)
+def invalidate_social_apps(sender, **kwargs):
+    """Makes every process re-resolve SocialApps after a change commits."""
+    transaction.on_commit(lambda: bump_cache_version(SOCIAL_APPS_NAMESPACE))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_details_on_user_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Drops the cached details when a user is saved or deleted; last_login
+    updates on login are not part of them.
+    """
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_user_details(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_on_deactivation(sender, instance, **kwargs):
+    """An inactive user's outstanding access tokens stop authenticating reads."""
+    if not instance.is_active:
+        user_id = instance.pk
+        transaction.on_commit(lambda: revoke_user_tokens(user_id))
+
+
+@receiver(post_delete, sender=User)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: revoke_user_tokens(user_id))
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+@receiver(post_save, sender=Seller)
+@receiver(post_delete, sender=Seller)
+def invalidate_details_on_related_change(sender, instance, **kwargs):
+    invalidate_user_details(instance.user_id)
@@ -10,6 +10,14 @@ def api_client():
     return APIClient()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Throttle counters and the token blacklist live in the cache.
+    from django.core.cache import cache
+
+    cache.clear()
+
+
 @pytest.fixture
 def create_user():
     def _create_user(email, password):
@@ -85,3 +93,291 @@ def test_user_details_unauthenticated(api_client):
     url = "/api/v1/auth/user/"
     response = api_client.get(url)
     assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_jwt_claims_authenticate_reads_without_user_query(api_client, create_user, django_assert_num_queries):
+    from sellers.models import Seller
+    from users.serializers import CachedBlacklistTokenObtainPairSerializer
+
+    user = create_user("claims@example.com", "password123")
+    Seller.objects.create(user=user, business_name="Claims Shop")
+    token = CachedBlacklistTokenObtainPairSerializer.get_token(user).access_token
+    # Only the user id is carried; roles are read from the database when needed.
+    assert "seller_id" not in token
+    assert "is_staff" not in token
+
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    # Only the history page is read; the user comes from the token.
+    with django_assert_num_queries(1):
+        response = api_client.get("/api/v1/orders/")
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_claims_user_reads_roles_from_the_database(create_user):
+    from ecommerce.authentication import ClaimsUser
+    from users.serializers import CachedBlacklistTokenObtainPairSerializer
+
+    user = create_user("demoted@example.com", "password123")
+    user.is_staff = True
+    user.save(update_fields=["is_staff"])
+    token = CachedBlacklistTokenObtainPairSerializer.get_token(user).access_token
+    user.is_staff = False
+    user.save(update_fields=["is_staff"])
+
+    # A role change takes effect before the access token expires.
+    assert ClaimsUser(token).is_staff is False
+
+
+@pytest.mark.django_db
+def test_catalog_reads_skip_authentication(api_client):
+    api_client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+    assert api_client.get("/api/v1/products/").status_code == 200
+    assert api_client.get("/api/v1/orders/").status_code == 403
+
+
+@pytest.mark.django_db
+def test_rotated_refresh_token_cannot_be_reused(api_client, create_user):
+    from users.serializers import CachedBlacklistTokenObtainPairSerializer
+
+    user = create_user("rotate@example.com", "password123")
+    refresh = str(CachedBlacklistTokenObtainPairSerializer.get_token(user))
+
+    response = api_client.post("/api/v1/auth/token/refresh/", {"refresh": refresh}, format="json")
+    assert response.status_code == 200
+    assert response.data["refresh"] != refresh
+
+    response = api_client.post("/api/v1/auth/token/refresh/", {"refresh": refresh}, format="json")
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_logout_revokes_refresh_token(api_client, create_user):
+    from users.serializers import CachedBlacklistTokenObtainPairSerializer
+
+    user = create_user("logout@example.com", "password123")
+    refresh = str(CachedBlacklistTokenObtainPairSerializer.get_token(user))
+
+    response = api_client.post("/api/v1/auth/logout/", {"refresh": refresh}, format="json")
+    assert response.status_code == 200
+
+    response = api_client.post("/api/v1/auth/token/refresh/", {"refresh": refresh}, format="json")
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_social_app_resolved_once_per_process(rf, django_assert_num_queries, django_capture_on_commit_callbacks):
+    from allauth.socialaccount.models import SocialApp
+    from django.contrib.sites.models import Site
+
+    from users.adapters import DebugSocialAccountAdapter
+
+    with django_capture_on_commit_callbacks(execute=True):
+        app = SocialApp.objects.create(provider="google", name="Google", client_id="cid", secret="s")
+        app.sites.add(Site.objects.get_current())
+    adapter = DebugSocialAccountAdapter()
+    request = rf.get("/")
+
+    assert adapter.get_app(request, "google") == app
+    with django_assert_num_queries(0):
+        assert adapter.get_app(request, "google") == app
+
+    with django_capture_on_commit_callbacks(execute=True):
+        app.client_id = "rotated"
+        app.save()
+    assert adapter.get_app(request, "google").client_id == "rotated"
+
+
+@pytest.mark.django_db
+def test_user_registration_duplicate_email(api_client, create_user):
+    create_user("taken@example.com", "password123")
+    url = "/api/v1/auth/registration/"
+    response = api_client.post(url, {"email": "taken@example.com", "password": "newpass123"}, format="json")
+    assert response.status_code == 400
+    assert "already exists" in str(response.data)
+    assert User.objects.filter(email="taken@example.com").count() == 1
+
+
+@pytest.mark.django_db
+def test_user_login_with_phone_number(api_client):
+    User.objects.create_user(phone_number="254700000001", password="phonepass123")
+    url = "/api/v1/auth/login/"
+    response = api_client.post(url, {"phone_number": "254700000001", "password": "phonepass123"}, format="json")
+    assert response.status_code == 200
+    response = api_client.post(url, {"phone_number": "254700000001", "password": "wrongpass"}, format="json")
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_login_throttled_per_ip(api_client, create_user, monkeypatch):
+    from users.throttles import LoginRateThrottle
+
+    monkeypatch.setattr(LoginRateThrottle, "rate", "2/min", raising=False)
+    create_user("flood@example.com", "floodpass123")
+    url = "/api/v1/auth/login/"
+    data = {"email": "flood@example.com", "password": "wrongpass"}
+    assert api_client.post(url, data, format="json").status_code == 400
+    assert api_client.post(url, data, format="json").status_code == 400
+    assert api_client.post(url, data, format="json").status_code == 429
+
+
+@pytest.mark.django_db
+def test_login_throttle_ignores_spoofed_forwarded_for(api_client, create_user, monkeypatch):
+    from users.throttles import LoginRateThrottle
+
+    monkeypatch.setattr(LoginRateThrottle, "rate", "2/min", raising=False)
+    create_user("spoof@example.com", "spoofpass123")
+    url = "/api/v1/auth/login/"
+    data = {"email": "spoof@example.com", "password": "wrongpass"}
+    # nginx appends the real client address to whatever the client sent.
+    statuses = [
+        api_client.post(url, data, format="json", HTTP_X_FORWARDED_FOR=f"10.0.0.{i}, 203.0.113.7").status_code
+        for i in range(3)
+    ]
+    assert statuses == [400, 400, 429]
+
+
+def test_hashing_pool_rejects_callers_beyond_capacity():
+    import threading
+
+    from users.hashers import BoundedHashingPool, PasswordHashingBusy
+
+    pool = BoundedHashingPool(workers=1, queue_size=0)
+    started, release = threading.Event(), threading.Event()
+    worker = threading.Thread(target=pool.run, args=(lambda: (started.set(), release.wait()),))
+    worker.start()
+    started.wait()
+    with pytest.raises(PasswordHashingBusy):
+        pool.run(lambda: None, timeout=0.01)
+    release.set()
+    worker.join()
+    assert pool.run(lambda: 42) == 42
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url, data", [
+    ("/api/v1/auth/login/", {"email": "busy@example.com", "password": "busypass123"}),
+    ("/admin/login/", {"username": "busy@example.com", "password": "busypass123"}),
+])
+def test_full_hashing_pool_answers_503(client, create_user, monkeypatch, settings, url, data):
+    from users import hashers
+
+    settings.PASSWORD_HASHERS = ["users.hashers.BoundedPBKDF2PasswordHasher"]
+    User.objects.create_user(email="busy@example.com", password="busypass123", is_staff=True)
+
+    def busy(*args, **kwargs):
+        raise hashers.PasswordHashingBusy()
+
+    monkeypatch.setattr(hashers, "run_hashing", busy)
+    response = client.post(url, data)
+    assert response.status_code == 503
+    assert response["Retry-After"]
+
+
+def test_argon2_cost_follows_settings(settings):
+    pytest.importorskip("argon2")
+    from users.hashers import TunedArgon2PasswordHasher
+
+    hasher = TunedArgon2PasswordHasher()
+    settings.PASSWORD_HASHING_POOL_SIZE = 0
+    settings.ARGON2_TIME_COST = 1
+    settings.ARGON2_MEMORY_COST = 8192
+    settings.ARGON2_PARALLELISM = 1
+    encoded = hasher.encode("password123", hasher.salt())
+    assert "m=8192,t=1,p=1" in encoded
+    assert hasher.verify("password123", encoded)
+    assert not hasher.must_update(encoded)
+
+    settings.ARGON2_TIME_COST = 2
+    assert hasher.must_update(encoded)
+
+
+def test_pbkdf2_verifies_through_single_worker_pool(monkeypatch, settings):
+    from users import hashers
+
+    settings.PASSWORD_HASHING_POOL_SIZE = 1
+    monkeypatch.setattr(hashers, "_pool", hashers.BoundedHashingPool(workers=1, queue_size=0))
+    hasher = hashers.BoundedPBKDF2PasswordHasher()
+    # verify() calls encode() internally; the nested call must not wait on the pool.
+    encoded = hasher.encode("secret-pass", hasher.salt(), iterations=1000)
+    assert hasher.verify("secret-pass", encoded)
+    assert not hasher.verify("wrong-pass", encoded)
+
+
+@pytest.mark.django_db
+def test_seller_user_details_cached_with_etag(api_client, create_user, django_assert_num_queries, django_capture_on_commit_callbacks):
+    from sellers.models import Seller
+    from users.serializers import CachedBlacklistTokenObtainPairSerializer
+
+    user = create_user("sellerdetails@example.com", "password123")
+    with django_capture_on_commit_callbacks(execute=True):
+        Seller.objects.create(user=user, business_name="Details Shop", is_active=True)
+    api_client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {CachedBlacklistTokenObtainPairSerializer.get_token(user).access_token}"
+    )
+    url = "/api/v1/auth/user/"
+
+    response = api_client.get(url)
+    assert response.status_code == 200
+    assert response.data["is_seller"] is True
+    assert response.data["seller_profile"]["business_name"] == "Details Shop"
+    etag = response["ETag"]
+
+    with django_assert_num_queries(0):
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.first_name = "Renamed"
+        user.save()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data["first_name"] == "Renamed"
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_user_details_rejects_token_of_deleted_user(api_client, create_user):
+    from users.serializers import CachedBlacklistTokenObtainPairSerializer
+
+    user = create_user("deleted@example.com", "password123")
+    api_client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {CachedBlacklistTokenObtainPairSerializer.get_token(user).access_token}"
+    )
+    user.delete()
+
+    response = api_client.get("/api/v1/auth/user/")
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_deleting_user_drops_cached_details(create_user, django_capture_on_commit_callbacks):
+    from django.core.cache import cache
+
+    from users.user_details import _cache_key, get_user_details
+
+    user = create_user("gone@example.com", "password123")
+    get_user_details(user.pk)
+    user_id = user.pk
+    with django_capture_on_commit_callbacks(execute=True):
+        user.delete()
+
+    assert cache.get(_cache_key(user_id)) is None
+
+
+@pytest.mark.django_db
+def test_deactivated_user_token_stops_authenticating(api_client, create_user, django_capture_on_commit_callbacks):
+    from users.serializers import CachedBlacklistTokenObtainPairSerializer
+
+    user = create_user("deactivated@example.com", "password123")
+    token = CachedBlacklistTokenObtainPairSerializer.get_token(user).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    assert api_client.get("/api/v1/orders/").status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.is_active = False
+        user.save()
+
+    assert api_client.get("/api/v1/auth/user/").status_code == 403
+    assert api_client.get("/api/v1/orders/").status_code == 403
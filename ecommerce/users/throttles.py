@@ -0,0 +1,25 @@
+# ecommerce/users/throttles.py
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class ClientIPRateThrottle(SimpleRateThrottle):
+    """
+    Throttles by client IP whether or not the request is authenticated, for
+    endpoints whose cost is a password hash rather than the caller's identity.
+    Rates come from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"][scope].
+    """
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class LoginRateThrottle(ClientIPRateThrottle):
+    scope = "login"
+
+
+class RegisterRateThrottle(ClientIPRateThrottle):
+    scope = "register"
+
+
+class PasswordChangeRateThrottle(ClientIPRateThrottle):
+    scope = "password_change"
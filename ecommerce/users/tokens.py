@@ -0,0 +1,72 @@
+# ecommerce/users/tokens.py
+"""
+Refresh tokens with a cache-backed blacklist.
+
+simplejwt's token_blacklist app records every issued token and every rotation
+in two database tables that are never pruned. Here only revoked token ids are
+kept, in the shared cache (Redis in production), each with a timeout ending
+when the token would have expired anyway: a refresh costs one cache lookup and
+old entries evict themselves.
+"""
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import (
+    aware_utcnow,
+    datetime_from_epoch,
+    datetime_to_epoch,
+)
+
+
+def _blacklist_key(jti):
+    return f"jwt:blacklist:{jti}"
+
+
+def _revoked_user_key(user_id):
+    return f"jwt:revoked_user:{user_id}"
+
+
+def revoke_user_tokens(user_id):
+    """
+    Rejects every access token issued to the user so far, for as long as any
+    of them could still be valid. Claims authentication never loads the user,
+    so this is how deactivating or deleting one takes effect at once (see
+    users.signals and ecommerce.authentication).
+    """
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()) + 1
+    cache.set(_revoked_user_key(user_id), datetime_to_epoch(aware_utcnow()), timeout=timeout)
+
+
+def user_tokens_revoked(user_id, issued_at):
+    """Whether an access token issued at `issued_at` (epoch seconds) has been revoked."""
+    revoked_at = cache.get(_revoked_user_key(user_id))
+    return revoked_at is not None and (issued_at is None or issued_at <= revoked_at)
+
+
+class CachedBlacklistRefreshToken(RefreshToken):
+    """A refresh token whose revocation is stored in the cache."""
+
+    def _jti(self):
+        return self.payload[api_settings.JTI_CLAIM]
+
+    def verify(self):
+        super().verify()
+        if cache.get(_blacklist_key(self._jti())) is not None:
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """
+        Revokes the token until it expires. The revocation is an atomic
+        cache.add, so when two requests race to rotate the same token only
+        one of them succeeds; the other gets a TokenError.
+        """
+        remaining = datetime_from_epoch(self.payload["exp"]) - aware_utcnow()
+        timeout = max(1, int(remaining.total_seconds()) + 1)
+        if not cache.add(_blacklist_key(self._jti()), 1, timeout=timeout):
+            raise TokenError(_("Token is blacklisted"))
+
+    def outstand(self):
+        """Issued tokens are not recorded; only revocations are."""
+        return None
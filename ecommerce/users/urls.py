@@ -3,12 +3,12 @@
 from django.urls import path, include
 from django.conf import settings
 
-from dj_rest_auth.views import LogoutView, UserDetailsView, PasswordResetView, PasswordResetConfirmView
+from dj_rest_auth.views import PasswordResetView, PasswordResetConfirmView
 from dj_rest_auth.registration.views import VerifyEmailView, ResendEmailVerificationView, SocialLoginView
 from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 
-from .views import CustomRegisterView, EmailChangeView, AccountDeleteView, UserUpdateAPIView, PasswordChangeView, CustomLoginView
+from .views import CachedUserDetailsView, CustomLogoutView, CustomRegisterView, EmailChangeView, AccountDeleteView, UserUpdateAPIView, PasswordChangeView, CustomLoginView
 
 
 class GoogleLogin(SocialLoginView):
@@ -22,8 +22,8 @@ class GoogleLogin(SocialLoginView):
 urlpatterns = [
     # --- Authentication ---
     path('login/', CustomLoginView.as_view(), name='rest_login'),
-    path('logout/', LogoutView.as_view(), name='rest_logout'),
-    path('user/', UserDetailsView.as_view(), name='rest_user_details'),
+    path('logout/', CustomLogoutView.as_view(), name='rest_logout'),
+    path('user/', CachedUserDetailsView.as_view(), name='rest_user_details'),
 
     # --- Password Management ---
     path('password/reset/', PasswordResetView.as_view(), name='rest_password_reset'),
@@ -0,0 +1,52 @@
+# ecommerce/users/user_details.py
+"""
+Cached user details.
+
+The frontend fetches /auth/user/ on every page load. The serialized payload is
+built from one select_related query, cached per user with an ETag derived from
+its content, and dropped whenever the user, their profile or their seller record
+changes (see users.signals).
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import User
+from .serializers import UserDetailsSerializer
+
+USER_DETAILS_CACHE_TIMEOUT = 60 * 60
+
+
+def _cache_key(user_id):
+    return f"user_details:{user_id}"
+
+
+def get_user_details(user_id):
+    """
+    Returns (payload, etag) for a user, serializing and caching on a miss.
+    Raises User.DoesNotExist if the user has been deleted.
+    """
+    key = _cache_key(user_id)
+    cached = cache.get(key)
+    if cached is None:
+        user = User.objects.select_related("profile", "seller_profile").get(pk=user_id)
+        body = json.dumps(UserDetailsSerializer(user).data, cls=JSONEncoder, sort_keys=True)
+        etag = f'"user-{user_id}-{hashlib.md5(body.encode()).hexdigest()}"'
+        cached = (json.loads(body), etag)
+        cache.set(key, cached, timeout=USER_DETAILS_CACHE_TIMEOUT)
+    return cached
+
+
+def invalidate_user_details(user_id):
+    """
+    Drops a user's cached payload now and again once the transaction commits,
+    so a request that re-cached the old state in between does not keep it.
+    """
+    if user_id is None:
+        return
+    key = _cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -1,15 +1,19 @@
 # ecommerce/users/views.py
 
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 from django.conf import settings
 
-from dj_rest_auth.views import LoginView
+from dj_rest_auth.app_settings import api_settings as rest_auth_settings
+from dj_rest_auth.views import LoginView, LogoutView, UserDetailsView
+from rest_framework_simplejwt.exceptions import TokenError
 from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 from dj_rest_auth.registration.views import SocialLoginView
 
 from django.contrib.auth import get_user_model
+from ecommerce.authentication import StatelessReadAuthenticationMixin
 
 from .serializers import (
     EmailChangeSerializer,
@@ -18,6 +22,9 @@ from .serializers import (
     PasswordChangeSerializer,
     CustomLoginSerializer
 )
+from .throttles import LoginRateThrottle, PasswordChangeRateThrottle, RegisterRateThrottle
+from .tokens import CachedBlacklistRefreshToken
+from .user_details import get_user_details
 
 User = get_user_model()
 
@@ -25,18 +32,60 @@ User = get_user_model()
 class CustomLoginView(LoginView):
     """Custom login view that uses the CustomLoginSerializer."""
     serializer_class = CustomLoginSerializer
+    throttle_classes = [LoginRateThrottle]
+
+
+class CustomLogoutView(LogoutView):
+    """Logout view that also revokes the refresh token in the cache-backed blacklist."""
+
+    def logout(self, request):
+        response = super().logout(request)
+        raw_token = request.data.get("refresh") or request.COOKIES.get(
+            rest_auth_settings.JWT_AUTH_REFRESH_COOKIE
+        )
+        if raw_token:
+            try:
+                CachedBlacklistRefreshToken(raw_token).blacklist()
+            except TokenError:
+                # Already expired or revoked: nothing left to invalidate.
+                pass
+        return response
+
+
+class CachedUserDetailsView(StatelessReadAuthenticationMixin, UserDetailsView):
+    """
+    GET returns the cached details payload with an ETag, answering 304 when the
+    client's copy is current; with claims-based read authentication a cache hit
+    needs no database query. Updates go through dj-rest-auth as before.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            payload, etag = get_user_details(request.user.pk)
+        except User.DoesNotExist:
+            # The token outlived its user; claims authentication does not look it up.
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if request.headers.get("If-None-Match") == etag:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(payload)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
 
 class CustomRegisterView(generics.CreateAPIView):
     """Custom register view that uses the CustomRegisterSerializer."""
     serializer_class = CustomRegisterSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [RegisterRateThrottle]
 
 
 class PasswordChangeView(generics.UpdateAPIView):
     """View for changing the user's password."""
     serializer_class = PasswordChangeSerializer
     permission_classes = (permissions.IsAuthenticated,)
+    throttle_classes = [PasswordChangeRateThrottle]
 
     def get_object(self):
         """Returns the current user."""